@@ -5,7 +5,10 @@ Arquivo principal da aplicação Flask responsável por:
 
 - Inicializar a aplicação
 - Criar o banco de dados caso não exista
-- Registrar todos os Blueprints (funcionários, férias, folga, gráfico Gantt)
+- Registrar todos os Blueprints (funcionários, férias, folga, gráfico Gantt,
+  cobertura, dias úteis, importação)
+- Registrar os comandos de manutenção (`flask --app app verificar-saldos`)
+  e de importação de planilhas (`flask --app app importar`)
 - Renderizar a página inicial
 - Executar o servidor web
 
@@ -13,14 +16,24 @@ Este módulo é o ponto de entrada do sistema.
 """
 
 from flask import Flask, render_template
-from database import create_database
+from database import create_database, init_app
+from services.feriado_service import preparar_feriados
+from services.saldo_service import divergencias_saldo, reconstruir_saldos
+from services.importacao_service import (
+    ERROS_DE_LEITURA, RelatorioRejeicoes, TIPOS_IMPORTACAO, importar, linhas_do_arquivo
+)
+from datetime import datetime
 import logging
+import click
 
 # Importação das rotas (Blueprints)
 from routes.funcionario_routes import funcionario_bp
 from routes.ferias_routes import ferias_bp
 from routes.folga_routes import folga_bp
 from routes.gantt_routes import gantt_bp
+from routes.cobertura_routes import cobertura_bp
+from routes.dias_uteis_routes import dias_uteis_bp
+from routes.importacao_routes import importacao_bp
 
 # ===============================================================
 # INICIALIZAÇÃO DA APLICAÇÃO
@@ -30,6 +43,13 @@ app = Flask(__name__)
 # Cria estrutura do banco de dados na primeira execução
 create_database()
 
+# Uma conexão por requisição, fechada automaticamente no teardown
+init_app(app)
+
+# Calendário de feriados do ano atual e do próximo, calculado uma única vez
+with app.app_context():
+    preparar_feriados([datetime.now().year, datetime.now().year + 1])
+
 # ===============================================================
 # REGISTRO DOS BLUEPRINTS
 # Cada módulo de rotas é isolado e modularizado
@@ -38,6 +58,84 @@ app.register_blueprint(funcionario_bp)
 app.register_blueprint(ferias_bp)
 app.register_blueprint(folga_bp)
 app.register_blueprint(gantt_bp)
+app.register_blueprint(cobertura_bp)
+app.register_blueprint(dias_uteis_bp)
+app.register_blueprint(importacao_bp)
+
+# ===============================================================
+# COMANDOS DE MANUTENÇÃO
+# - flask --app app verificar-saldos [--corrigir]
+# ===============================================================
+@app.cli.command("verificar-saldos")
+@click.option("--corrigir", is_flag=True, help="Reconstrói saldo_ferias se houver divergências.")
+def verificar_saldos(corrigir):
+    """
+    Confere a tabela `saldo_ferias` (mantida por gatilhos) com a soma
+    recalculada a partir de `ferias`.
+
+    Sai com código 1 se houver divergências e `--corrigir` não for usado.
+    """
+    divergencias = divergencias_saldo()
+
+    for funcionario_id, periodo, gravado, calculado in divergencias:
+        click.echo(
+            f"funcionário {funcionario_id}, período {periodo}: "
+            f"gravado {gravado}, calculado {calculado}"
+        )
+
+    if not divergencias:
+        click.echo("saldo_ferias consistente.")
+        return
+
+    if corrigir:
+        linhas = reconstruir_saldos()
+        click.echo(f"{len(divergencias)} divergência(s); saldo_ferias reconstruído ({linhas} linhas).")
+    else:
+        click.echo(f"{len(divergencias)} divergência(s). Use --corrigir para reconstruir.")
+        raise SystemExit(1)
+
+# ===============================================================
+# IMPORTAÇÃO DE PLANILHAS
+# - flask --app app importar ferias planilha.xlsx [--rejeicoes rejeitadas.csv]
+# ===============================================================
+@app.cli.command("importar")
+@click.argument("tipo", type=click.Choice(TIPOS_IMPORTACAO))
+@click.argument("arquivo", type=click.Path(exists=True, dir_okay=False))
+@click.option("--rejeicoes", type=click.Path(dir_okay=False),
+              help="Grava as linhas recusadas (com o motivo) neste CSV.")
+@click.option("--encoding", default="utf-8-sig", show_default=True,
+              help="Codificação do CSV.")
+def importar_planilha(tipo, arquivo, rejeicoes, encoding):
+    """
+    Importa funcionários, férias ou folgas de uma planilha CSV ou XLSX,
+    lida em fluxo e gravada em blocos (ver `importacao_service.py`).
+
+    Sai com código 1 se alguma linha for recusada ou se a leitura falhar
+    no meio do arquivo (o que veio antes da falha fica gravado).
+    """
+    destino = open(rejeicoes, "w", encoding="utf-8-sig", newline="") if rejeicoes else None
+
+    try:
+        with open(arquivo, "rb") as entrada:
+            relatorio = RelatorioRejeicoes(destino, limite=20)
+            resumo = importar(tipo, linhas_do_arquivo(entrada, arquivo, encoding), relatorio)
+    except ERROS_DE_LEITURA as erro:
+        raise click.ClickException(str(erro))
+    finally:
+        if destino:
+            destino.close()
+
+    for rejeicao in relatorio.primeiras:
+        click.echo(f"linha {rejeicao['linha']}: {rejeicao['erro']}")
+
+    click.echo(
+        f"{resumo['lidas']} linha(s) lida(s), {resumo['gravadas']} gravada(s), "
+        f"{resumo['rejeitadas']} recusada(s)."
+    )
+    if "erro" in resumo:
+        raise click.ClickException(resumo["erro"])
+    if resumo["rejeitadas"]:
+        raise SystemExit(1)
 
 # ===============================================================
 # ROTA PRINCIPAL
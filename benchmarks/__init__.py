@@ -0,0 +1,10 @@
+"""
+benchmarks
+----------
+Scripts que reproduzem as medições de desempenho citadas nos commits.
+
+Cada script cria um banco temporário com dados sintéticos (semente fixa),
+mede e imprime os tempos. Rode a partir da raiz do projeto, por exemplo:
+
+    python -m benchmarks.indice_ferias
+"""
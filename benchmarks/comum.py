@@ -0,0 +1,79 @@
+"""
+comum.py
+--------
+Apoio dos benchmarks: banco temporário, dados sintéticos e cronômetro.
+"""
+
+import os
+import random
+import tempfile
+import time
+from datetime import date, timedelta
+
+import database
+
+
+def preparar_app():
+    """
+    Aponta o banco para um arquivo temporário e importa a aplicação (que cria
+    o banco e prepara os feriados no import).
+
+    Retorna:
+        Flask
+    """
+    database.DB_NAME = os.path.join(tempfile.mkdtemp(), "escala.db")
+
+    from app import app
+
+    return app
+
+
+def popular(funcionarios=10000, anos=range(2016, 2026), semente=1):
+    """
+    Grava, por uma conexão própria, `funcionarios` funcionários com duas
+    férias (10, 15 ou 20 dias) e quatro folgas por ano.
+
+    Retorna:
+        tuple (quantidade de férias, quantidade de folgas)
+    """
+    aleatorio = random.Random(semente)
+    ferias, folgas = [], []
+
+    for func_id in range(1, funcionarios + 1):
+        for ano in anos:
+            for _ in range(2):
+                inicio = date(ano, 1, 1) + timedelta(aleatorio.randrange(350))
+                dias = aleatorio.choice((10, 15, 20))
+                ferias.append((func_id, dias, inicio.isoformat(),
+                               (inicio + timedelta(dias - 1)).isoformat()))
+            for _ in range(4):
+                folga = date(ano, 1, 1) + timedelta(aleatorio.randrange(365))
+                folgas.append((func_id, ano, folga.isoformat()))
+
+    conn = database.get_connection()
+    conn.executemany(
+        "INSERT INTO funcionarios (id, nome) VALUES (?, ?);",
+        [(i, f"F{i:05d}") for i in range(1, funcionarios + 1)],
+    )
+    conn.executemany(
+        "INSERT INTO ferias (funcionario_id, periodo_dias, data_inicio, data_fim) VALUES (?, ?, ?, ?);",
+        ferias,
+    )
+    conn.executemany(
+        "INSERT INTO folga_assiduidade (funcionario_id, ano, data_folga) VALUES (?, ?, ?);",
+        folgas,
+    )
+    conn.commit()
+    conn.close()
+
+    return len(ferias), len(folgas)
+
+
+def cronometrar(funcao, repeticoes=1):
+    """Melhor tempo (s) de `repeticoes` execuções de `funcao()`."""
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor
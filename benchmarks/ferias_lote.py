@@ -0,0 +1,81 @@
+"""
+ferias_lote.py
+--------------
+Gravação de 1000 períodos de férias (200 funcionários × 5): um POST do
+formulário por período × uma chamada de `/api/ferias/lote`, sobre um
+histórico de 200 funcionários e 10 anos. Confere que os dois caminhos
+deixam as mesmas férias e o mesmo `saldo_ferias`.
+
+    python -m benchmarks.ferias_lote
+"""
+
+from datetime import date, timedelta
+
+import database
+from benchmarks.comum import cronometrar, popular, preparar_app
+
+FUNCIONARIOS = 200
+
+
+def periodos():
+    """Cinco períodos de 6 dias por funcionário, de julho a outubro de 2027."""
+    lista = []
+    for funcionario_id in range(1, FUNCIONARIOS + 1):
+        for k in range(5):
+            inicio = date(2027, 7, 1) + timedelta(days=20 * k + funcionario_id % 7)
+            lista.append({
+                "funcionario_id": funcionario_id,
+                "inicio": inicio.isoformat(),
+                "fim": (inicio + timedelta(days=5)).isoformat(),
+            })
+    return lista
+
+
+def estado(conn):
+    """Férias novas e saldos, para comparar os dois caminhos."""
+    return (
+        sorted(conn.execute(
+            "SELECT funcionario_id, periodo_dias, data_inicio, data_fim FROM ferias WHERE data_inicio >= '2027-01-01';"
+        )),
+        sorted(conn.execute("SELECT * FROM saldo_ferias WHERE dias_usados != 0;")),
+    )
+
+
+def main():
+    app = preparar_app()
+    historico, _ = popular(funcionarios=FUNCIONARIOS)
+    client = app.test_client()
+    itens = periodos()
+    externo = database.get_connection()
+
+    def por_formulario():
+        for item in itens:
+            resposta = client.post("/adicionar-ferias", data={
+                "funcionario_id": str(item["funcionario_id"]), "agendado_sap": "não",
+                "abono_peculiario": "não", "inicio": item["inicio"], "fim": item["fim"],
+                "ignorar_conflito": "1",
+            })
+            assert resposta.status_code == 302, resposta.get_data(as_text=True)[:200]
+
+    def em_lote():
+        resposta = client.post("/api/ferias/lote", json={"periodos": itens})
+        assert resposta.status_code == 201, resposta.get_json()["erro"]
+
+    formulario = cronometrar(por_formulario)
+    depois_do_formulario = estado(externo)
+
+    # Apaga por fora: as versões dos dados mudam e as memórias são relidas
+    externo.execute("DELETE FROM ferias WHERE data_inicio >= '2027-01-01';")
+    externo.commit()
+
+    lote = cronometrar(em_lote)
+    assert estado(externo) == depois_do_formulario
+    externo.close()
+
+    print(f"{len(itens)} períodos sobre {historico} férias")
+    print(f"formulário  {formulario:6.2f}s  ({len(itens) / formulario:8.0f} períodos/s)")
+    print(f"lote        {lote:6.2f}s  ({len(itens) / lote:8.0f} períodos/s)")
+
+
+if __name__ == "__main__":
+    main()
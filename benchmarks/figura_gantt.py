@@ -0,0 +1,61 @@
+"""
+figura_gantt.py
+---------------
+Montagem da figura do Gantt (com `to_html`): `px.timeline` sobre uma lista
+de dicionários (como antes) × `figura_gantt` direto das colunas, em SVG e
+em WebGL, com payloads sintéticos de 100 a 10 mil barras.
+
+    python -m benchmarks.figura_gantt
+"""
+
+from benchmarks.comum import cronometrar, preparar_app
+
+BARRAS = (100, 1000, 10000)
+REPETICOES = 3
+
+
+def figura_timeline(dados):
+    """Figura como era montada antes: `px.timeline` + customdata por ponto."""
+    import plotly.express as px
+
+    from routes.gantt_routes import CORES_TIPOS, TIPOS
+
+    nomes = dados["nomes"]
+    tarefas = [
+        {"Funcionário": nomes[i], "Inicio": inicio, "Fim": fim, "Tipo": TIPOS[tipo]}
+        for i, inicio, fim, tipo in zip(dados["idx"], dados["inicio"], dados["fim"], dados["tipo"])
+    ]
+    fig = px.timeline(
+        tarefas, x_start="Inicio", x_end="Fim", y="Funcionário", color="Tipo",
+        color_discrete_map=CORES_TIPOS, category_orders={"Funcionário": nomes},
+    )
+    for trace in fig.data:
+        trace.customdata = [[trace.name] for _ in trace.x]
+    return fig
+
+
+def main():
+    app = preparar_app()
+
+    from routes.gantt_routes import dados_sinteticos, figura_gantt
+
+    montagens = (
+        ("px.timeline", figura_timeline),
+        ("colunas (svg)", lambda dados: figura_gantt(dados, "svg")),
+        ("colunas (webgl)", lambda dados: figura_gantt(dados, "webgl")),
+    )
+
+    print(f"{'barras':>7}  " + "  ".join(f"{nome:>24}" for nome, _ in montagens))
+    with app.test_request_context():
+        for barras in BARRAS:
+            dados = dados_sinteticos(barras)
+            medidas = []
+            for _, montar in montagens:
+                html = []
+                tempo = cronometrar(lambda: html.append(montar(dados).to_html(full_html=False, include_plotlyjs=False)), REPETICOES)
+                medidas.append(f"{tempo * 1000:7.0f} ms / {len(html[-1]) / 1024:6.0f} KB")
+            print(f"{barras:>7}  " + "  ".join(f"{medida:>24}" for medida in medidas))
+
+
+if __name__ == "__main__":
+    main()
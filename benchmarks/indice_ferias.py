@@ -0,0 +1,54 @@
+"""
+indice_ferias.py
+----------------
+Checagem de sobreposição de férias: consulta SQL × índice em memória
+(`existe_sobreposicao`), com 10 mil funcionários e 200 mil férias.
+
+    python -m benchmarks.indice_ferias
+"""
+
+import random
+from datetime import date, timedelta
+
+from benchmarks.comum import cronometrar, popular, preparar_app
+
+CONSULTAS = 100000
+
+
+def main():
+    app = preparar_app()
+    ferias, _ = popular()
+
+    from database import get_db
+    from services.ferias_service import existe_sobreposicao
+
+    def sobreposicao_sql(funcionario_id, inicio, fim):
+        return get_db().execute("""
+            SELECT COUNT(*) FROM ferias
+            WHERE funcionario_id = ? AND data_inicio <= ? AND data_fim >= ?
+        """, (funcionario_id, fim, inicio)).fetchone()[0] > 0
+
+    aleatorio = random.Random(5)
+    consultas = []
+    for _ in range(CONSULTAS):
+        inicio = date(2016, 1, 1) + timedelta(aleatorio.randrange(3650))
+        consultas.append((aleatorio.randint(1, 10000), inicio.isoformat(),
+                          (inicio + timedelta(14)).isoformat()))
+
+    with app.test_request_context():
+        resultados = {}
+
+        def medir(nome, funcao):
+            tempo = cronometrar(lambda: resultados.__setitem__(nome, [funcao(*c) for c in consultas]))
+            print(f"{nome:<14} {tempo:6.2f}s  ({tempo / CONSULTAS * 1e6:5.1f} µs/consulta)")
+
+        print(f"{ferias} férias, {CONSULTAS} consultas")
+        medir("sql", sobreposicao_sql)
+        medir("índice (frio)", existe_sobreposicao)
+        medir("índice", existe_sobreposicao)
+
+    assert resultados["sql"] == resultados["índice (frio)"] == resultados["índice"]
+
+
+if __name__ == "__main__":
+    main()
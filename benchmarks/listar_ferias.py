@@ -0,0 +1,71 @@
+"""
+listar_ferias.py
+----------------
+Listagem de férias com as folgas do ano atual e do próximo: duas
+subconsultas correlacionadas por linha (consulta antiga) × folgas
+pivotadas uma vez por funcionário (`listar_ferias`), e a primeira página
+da listagem paginada.
+
+    python -m benchmarks.listar_ferias
+"""
+
+from benchmarks.comum import cronometrar, popular, preparar_app
+
+REPETICOES = 5
+
+# Consulta usada antes do pivô das folgas
+CONSULTA_CORRELACIONADA = """
+    SELECT
+        f.id, f.funcionario_id, func.nome, f.agendado_sap, f.periodo_dias,
+        f.abono_peculiario, f.data_inicio, f.data_fim,
+        (
+            SELECT data_folga FROM folga_assiduidade
+            WHERE funcionario_id = f.funcionario_id AND ano = ?
+            LIMIT 1
+        ) AS folga_atual,
+        (
+            SELECT data_folga FROM folga_assiduidade
+            WHERE funcionario_id = f.funcionario_id AND ano = ?
+            LIMIT 1
+        ) AS folga_proximo
+    FROM ferias f
+    JOIN funcionarios func ON func.id = f.funcionario_id
+    ORDER BY f.funcionario_id, f.data_inicio;
+"""
+
+
+def main():
+    app = preparar_app()
+    ferias, folgas = popular(funcionarios=5000, anos=range(2024, 2028))
+
+    from database import get_db
+    from services.ferias_service import formatar_data, listar_ferias
+
+    def listar_antiga(conn):
+        """Consulta antiga com a mesma formatação de `listar_ferias()`."""
+        return [
+            (*linha[:6], formatar_data(linha[6]), formatar_data(linha[7]),
+             formatar_data(linha[8]), formatar_data(linha[9]), linha[6], linha[7])
+            for linha in conn.execute(CONSULTA_CORRELACIONADA, (2025, 2026))
+        ]
+
+    with app.test_request_context():
+        conn = get_db()
+
+        antiga = cronometrar(lambda: listar_antiga(conn), REPETICOES)
+        completa = cronometrar(lambda: listar_ferias(2025, 2026), REPETICOES)
+        pagina = cronometrar(lambda: listar_ferias(2025, 2026, limite=50), REPETICOES)
+
+        # Mesmas férias (a folga escolhida pelo LIMIT 1 antigo era arbitrária
+        # quando havia mais de uma no ano, e o empate de início não tinha ordem)
+        esperado = sorted(linha[:2] for linha in conn.execute(CONSULTA_CORRELACIONADA, (2025, 2026)))
+        assert sorted(linha[:2] for linha in listar_ferias(2025, 2026)) == esperado
+
+    print(f"{ferias} férias, {folgas} folgas")
+    print(f"subconsultas correlacionadas  {antiga * 1000:8.1f} ms")
+    print(f"listar_ferias                 {completa * 1000:8.1f} ms")
+    print(f"listar_ferias, página de 50   {pagina * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
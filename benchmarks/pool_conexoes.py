@@ -0,0 +1,69 @@
+"""
+pool_conexoes.py
+----------------
+Requisições por segundo de `listar_ferias` com o pool de conexões × uma
+conexão nova por requisição (como antes do pool), com 1, 4 e 16 threads.
+
+    python -m benchmarks.pool_conexoes
+"""
+
+import threading
+import time
+
+import database
+from benchmarks.comum import popular, preparar_app
+
+DURACAO = 3
+THREADS = (1, 4, 16)
+
+
+class ConexaoPorRequisicao:
+    """Mesma interface do pool, abrindo e fechando uma conexão a cada uso."""
+
+    def adquirir(self):
+        return database.get_connection()
+
+    def devolver(self, conn):
+        conn.close()
+
+
+def vazao(app, threads):
+    """Requisições por segundo com `threads` threads chamando `listar_ferias`."""
+    from services.ferias_service import listar_ferias
+
+    total = []
+    fim = time.perf_counter() + DURACAO
+
+    def trabalhar():
+        feitas = 0
+        while time.perf_counter() < fim:
+            with app.app_context():
+                listar_ferias(2025, 2026)
+            feitas += 1
+        total.append(feitas)
+
+    grupo = [threading.Thread(target=trabalhar) for _ in range(threads)]
+    for thread in grupo:
+        thread.start()
+    for thread in grupo:
+        thread.join()
+
+    return sum(total) / DURACAO
+
+
+def main():
+    app = preparar_app()
+    ferias, _ = popular(funcionarios=50, anos=range(2025, 2027))
+
+    pool = database.pool
+    print(f"{ferias} férias; requisições/s por quantidade de threads")
+    for nome, estrategia in (("conexão nova", ConexaoPorRequisicao()), ("pool", pool)):
+        database.pool = estrategia
+        medidas = "  ".join(f"{n:>2}: {vazao(app, n):7.0f}" for n in THREADS)
+        print(f"{nome:<13} {medidas}")
+
+    database.pool = pool
+
+
+if __name__ == "__main__":
+    main()
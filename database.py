@@ -6,14 +6,40 @@ utilizado no Sistema de Escala de Férias.
 
 Este arquivo oferece:
 
-1. create_database()
+1. create_database() / aplicar_migracoes()
    - Cria automaticamente todas as tabelas necessárias caso ainda não existam.
-   - Centraliza e organiza a estrutura inicial do banco.
+   - Aplica as migrações versionadas de `MIGRACOES` (tabela `schema_version`),
+     incluindo os índices usados pelas consultas dos serviços.
    - Garante integridade referencial com FOREIGN KEYS.
 
 2. get_connection()
-   - Fornece uma conexão ativa com o banco de dados para uso em módulos de
-     serviços e rotas.
+   - Abre uma conexão nova, já configurada com os PRAGMAs de desempenho
+     (WAL, synchronous=NORMAL, mmap, cache maior, busy_timeout).
+
+3. PoolConexoes
+   - Pool limitado e thread-safe que recicla conexões configuradas entre
+     requisições de um servidor WSGI multi-thread.
+
+4. get_db() / close_db() / init_app()
+   - Unidade de trabalho por requisição: cada requisição Flask pega uma
+     conexão do pool, guarda em `flask.g` e a devolve no teardown.
+
+5. transacao() / confirmar()
+   - Permitem que uma rota execute leituras e escritas numa única transação
+     (validação + inserção atômicas).
+
+6. versao_dados()
+   - Versão de cada tabela de dados, gravada no próprio banco e
+     incrementada por gatilhos a cada alteração (deste processo, de outro
+     worker, do `flask importar` ou de SQL manual); usada para invalidar
+     caches (ex.: gráfico Gantt) com precisão.
+
+7. ao_confirmar() / pendentes()
+   - Permitem que os serviços mantenham estruturas em memória (ex.: índice
+     de férias por funcionário) com o que foi confirmado: as alterações
+     ficam pendentes durante a escrita e só são aplicadas após o commit,
+     junto com as versões dos dados de antes e de depois da escrita;
+     no rollback, são descartadas.
 
 Banco utilizado:
     SQLite (arquivo local: escala.db)
@@ -22,27 +48,55 @@ Observação:
     O SQLite cria automaticamente o arquivo caso ele ainda não exista.
 """
 
+import queue
 import sqlite3
+import threading
+from contextlib import contextmanager
+
+from flask import g, has_app_context
 
 # Nome do arquivo de banco SQLite
 DB_NAME = r"C:\Users\Henrique\Downloads\escala.db"
 
+# Quantidade máxima de conexões simultâneas e tempo máximo (segundos) que uma
+# requisição espera por uma conexão livre antes de desistir.
+POOL_TAMANHO = 8
+POOL_TIMEOUT = 30
+
+# Configuração aplicada a toda conexão aberta pelo sistema.
+# - WAL: leitores não bloqueiam o escritor (e vice-versa).
+# - synchronous=NORMAL: seguro em WAL e muito mais barato que FULL.
+# - busy_timeout: espera o lock em vez de falhar com "database is locked".
+# - cache_size negativo = tamanho em KiB (aqui ~32 MB por conexão).
+# - mmap_size: leituras via memória mapeada (256 MB).
+PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA busy_timeout = 5000",
+    "PRAGMA cache_size = -32000",
+    "PRAGMA mmap_size = 268435456",
+    "PRAGMA temp_store = MEMORY",
+)
+
 
 def create_database():
     """
     Cria o banco de dados e sua estrutura inicial.
 
     Este método deve ser executado apenas uma vez no início da aplicação, mas
-    pode ser chamado quantas vezes necessário, pois utiliza CREATE TABLE IF NOT EXISTS,
-    garantindo que nenhuma tabela existente seja sobrescrita.
+    pode ser chamado quantas vezes necessário: ele aplica somente as
+    migrações de `MIGRACOES` que ainda não constam em `schema_version`,
+    e a estrutura inicial utiliza CREATE TABLE IF NOT EXISTS, garantindo
+    que nenhuma tabela existente seja sobrescrita.
 
     Estruturas criadas:
 
     1. funcionarios
         - Armazena colaboradores cadastrados.
         - Campos:
-            id   : identificador único.
-            nome : nome do funcionário.
+            id            : identificador único.
+            nome          : nome do funcionário.
+            data_admissao : início dos períodos aquisitivos (opcional).
 
     2. ferias
         - Registra períodos de férias completos.
@@ -62,27 +116,52 @@ def create_database():
             ano            : ano vigente da folga.
             data_folga     : data concedida.
 
+    4. saldo_ferias
+        - Dias de férias usados por funcionário e período aquisitivo,
+          mantidos pelos gatilhos de `ferias` (leitura por chave primária).
+        - Campos:
+            funcionario_id     : referência ao funcionário.
+            periodo_aquisitivo : ano em que começa a janela aquisitiva de
+                                 12 meses (aniversário de admissão).
+            dias_usados        : soma de `periodo_dias` do período.
+
+    5. versao_dados
+        - Versão dos dados de cada tabela, incrementada pelos gatilhos de
+          `funcionarios`, `ferias` e `folga_assiduidade` (ver
+          `versao_dados()`).
+        - Campos:
+            tabela : nome da tabela.
+            versao : contador de alterações (começa num valor aleatório).
+
     Returns:
         None
     """
 
-    conn = sqlite3.connect(DB_NAME)
-    cursor = conn.cursor()
+    conn = get_connection()
+
+    try:
+        aplicar_migracoes(conn)
+    finally:
+        conn.close()
+
 
-    # ----------------------------------------------------------------------
-    # Tabela de Funcionários
-    # ----------------------------------------------------------------------
-    cursor.execute("""
+# ============================================================================
+# MIGRAÇÕES DE ESQUEMA
+# ============================================================================
+# Cada migração é (versão, descrição, comandos SQL). A lista é aplicada em
+# ordem e nunca deve ser editada depois de publicada: mudanças de esquema
+# entram sempre como uma nova versão no fim da lista.
+MIGRACOES = [
+    (1, "estrutura inicial", (
+        # Tabela de Funcionários
+        """
         CREATE TABLE IF NOT EXISTS funcionarios (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             nome TEXT NOT NULL
         );
-    """)
-
-    # ----------------------------------------------------------------------
-    # Tabela de Férias
-    # ----------------------------------------------------------------------
-    cursor.execute("""
+        """,
+        # Tabela de Férias
+        """
         CREATE TABLE IF NOT EXISTS ferias (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             funcionario_id INTEGER NOT NULL,
@@ -96,12 +175,9 @@ def create_database():
             cor TEXT,
             FOREIGN KEY (funcionario_id) REFERENCES funcionarios(id)
         );
-    """)
-
-    # ----------------------------------------------------------------------
-    # Tabela de Folga por Assiduidade
-    # ----------------------------------------------------------------------
-    cursor.execute("""
+        """,
+        # Tabela de Folga por Assiduidade
+        """
         CREATE TABLE IF NOT EXISTS folga_assiduidade (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             funcionario_id INTEGER NOT NULL,
@@ -109,15 +185,306 @@ def create_database():
             data_folga TEXT NOT NULL,
             FOREIGN KEY (funcionario_id) REFERENCES funcionarios(id)
         );
+        """,
+    )),
+
+    # Sobreposição, soma de dias e listagens ordenadas por funcionário/data
+    (2, "índice de férias por funcionário e período", (
+        """
+        CREATE INDEX IF NOT EXISTS idx_ferias_funcionario_periodo
+        ON ferias (funcionario_id, data_inicio, data_fim);
+        """,
+    )),
+
+    # obter_folga e as folgas exibidas junto das férias (cobre data_folga)
+    (3, "índice de folgas por funcionário e ano", (
+        """
+        CREATE INDEX IF NOT EXISTS idx_folga_funcionario_ano
+        ON folga_assiduidade (funcionario_id, ano, data_folga);
+        """,
+    )),
+
+    # Consultas ordenadas por nome (Gantt, listas de funcionários)
+    (4, "índice de funcionários por nome", (
+        """
+        CREATE INDEX IF NOT EXISTS idx_funcionarios_nome
+        ON funcionarios (nome, id);
+        """,
+    )),
+
+    # Filtros por ano/mês como janelas de data (sobreposição de períodos)
+    (5, "índice de férias por data final", (
+        """
+        CREATE INDEX IF NOT EXISTS idx_ferias_periodo
+        ON ferias (data_fim, data_inicio);
+        """,
+    )),
+
+    # Calendário de feriados calculado uma vez por ano (feriado_service)
+    (6, "tabela de feriados", (
+        """
+        CREATE TABLE IF NOT EXISTS feriados (
+            localidade TEXT NOT NULL,
+            data TEXT NOT NULL,
+            nome TEXT NOT NULL,
+            PRIMARY KEY (localidade, data)
+        ) WITHOUT ROWID;
+        """,
+    )),
+
+    # Filtros do Gantt por ano/mês nas folgas (janelas sobre data_folga)
+    (7, "índice de folgas por data", (
+        """
+        CREATE INDEX IF NOT EXISTS idx_folga_data
+        ON folga_assiduidade (data_folga);
+        """,
+    )),
+
+    # Saldo de férias materializado por período aquisitivo (ano do início):
+    # mantido pelos gatilhos de `ferias`, lido por chave primária
+    (8, "saldo de férias por período aquisitivo", (
+        """
+        CREATE TABLE IF NOT EXISTS saldo_ferias (
+            funcionario_id INTEGER NOT NULL,
+            periodo_aquisitivo INTEGER NOT NULL,
+            dias_usados INTEGER NOT NULL,
+            PRIMARY KEY (funcionario_id, periodo_aquisitivo)
+        ) WITHOUT ROWID;
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_saldo_ferias_insert
+        AFTER INSERT ON ferias
+        BEGIN
+            INSERT INTO saldo_ferias (funcionario_id, periodo_aquisitivo, dias_usados)
+            VALUES (NEW.funcionario_id, CAST(strftime('%Y', NEW.data_inicio) AS INTEGER), NEW.periodo_dias)
+            ON CONFLICT (funcionario_id, periodo_aquisitivo)
+            DO UPDATE SET dias_usados = dias_usados + excluded.dias_usados;
+        END;
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_saldo_ferias_delete
+        AFTER DELETE ON ferias
+        BEGIN
+            UPDATE saldo_ferias
+            SET dias_usados = dias_usados - OLD.periodo_dias
+            WHERE funcionario_id = OLD.funcionario_id
+              AND periodo_aquisitivo = CAST(strftime('%Y', OLD.data_inicio) AS INTEGER);
+        END;
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_saldo_ferias_update
+        AFTER UPDATE OF funcionario_id, data_inicio, periodo_dias ON ferias
+        BEGIN
+            UPDATE saldo_ferias
+            SET dias_usados = dias_usados - OLD.periodo_dias
+            WHERE funcionario_id = OLD.funcionario_id
+              AND periodo_aquisitivo = CAST(strftime('%Y', OLD.data_inicio) AS INTEGER);
+
+            INSERT INTO saldo_ferias (funcionario_id, periodo_aquisitivo, dias_usados)
+            VALUES (NEW.funcionario_id, CAST(strftime('%Y', NEW.data_inicio) AS INTEGER), NEW.periodo_dias)
+            ON CONFLICT (funcionario_id, periodo_aquisitivo)
+            DO UPDATE SET dias_usados = dias_usados + excluded.dias_usados;
+        END;
+        """,
+        # Carga inicial com as férias já cadastradas
+        """
+        INSERT OR REPLACE INTO saldo_ferias (funcionario_id, periodo_aquisitivo, dias_usados)
+        SELECT funcionario_id, CAST(strftime('%Y', data_inicio) AS INTEGER), SUM(periodo_dias)
+        FROM ferias
+        GROUP BY funcionario_id, CAST(strftime('%Y', data_inicio) AS INTEGER);
+        """,
+    )),
+
+    # Período aquisitivo pela data de admissão: janelas de 12 meses a partir
+    # do aniversário de admissão, identificadas pelo ano em que começam
+    # (sem data de admissão, a janela é o ano civil). Os gatilhos passam a
+    # calcular a janela de cada férias e a refazer o saldo do funcionário
+    # quando a data de admissão muda.
+    (9, "período aquisitivo pela data de admissão", (
+        """
+        ALTER TABLE funcionarios ADD COLUMN data_admissao TEXT;
+        """,
+        "DROP TRIGGER IF EXISTS trg_saldo_ferias_insert;",
+        "DROP TRIGGER IF EXISTS trg_saldo_ferias_delete;",
+        "DROP TRIGGER IF EXISTS trg_saldo_ferias_update;",
+        """
+        CREATE TRIGGER trg_saldo_ferias_insert
+        AFTER INSERT ON ferias
+        BEGIN
+            INSERT INTO saldo_ferias (funcionario_id, periodo_aquisitivo, dias_usados)
+            VALUES (NEW.funcionario_id, CAST(strftime('%Y', NEW.data_inicio) AS INTEGER) - COALESCE((
+                SELECT strftime('%m-%d', NEW.data_inicio) < strftime('%m-%d', data_admissao)
+                FROM funcionarios WHERE id = NEW.funcionario_id
+            ), 0), NEW.periodo_dias)
+            ON CONFLICT (funcionario_id, periodo_aquisitivo)
+            DO UPDATE SET dias_usados = dias_usados + excluded.dias_usados;
+        END;
+        """,
+        """
+        CREATE TRIGGER trg_saldo_ferias_delete
+        AFTER DELETE ON ferias
+        BEGIN
+            UPDATE saldo_ferias
+            SET dias_usados = dias_usados - OLD.periodo_dias
+            WHERE funcionario_id = OLD.funcionario_id
+              AND periodo_aquisitivo = CAST(strftime('%Y', OLD.data_inicio) AS INTEGER) - COALESCE((
+                SELECT strftime('%m-%d', OLD.data_inicio) < strftime('%m-%d', data_admissao)
+                FROM funcionarios WHERE id = OLD.funcionario_id
+            ), 0);
+        END;
+        """,
+        """
+        CREATE TRIGGER trg_saldo_ferias_update
+        AFTER UPDATE OF funcionario_id, data_inicio, periodo_dias ON ferias
+        BEGIN
+            UPDATE saldo_ferias
+            SET dias_usados = dias_usados - OLD.periodo_dias
+            WHERE funcionario_id = OLD.funcionario_id
+              AND periodo_aquisitivo = CAST(strftime('%Y', OLD.data_inicio) AS INTEGER) - COALESCE((
+                SELECT strftime('%m-%d', OLD.data_inicio) < strftime('%m-%d', data_admissao)
+                FROM funcionarios WHERE id = OLD.funcionario_id
+            ), 0);
+
+            INSERT INTO saldo_ferias (funcionario_id, periodo_aquisitivo, dias_usados)
+            VALUES (NEW.funcionario_id, CAST(strftime('%Y', NEW.data_inicio) AS INTEGER) - COALESCE((
+                SELECT strftime('%m-%d', NEW.data_inicio) < strftime('%m-%d', data_admissao)
+                FROM funcionarios WHERE id = NEW.funcionario_id
+            ), 0), NEW.periodo_dias)
+            ON CONFLICT (funcionario_id, periodo_aquisitivo)
+            DO UPDATE SET dias_usados = dias_usados + excluded.dias_usados;
+        END;
+        """,
+        """
+        CREATE TRIGGER trg_saldo_ferias_admissao
+        AFTER UPDATE OF data_admissao ON funcionarios
+        BEGIN
+            DELETE FROM saldo_ferias WHERE funcionario_id = NEW.id;
+
+            INSERT INTO saldo_ferias (funcionario_id, periodo_aquisitivo, dias_usados)
+            SELECT funcionario_id,
+                   CAST(strftime('%Y', data_inicio) AS INTEGER)
+                     - COALESCE(strftime('%m-%d', data_inicio) < strftime('%m-%d', NEW.data_admissao), 0),
+                   SUM(periodo_dias)
+            FROM ferias
+            WHERE funcionario_id = NEW.id
+            GROUP BY 1, 2;
+        END;
+        """,
+        # Recalcula os saldos já gravados com a regra nova
+        "DELETE FROM saldo_ferias;",
+        """
+        INSERT INTO saldo_ferias (funcionario_id, periodo_aquisitivo, dias_usados)
+        SELECT f.funcionario_id,
+               CAST(strftime('%Y', f.data_inicio) AS INTEGER)
+                 - COALESCE(strftime('%m-%d', f.data_inicio) < strftime('%m-%d', func.data_admissao), 0),
+               SUM(f.periodo_dias)
+        FROM ferias f
+        LEFT JOIN funcionarios func ON func.id = f.funcionario_id
+        GROUP BY 1, 2;
+        """,
+    )),
+
+    # Versão dos dados gravada no banco, por tabela: os gatilhos a
+    # incrementam a cada linha alterada, qualquer que seja o processo ou a
+    # conexão. Cada tabela começa num valor aleatório, para que a versão de
+    # outro arquivo de banco não coincida com a deste.
+    (10, "versão dos dados por tabela", (
+        """
+        CREATE TABLE IF NOT EXISTS versao_dados (
+            tabela TEXT PRIMARY KEY,
+            versao INTEGER NOT NULL
+        ) WITHOUT ROWID;
+        """,
+        *(
+            f"""
+            INSERT OR IGNORE INTO versao_dados (tabela, versao)
+            VALUES ('{tabela}', abs(random() % 1000000000000));
+            """
+            for tabela in ("funcionarios", "ferias", "folga_assiduidade")
+        ),
+        *(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS trg_versao_{tabela}_{evento.lower()}
+            AFTER {evento} ON {tabela}
+            BEGIN
+                UPDATE versao_dados SET versao = versao + 1 WHERE tabela = '{tabela}';
+            END;
+            """
+            for tabela in ("funcionarios", "ferias", "folga_assiduidade")
+            for evento in ("INSERT", "UPDATE", "DELETE")
+        ),
+    )),
+]
+
+
+def versao_esquema(conn):
+    """
+    Retorna a versão de esquema já aplicada ao banco (0 se nenhuma).
+    """
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS schema_version (
+            versao INTEGER PRIMARY KEY,
+            descricao TEXT NOT NULL,
+            aplicada_em TEXT NOT NULL DEFAULT (datetime('now'))
+        );
     """)
 
-    conn.commit()
-    conn.close()
+    return conn.execute(
+        "SELECT COALESCE(MAX(versao), 0) FROM schema_version;"
+    ).fetchone()[0]
+
+
+def aplicar_migracoes(conn):
+    """
+    Aplica, em ordem, todas as migrações de `MIGRACOES` ainda pendentes.
+
+    Cada migração roda em sua própria transação junto com o registro em
+    `schema_version`: ou ela é aplicada por completo, ou o banco continua
+    na versão anterior. Bancos criados antes deste controle (sem a tabela
+    `schema_version`) são atualizados normalmente, pois a estrutura
+    inicial usa `IF NOT EXISTS`.
+
+    Returns:
+        int: versão do esquema após as migrações.
+    """
+    atual = versao_esquema(conn)
+
+    for versao, descricao, comandos in MIGRACOES:
+        if versao <= atual:
+            continue
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Outro processo pode ter aplicado a migração enquanto esperávamos
+            if versao_esquema(conn) >= versao:
+                conn.rollback()
+                continue
+
+            for comando in comandos:
+                conn.execute(comando)
+
+            conn.execute(
+                "INSERT INTO schema_version (versao, descricao) VALUES (?, ?);",
+                (versao, descricao)
+            )
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+
+        atual = versao
+
+    return atual
 
 
 def get_connection():
     """
-    Abre e retorna uma conexão ativa com o banco de dados SQLite.
+    Abre e retorna uma conexão ativa com o banco de dados SQLite, já com os
+    PRAGMAs definidos em `PRAGMAS`.
+
+    A conexão é criada com `check_same_thread=False` porque o pool a
+    entrega a threads diferentes ao longo do tempo (nunca a duas ao mesmo
+    tempo).
 
     Returns:
         sqlite3.Connection: conexão pronta para uso.
@@ -125,5 +492,325 @@ def get_connection():
     Observações importantes:
     - Sempre feche a conexão após o uso com conn.close().
     - Em operações de escrita (INSERT/UPDATE/DELETE), use conn.commit().
+    - Dentro de uma requisição, prefira `get_db()`, que reaproveita a mesma
+      conexão (vinda do pool) para todas as chamadas de serviço.
+    """
+    conn = sqlite3.connect(DB_NAME, timeout=5, check_same_thread=False)
+
+    for pragma in PRAGMAS:
+        conn.execute(pragma)
+
+    return conn
+
+
+# ============================================================================
+# POOL DE CONEXÕES
+# ============================================================================
+class PoolConexoes:
+    """
+    Pool limitado de conexões SQLite, seguro para uso entre threads.
+
+    - No máximo `tamanho` conexões existem ao mesmo tempo; a thread que pedir
+      uma conexão com o pool esgotado espera até `timeout` segundos.
+    - Conexões são abertas sob demanda e, ao serem devolvidas, voltam para a
+      fila de livres para a próxima requisição (sem novo connect/PRAGMAs).
+    - Conexões devolvidas com transação pendente sofrem rollback antes de
+      serem reaproveitadas.
+    """
+
+    def __init__(self, tamanho=POOL_TAMANHO, timeout=POOL_TIMEOUT):
+        self.tamanho = tamanho
+        self.timeout = timeout
+        self._livres = queue.LifoQueue()
+        self._vagas = threading.BoundedSemaphore(tamanho)
+        self._banco = None
+
+    def adquirir(self):
+        """
+        Retorna uma conexão livre (ou abre uma nova, se houver vaga).
+
+        Raises:
+            sqlite3.OperationalError: se nenhuma conexão ficar livre dentro
+            do tempo limite.
+        """
+        if not self._vagas.acquire(timeout=self.timeout):
+            raise sqlite3.OperationalError("pool de conexões esgotado")
+
+        try:
+            # Se o caminho do banco mudou, as conexões antigas não servem mais
+            if self._banco != DB_NAME:
+                self.fechar_todas()
+                self._banco = DB_NAME
+
+            try:
+                return self._livres.get_nowait()
+            except queue.Empty:
+                return get_connection()
+        except BaseException:
+            self._vagas.release()
+            raise
+
+    def devolver(self, conn):
+        """
+        Devolve a conexão ao pool, desfazendo qualquer transação pendente.
+        """
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+            self._livres.put(conn)
+        except sqlite3.Error:
+            # Conexão inutilizável: descarta em vez de reciclar
+            conn.close()
+        finally:
+            self._vagas.release()
+
+    def fechar_todas(self):
+        """
+        Fecha todas as conexões livres do pool.
+        """
+        while True:
+            try:
+                self._livres.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+# Pool único do processo
+pool = PoolConexoes()
+
+# Tabelas cuja versão fica em `versao_dados` (alteradas pelos gatilhos)
+TABELAS_VERSIONADAS = ("funcionarios", "ferias", "folga_assiduidade")
+
+# Conexão própria de `versao_dados()`: (caminho do banco, conexão). Fica fora
+# das transações das requisições, então só enxerga o que já foi confirmado.
+_leitor_versao = None
+_leitor_trava = threading.Lock()
+
+
+# ============================================================================
+# UNIDADE DE TRABALHO POR REQUISIÇÃO
+# ============================================================================
+def get_db():
     """
-    return sqlite3.connect(DB_NAME)
+    Retorna a conexão da requisição atual, pegando-a do pool na primeira
+    chamada.
+
+    A conexão fica guardada em `flask.g`, de modo que todas as funções de
+    serviço chamadas durante a mesma requisição compartilham uma única
+    conexão. Ela volta para o pool em `close_db()`, no teardown.
+
+    Returns:
+        sqlite3.Connection: conexão da requisição.
+    """
+    if "db" not in g:
+        g.db = pool.adquirir()
+    return g.db
+
+
+def close_db(e=None):
+    """
+    Devolve a conexão da requisição ao pool, se houver uma em uso.
+
+    Registrada como teardown do app por `init_app()`. Qualquer escrita não
+    confirmada é desfeita antes da conexão ser reaproveitada.
+    """
+    conn = g.pop("db", None)
+    g.pop("em_transacao", None)
+    _descartar_pendentes()
+
+    if conn is not None:
+        pool.devolver(conn)
+
+
+def init_app(app):
+    """
+    Registra o fechamento automático da conexão ao fim de cada requisição.
+    """
+    app.teardown_appcontext(close_db)
+
+
+@contextmanager
+def transacao():
+    """
+    Executa um bloco de leituras e escritas numa única transação.
+
+    Usa `BEGIN IMMEDIATE`, que reserva o banco para escrita já no início:
+    duas requisições concorrentes não conseguem ler o mesmo estado e ambas
+    passarem na validação. Ao sair do bloco normalmente é feito commit;
+    em caso de exceção, rollback.
+
+    Blocos aninhados reaproveitam a transação já aberta.
+
+    Uso:
+        with transacao():
+            if total_dias_ferias(func_id, ano) + dias > 30:
+                return "Erro..."
+            adicionar_ferias(...)
+    """
+    conn = get_db()
+
+    if g.get("em_transacao"):
+        yield conn
+        return
+
+    _reservar(conn)
+    g.em_transacao = True
+
+    try:
+        yield conn
+    except BaseException:
+        conn.rollback()
+        _descartar_pendentes()
+        raise
+    else:
+        _commit(conn)
+    finally:
+        g.em_transacao = False
+
+
+def confirmar(conn):
+    """
+    Confirma uma escrita feita por uma função de serviço.
+
+    Fora de `transacao()` faz o commit imediatamente (comportamento de
+    escrita avulsa). Dentro de `transacao()` não faz nada: quem confirma é
+    o próprio bloco, ao terminar.
+    """
+    if g.get("em_transacao"):
+        return
+
+    _commit(conn)
+
+
+def _reservar(conn):
+    """
+    Abre a transação com `BEGIN IMMEDIATE` e guarda as versões dos dados
+    de antes da escrita (exatas: ninguém mais grava enquanto durar a
+    reserva).
+    """
+    conn.execute("BEGIN IMMEDIATE")
+    g.versao_antes = _ler_versoes(conn)
+    g.pop("versao_lida", None)
+
+
+def _commit(conn):
+    """
+    Faz o commit e, em seguida, roda as funções de `ao_confirmar()` com as
+    versões dos dados de antes e de depois da escrita.
+    """
+    funcoes = g.pop("ao_confirmar", [])
+    antes = g.pop("versao_antes", None)
+
+    # Lidas antes do commit, ainda com a reserva: são só desta escrita
+    depois = _ler_versoes(conn) if funcoes else None
+
+    conn.commit()
+    g.pop("pendentes", None)
+    g.pop("versao_lida", None)
+
+    for funcao in funcoes:
+        funcao(antes, depois)
+
+
+# ============================================================================
+# AÇÕES APÓS O COMMIT (ESTRUTURAS EM MEMÓRIA)
+# ============================================================================
+def ao_confirmar(funcao):
+    """
+    Agenda `funcao(antes, depois)` para rodar logo após o commit da escrita
+    em andamento.
+
+    Usado pelos serviços para atualizar estruturas em memória derivadas do
+    banco apenas com dados confirmados. Em caso de rollback (ou se a
+    requisição terminar sem commit), a função é descartada.
+
+    `antes` e `depois` são as versões dos dados ({tabela: versao}, ver
+    `versao_dados()`) imediatamente antes e depois da escrita. Uma
+    estrutura que estava na versão `antes` pode aplicar só as próprias
+    alterações e passar para `depois`; se estava em outra, alguém gravou
+    por fora (outro processo) e ela deve ser descartada. `antes` é None
+    quando não pôde ser determinada.
+
+    Deve ser chamada ANTES do SQL da escrita: fora de `transacao()`, a
+    primeira chamada já reserva o banco (`BEGIN IMMEDIATE`) para que
+    `antes` seja exata.
+    """
+    if "versao_antes" not in g:
+        conn = get_db()
+        if conn.in_transaction:
+            # Transação aberta por um comando anterior: `antes` é desconhecida
+            g.versao_antes = None
+        else:
+            _reservar(conn)
+
+    g.setdefault("ao_confirmar", []).append(funcao)
+
+
+def pendentes():
+    """
+    Retorna o dicionário da escrita em andamento, onde os serviços guardam o
+    que já alteraram e ainda não foi confirmado (para que as próximas
+    consultas da mesma requisição enxerguem as próprias escritas).
+
+    É esvaziado no commit e no rollback.
+    """
+    escritas = g.get("pendentes")
+    if escritas is None:
+        escritas = g.pendentes = {}
+    return escritas
+
+
+def _descartar_pendentes():
+    g.pop("ao_confirmar", None)
+    g.pop("pendentes", None)
+    g.pop("versao_antes", None)
+    g.pop("versao_lida", None)
+
+
+# ============================================================================
+# VERSÃO DOS DADOS (INVALIDAÇÃO DE CACHES)
+# ============================================================================
+def _ler_versoes(conn):
+    """Versões gravadas em `versao_dados`: {tabela: versao}."""
+    return dict(conn.execute("SELECT tabela, versao FROM versao_dados;").fetchall())
+
+
+def versao_dados(*tabelas):
+    """
+    Retorna a versão atual (confirmada) dos dados das tabelas pedidas
+    (todas de `TABELAS_VERSIONADAS`, se nenhuma for informada).
+
+    A versão fica no banco, na tabela `versao_dados`, e os gatilhos a
+    incrementam a cada alteração em funcionários, férias ou folgas, venha
+    ela deste processo, de outro worker, do `flask importar` ou de SQL
+    manual. Caches derivados do banco usam a versão na chave: qualquer
+    alteração gera uma versão nova, e os valores antigos deixam de ser
+    encontrados. Leia a versão *antes* de consultar os dados que serão
+    guardados no cache.
+
+    É lida numa conexão própria, fora da transação da requisição (uma
+    escrita ainda não confirmada nunca aparece), e uma única vez por
+    requisição: é relida após cada escrita confirmada da própria
+    requisição.
+
+    Retorna:
+        tuple: uma versão por tabela, na ordem pedida.
+    """
+    global _leitor_versao
+
+    em_requisicao = has_app_context()
+    versoes = g.get("versao_lida") if em_requisicao else None
+
+    if versoes is None:
+        with _leitor_trava:
+            if _leitor_versao is None or _leitor_versao[0] != DB_NAME:
+                if _leitor_versao is not None:
+                    _leitor_versao[1].close()
+                _leitor_versao = (DB_NAME, get_connection())
+
+            versoes = _ler_versoes(_leitor_versao[1])
+
+        if em_requisicao:
+            g.versao_lida = versoes
+
+    return tuple(versoes[tabela] for tabela in tabelas or TABELAS_VERSIONADAS)
@@ -0,0 +1,165 @@
+"""
+cobertura_routes.py
+-------------------
+Módulo responsável pelas consultas de cobertura da equipe.
+
+Funcionalidades implementadas:
+- API com a quantidade de ausentes por dia de um período
+- Lista dos dias em que os ausentes passam do limite (equipe desfalcada)
+- Relatório de conflitos: janelas com ausentes demais e quem são eles
+- Checagem de conflito de um período antes de salvar férias
+
+A contagem vem do motor de cobertura em `cobertura_service.py` e os
+conflitos de `conflito_service.py`; ambos leem o histórico uma única vez e
+o mantêm em memória até a próxima gravação.
+"""
+
+import datetime as dt
+
+from flask import Blueprint, jsonify, request
+
+from services.cobertura_service import LIMITE_AUSENTES, ausencias_por_dia
+from services.conflito_service import listar_conflitos, verificar_conflito
+
+# Blueprint dedicado às consultas de cobertura
+cobertura_bp = Blueprint("cobertura", __name__)
+
+# Maior período aceito em uma consulta (10 anos)
+COBERTURA_MAX_DIAS = 10 * 366
+
+
+# ============================================================================
+# AUXILIARES
+# ============================================================================
+def _periodo_e_limite(origem):
+    """
+    Lê `inicio`, `fim` e `limite` da query string.
+
+    Retorna:
+        tuple (inicio, fim, limite)
+
+    Raises:
+        ValueError: com a mensagem de erro para o cliente.
+    """
+    try:
+        inicio = dt.date.fromisoformat(origem.get("inicio", ""))
+        fim = dt.date.fromisoformat(origem.get("fim", ""))
+    except ValueError:
+        raise ValueError("Informe inicio e fim no formato AAAA-MM-DD")
+
+    if fim < inicio or (fim - inicio).days > COBERTURA_MAX_DIAS:
+        raise ValueError("Período inválido (máximo de 10 anos)")
+
+    try:
+        limite = int(origem.get("limite", LIMITE_AUSENTES))
+    except ValueError:
+        raise ValueError("Limite inválido")
+
+    if limite < 0:
+        raise ValueError("Limite inválido")
+
+    return inicio, fim, limite
+
+
+# ============================================================================
+# API: AUSENTES POR DIA
+# ============================================================================
+@cobertura_bp.route("/api/cobertura")
+def api_cobertura():
+    """
+    Quantidade de pessoas ausentes (férias ou folga) em cada dia do período
+    e os dias acima do limite de ausentes.
+
+    Parâmetros (query string):
+        inicio, fim (YYYY-MM-DD): período, fim inclusivo (obrigatórios)
+        limite (int): máximo de ausentes tolerado (padrão: LIMITE_AUSENTES)
+
+    Retorna (JSON):
+        {
+            "inicio", "fim", "limite",
+            "ausentes": [n, ...]  — um valor por dia, a partir de `inicio`,
+            "dias_acima": [{"data": "YYYY-MM-DD", "ausentes": n}, ...]
+        }
+    """
+    try:
+        inicio, fim, limite = _periodo_e_limite(request.args)
+    except ValueError as erro:
+        return jsonify({"erro": str(erro)}), 400
+
+    dias, contagem = ausencias_por_dia(inicio, fim)
+    acima = contagem > limite
+
+    return jsonify({
+        "inicio": inicio.isoformat(),
+        "fim": fim.isoformat(),
+        "limite": limite,
+        "ausentes": contagem.tolist(),
+        "dias_acima": [
+            {"data": data, "ausentes": n}
+            for data, n in zip(dias[acima].astype(str).tolist(), contagem[acima].tolist())
+        ]
+    })
+
+
+# ============================================================================
+# API: CONFLITOS DE UM PERÍODO
+# ============================================================================
+@cobertura_bp.route("/api/conflitos")
+def api_conflitos():
+    """
+    Janelas do período com mais de `limite` pessoas ausentes ao mesmo tempo,
+    com quem está ausente em cada uma.
+
+    Parâmetros (query string):
+        inicio, fim (YYYY-MM-DD): período, fim inclusivo (obrigatórios)
+        limite (int): máximo de ausentes tolerado (padrão: LIMITE_AUSENTES)
+
+    Retorna (JSON):
+        {"limite": n, "conflitos": [{"inicio", "fim", "ausentes": [{"id", "nome"}]}]}
+    """
+    try:
+        inicio, fim, limite = _periodo_e_limite(request.args)
+    except ValueError as erro:
+        return jsonify({"erro": str(erro)}), 400
+
+    return jsonify({
+        "limite": limite,
+        "conflitos": listar_conflitos(inicio, fim, limite)
+    })
+
+
+# ============================================================================
+# API: CHECAGEM DE CONFLITO ANTES DE SALVAR FÉRIAS
+# ============================================================================
+@cobertura_bp.route("/api/conflitos/verificar")
+def api_verificar_conflito():
+    """
+    Verifica se um período de férias (novo ou editado) deixaria ausentes
+    demais em algum dia. Usado pelo formulário de férias antes de enviar.
+
+    Parâmetros (query string):
+        funcionario_id (int): obrigatório
+        inicio, fim (YYYY-MM-DD): período, fim inclusivo (obrigatórios)
+        ferias_id (int): registro em edição (opcional)
+        limite (int): máximo de ausentes tolerado (padrão: LIMITE_AUSENTES)
+
+    Retorna (JSON):
+        {"limite": n, "conflitos": [...]} no formato de /api/conflitos
+    """
+    try:
+        inicio, fim, limite = _periodo_e_limite(request.args)
+    except ValueError as erro:
+        return jsonify({"erro": str(erro)}), 400
+
+    try:
+        funcionario_id = int(request.args.get("funcionario_id", ""))
+        ferias_id = request.args.get("ferias_id") or None
+        if ferias_id is not None:
+            ferias_id = int(ferias_id)
+    except ValueError:
+        return jsonify({"erro": "Funcionário ou registro inválido"}), 400
+
+    return jsonify({
+        "limite": limite,
+        "conflitos": verificar_conflito(funcionario_id, inicio, fim, ferias_id, limite)
+    })
@@ -0,0 +1,193 @@
+"""
+dias_uteis_routes.py
+--------------------
+Módulo responsável pelas consultas de dias úteis (segunda a sexta, sem
+feriados).
+
+Funcionalidades implementadas:
+- Contagem de dias úteis de um período
+- Projeção da data final a partir do início e da quantidade de dias úteis
+- Cálculo em lote (vários períodos numa chamada), para relatórios
+
+Os cálculos ficam em `dias_uteis_service.py`.
+"""
+
+import datetime as dt
+
+from flask import Blueprint, jsonify, request
+
+from services.dias_uteis_service import (
+    anos_permitidos,
+    contar_dias_uteis,
+    dias_uteis,
+    projetar_fim,
+)
+
+# Blueprint dedicado aos dias úteis
+dias_uteis_bp = Blueprint("dias_uteis", __name__)
+
+# Limites das consultas (10 anos de período / de dias úteis projetados)
+DIAS_UTEIS_MAX_PERIODO = 10 * 366
+DIAS_UTEIS_MAX_DIAS = 10 * 366
+
+# Máximo de itens por chamada em lote
+DIAS_UTEIS_MAX_LOTE = 10000
+
+
+# ============================================================================
+# AUXILIARES DE VALIDAÇÃO
+# ============================================================================
+def _data(valor):
+    """
+    Converte "YYYY-MM-DD" em date, dentro dos anos atendidos pelo
+    calendário (`anos_permitidos()`).
+
+    Raises:
+        ValueError: com a mensagem de erro para o cliente.
+    """
+    try:
+        data = dt.date.fromisoformat(valor or "")
+    except (TypeError, ValueError):
+        raise ValueError("Datas devem estar no formato AAAA-MM-DD")
+
+    primeiro, ultimo = anos_permitidos()
+    if not primeiro <= data.year <= ultimo:
+        raise ValueError(f"Datas devem estar entre {primeiro} e {ultimo}")
+
+    return data
+
+
+def _periodo(inicio, fim):
+    """Valida e converte um período [inicio, fim]."""
+    inicio, fim = _data(inicio), _data(fim)
+    if fim < inicio or (fim - inicio).days > DIAS_UTEIS_MAX_PERIODO:
+        raise ValueError("Período inválido (máximo de 10 anos)")
+    return inicio, fim
+
+
+def _projecao(inicio, dias):
+    """Valida e converte um pedido de projeção (inicio, dias úteis)."""
+    inicio = _data(inicio)
+    try:
+        dias = int(dias)
+    except (TypeError, ValueError):
+        raise ValueError("Quantidade de dias inválida")
+
+    if not 1 <= dias <= DIAS_UTEIS_MAX_DIAS:
+        raise ValueError("Quantidade de dias inválida")
+    return inicio, dias
+
+
+# ============================================================================
+# API: DIAS ÚTEIS DE UM PERÍODO
+# ============================================================================
+@dias_uteis_bp.route("/api/dias-uteis")
+def api_dias_uteis():
+    """
+    Quantidade de dias úteis e corridos de um período.
+
+    Parâmetros (query string):
+        inicio, fim (YYYY-MM-DD): período, fim inclusivo
+
+    Retorna (JSON):
+        {"inicio", "fim", "dias_corridos", "dias_uteis"}
+    """
+    try:
+        inicio, fim = _periodo(request.args.get("inicio"), request.args.get("fim"))
+    except ValueError as erro:
+        return jsonify({"erro": str(erro)}), 400
+
+    return jsonify({
+        "inicio": inicio.isoformat(),
+        "fim": fim.isoformat(),
+        "dias_corridos": (fim - inicio).days + 1,
+        "dias_uteis": dias_uteis(inicio, fim)
+    })
+
+
+# ============================================================================
+# API: PROJEÇÃO DA DATA FINAL
+# ============================================================================
+@dias_uteis_bp.route("/api/dias-uteis/projecao")
+def api_projecao_dias_uteis():
+    """
+    Data final de um período que começa em `inicio` e tem `dias` dias úteis
+    (fins de semana e feriados são pulados).
+
+    Parâmetros (query string):
+        inicio (YYYY-MM-DD)
+        dias (int): quantidade de dias úteis, de 1 a 3660
+
+    Retorna (JSON):
+        {"inicio", "dias", "fim", "dias_corridos"}
+        ou erro 400 (inclusive se o fim passar do último ano do calendário).
+    """
+    try:
+        inicio, dias = _projecao(request.args.get("inicio"), request.args.get("dias"))
+        fim = projetar_fim(inicio, dias)[0].astype(dt.date)
+    except ValueError as erro:
+        return jsonify({"erro": str(erro)}), 400
+
+    return jsonify({
+        "inicio": inicio.isoformat(),
+        "dias": dias,
+        "fim": fim.isoformat(),
+        "dias_corridos": (fim - inicio).days + 1
+    })
+
+
+# ============================================================================
+# API: CÁLCULO EM LOTE
+# ============================================================================
+@dias_uteis_bp.route("/api/dias-uteis/lote", methods=["POST"])
+def api_dias_uteis_lote():
+    """
+    Calcula vários períodos numa única chamada (um cálculo vetorizado para
+    todas as contagens e outro para todas as projeções).
+
+    Corpo (JSON):
+        {"periodos": [{"inicio", "fim"} | {"inicio", "dias"}, ...]}
+        - com "fim": conta os dias úteis
+        - com "dias": projeta a data final
+
+    Retorna (JSON):
+        {"resultados": [{"dias_uteis": n} | {"fim": "YYYY-MM-DD"}, ...]}
+        na mesma ordem dos períodos enviados, ou erro 400 indicando o
+        primeiro item inválido.
+    """
+    corpo = request.get_json(silent=True) or {}
+    periodos = corpo.get("periodos")
+
+    if not isinstance(periodos, list) or len(periodos) > DIAS_UTEIS_MAX_LOTE:
+        return jsonify({"erro": f"Envie 'periodos' com até {DIAS_UTEIS_MAX_LOTE} itens"}), 400
+
+    contagens, projecoes = [], []
+    for i, periodo in enumerate(periodos):
+        try:
+            if not isinstance(periodo, dict):
+                raise ValueError("Item deve ser um objeto")
+            if "fim" in periodo:
+                contagens.append((i, *_periodo(periodo.get("inicio"), periodo["fim"])))
+            else:
+                projecoes.append((i, *_projecao(periodo.get("inicio"), periodo.get("dias"))))
+        except ValueError as erro:
+            return jsonify({"erro": f"Item {i}: {erro}"}), 400
+
+    resultados = [None] * len(periodos)
+
+    if contagens:
+        posicoes, inicios, fins = zip(*contagens)
+        for i, n in zip(posicoes, contar_dias_uteis(list(inicios), list(fins)).tolist()):
+            resultados[i] = {"dias_uteis": n}
+
+    if projecoes:
+        posicoes, inicios, dias = zip(*projecoes)
+        try:
+            fins = projetar_fim(list(inicios), list(dias))
+        except ValueError as erro:
+            return jsonify({"erro": str(erro)}), 400
+
+        for i, fim in zip(posicoes, fins.astype(str).tolist()):
+            resultados[i] = {"fim": fim}
+
+    return jsonify({"resultados": resultados})
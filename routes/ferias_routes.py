@@ -6,30 +6,166 @@ Blueprint responsável por todas as rotas relacionadas ao gerenciamento de féri
 Funcionalidades implementadas:
 - Carregamento da página inicial com dados de funcionários e períodos de férias.
 - Cadastro de novos períodos de férias com validações.
+- Cadastro em lote (API JSON), validado em memória e gravado de uma vez.
 - Atualização de registros existentes.
 - Exclusão de férias.
 - Filtros dinâmicos via AJAX.
-- Consulta de saldo restante de dias por funcionário.
+- Paginação por cursor (keyset) da tabela e dos filtros, com JSON em fluxo.
+- Consulta de saldo restante de dias por funcionário (individual ou em lote).
+- Aviso de conflito de escala (ausentes demais no mesmo dia) antes de salvar.
 
-Este arquivo conversa diretamente com `ferias_service.py` e `funcionario_service.py`,
-que executam a lógica de banco de dados.
+Este arquivo conversa diretamente com `ferias_service.py`, que executa a
+lógica de banco de dados.
 """
 
-from flask import Blueprint, jsonify, render_template, request, redirect, url_for
-from services.funcionario_service import listar_funcionarios
+from flask import (
+    Blueprint, Response, jsonify, render_template, request, redirect,
+    stream_with_context, url_for
+)
+from database import transacao
 from services.ferias_service import (
+    LIMITE_DIAS_FERIAS,
     adicionar_ferias,
+    adicionar_ferias_em_lote,
     listar_ferias,
+    iterar_ferias,
+    filtrar_ferias_service,
+    codificar_cursor,
+    decodificar_cursor,
     atualizar_ferias,
     deletar_ferias,
     total_dias_ferias,
+    saldos_por_funcionario,
+    janela_do_funcionario,
     existe_sobreposicao
 )
-from datetime import datetime
+from services.conflito_service import verificar_conflito
+from datetime import date, datetime
+import json
 
 # Blueprint principal das rotas de férias
 ferias_bp = Blueprint("ferias", __name__)
 
+# Tamanho padrão e máximo das páginas da tabela de férias
+TAMANHO_PAGINA = 100
+TAMANHO_PAGINA_MAXIMO = 500
+
+# Máximo de períodos por chamada em lote
+FERIAS_MAX_LOTE = 5000
+
+
+# ============================================================================
+# AUXILIARES DE PAGINAÇÃO
+# ============================================================================
+def _parametros_pagina(origem):
+    """
+    Lê `cursor` e `limite` de `request.args` ou `request.form`.
+
+    Retorna:
+        tuple (cursor, limite)
+
+    Raises:
+        ValueError: cursor malformado ou limite não numérico.
+    """
+    cursor = origem.get("cursor") or None
+    if cursor:
+        decodificar_cursor(cursor)
+
+    limite = int(origem.get("limite") or TAMANHO_PAGINA)
+    limite = max(1, min(limite, TAMANHO_PAGINA_MAXIMO))
+
+    return cursor, limite
+
+
+def _json_paginado(itens, limite, cursor_de):
+    """
+    Responde uma página em JSON gerado aos poucos (streaming), sem montar a
+    lista inteira em memória.
+
+    `itens` deve trazer até `limite + 1` registros: o registro extra só
+    indica que existe uma próxima página.
+
+    Formato:
+        {"itens": [...], "proximo": <cursor da próxima página ou null>}
+    """
+
+    def gerar():
+        yield '{"itens": ['
+
+        proximo = None
+        ultimo = None
+
+        for i, item in enumerate(itens):
+            if i == limite:
+                proximo = cursor_de(ultimo)
+                break
+            if i:
+                yield ", "
+            yield json.dumps(item, ensure_ascii=False)
+            ultimo = item
+
+        yield '], "proximo": ' + json.dumps(proximo) + "}"
+
+    return Response(stream_with_context(gerar()), mimetype="application/json")
+
+
+def _cursor_do_item(item):
+    """Cursor keyset de um item JSON de férias."""
+    return codificar_cursor(item["funcionario_id"], item["inicio_iso"], item["id"])
+
+
+# ============================================================================
+# AUXILIAR: DATAS DO FORMULÁRIO
+# ============================================================================
+def _periodo_do_formulario():
+    """
+    Lê `inicio` e `fim` (YYYY-MM-DD) do formulário.
+
+    As datas seguem para os serviços sempre no formato ISO canônico
+    ("2024-03-05", nunca "2024-3-5"): o índice de sobreposição, o
+    período aquisitivo e as consultas por faixa de datas dependem dele.
+
+    Retorna:
+        tuple (inicio, fim, dias): datas ISO e quantidade de dias corridos.
+
+    Raises:
+        ValueError: se alguma data for inválida.
+    """
+    data_i = date.fromisoformat((request.form.get("inicio") or "").strip())
+    data_f = date.fromisoformat((request.form.get("fim") or "").strip())
+    return data_i.isoformat(), data_f.isoformat(), (data_f - data_i).days + 1
+
+
+# ============================================================================
+# AUXILIAR DE CONFLITO DE ESCALA
+# ============================================================================
+def _aviso_conflito(funcionario_id, inicio, fim, ignorar_ferias_id=None):
+    """
+    Checa se o período deixa ausentes demais em algum dia.
+
+    O aviso é ignorado quando o formulário chega com `ignorar_conflito`
+    (o usuário já confirmou o conflito na tela).
+
+    Retorna:
+        str | None: mensagem de aviso, ou None se pode salvar.
+    """
+    if request.form.get("ignorar_conflito"):
+        return None
+
+    conflitos = verificar_conflito(funcionario_id, inicio, fim, ignorar_ferias_id)
+    if not conflitos:
+        return None
+
+    trechos = [
+        f"{c['inicio']} a {c['fim']}: " + ", ".join(p["nome"] for p in c["ausentes"])
+        for c in conflitos
+    ]
+    return (
+        "Aviso: pessoas demais ausentes ao mesmo tempo neste período. "
+        + " | ".join(trechos)
+        + ". Envie novamente confirmando o conflito para salvar mesmo assim."
+    )
+
 
 # ============================================================================
 # PÁGINA INICIAL DO SISTEMA (Dashboard)
@@ -40,35 +176,90 @@ def pagina_inicial():
     Renderiza a página inicial do sistema, preenchendo:
 
     - Ano atual e próximo ano (para filtros e validação)
-    - Lista de funcionários com saldo restante de férias
-    - Todos os períodos de férias cadastrados
+    - Lista de funcionários com saldo restante de férias (período atual)
+    - A primeira página dos períodos de férias cadastrados (as seguintes
+      são carregadas sob demanda via `/ferias-pagina`)
 
     O saldo é calculado como:
-        saldo = 30 - total_dias_ferias(funcionario_id)
+        saldo = 30 - dias já usados
+
+    Os saldos de todos os funcionários vêm de uma única consulta à tabela
+    `saldo_ferias` (`saldos_por_funcionario()`), em vez de uma soma por
+    funcionário.
     """
 
     ano_atual = datetime.now().year
     ano_proximo = ano_atual + 1
 
-    # Lista todos os funcionários e calcula saldo individual
-    funcionarios = listar_funcionarios()
-    ferias = listar_ferias(ano_atual, ano_proximo)
+    # Lista todos os funcionários já com o saldo individual
+    funcionarios_saldo = [
+        (s["id"], s["nome"], s["saldo"]) for s in saldos_por_funcionario()
+    ]
+    # Busca um registro a mais só para saber se existe próxima página
+    ferias = listar_ferias(ano_atual, ano_proximo, limite=TAMANHO_PAGINA + 1)
 
-    funcionarios_saldo = []
-    for f in funcionarios:
-        saldo = 30 - total_dias_ferias(f[0])
-        funcionarios_saldo.append((f[0], f[1], saldo))
+    proximo_cursor = None
+    if len(ferias) > TAMANHO_PAGINA:
+        ferias = ferias[:TAMANHO_PAGINA]
+        ultima = ferias[-1]
+        proximo_cursor = codificar_cursor(ultima[1], ultima[10], ultima[0])
 
     # Renderiza o index.html com dados consolidados
     return render_template(
         "index.html",
         funcionarios=funcionarios_saldo,
         ferias=ferias,
+        proximo_cursor=proximo_cursor,
         ano_atual=ano_atual,
         ano_proximo=ano_proximo
     )
 
 
+# ============================================================================
+# PRÓXIMAS PÁGINAS DA TABELA DE FÉRIAS (JSON EM FLUXO)
+# ============================================================================
+@ferias_bp.route("/ferias-pagina")
+def ferias_pagina():
+    """
+    Retorna a próxima página da tabela da página inicial.
+
+    Parâmetros (query string):
+        cursor : valor de "proximo" da página anterior
+        limite : tamanho da página (padrão 100, máximo 500)
+
+    Retorna:
+        JSON {"itens": [...], "proximo": <cursor>} gerado em fluxo, com os
+        mesmos campos exibidos na tabela (incluindo as folgas).
+    """
+    try:
+        cursor, limite = _parametros_pagina(request.args)
+    except ValueError:
+        return jsonify({"erro": "Parâmetros de paginação inválidos"}), 400
+
+    ano_atual = datetime.now().year
+    ano_proximo = ano_atual + 1
+
+    itens = (
+        {
+            "id": f[0],
+            "funcionario_id": f[1],
+            "funcionario": f[2],
+            "sap": f[3],
+            "dias": f[4],
+            "abono": f[5],
+            "inicio": f[6],
+            "fim": f[7],
+            "folga_atual": f[8],
+            "folga_proximo": f[9],
+            "inicio_iso": f[10],
+            "fim_iso": f[11]
+        }
+        for f in iterar_ferias(ano_atual, ano_proximo, cursor, limite + 1)
+    )
+
+    return _json_paginado(itens, limite, _cursor_do_item)
+
+
 # ============================================================================
 # ADICIONAR NOVO PERÍODO DE FÉRIAS
 # ============================================================================
@@ -79,50 +270,109 @@ def route_adicionar_ferias():
 
     Validações aplicadas:
     - Data final >= data inicial
-    - Funcionário não pode ultrapassar 30 dias no ano
+    - Funcionário não pode ultrapassar 30 dias no período aquisitivo
     - Não pode haver sobreposição de períodos já cadastrados
+    - Avisa se o período deixa ausentes demais no mesmo dia (conflito de
+      escala), a menos que o formulário traga `ignorar_conflito`
 
     Após validação, insere o registro no banco chamando `adicionar_ferias()`.
+
+    Validação e inserção rodam na mesma transação (`transacao()`), então duas
+    submissões simultâneas não conseguem passar ambas pela checagem.
     """
 
     funcionario_id = request.form.get("funcionario_id")
     agendado_sap = request.form.get("agendado_sap")
     abono = request.form.get("abono_peculiario")
-    inicio = request.form.get("inicio")
-    fim = request.form.get("fim")
 
     # Converte datas e calcula quantidade de dias
-    data_i = datetime.strptime(inicio, "%Y-%m-%d")
-    data_f = datetime.strptime(fim, "%Y-%m-%d")
-    dias_novos = (data_f - data_i).days + 1
+    try:
+        inicio, fim, dias_novos = _periodo_do_formulario()
+    except ValueError:
+        return "Erro: datas inválidas (use o formato AAAA-MM-DD)."
 
     if dias_novos < 1:
         return "Erro: a data final deve ser igual ou posterior à data inicial!"
 
-    dias_ja = total_dias_ferias(funcionario_id)
-
-    # Impede ultrapassar 30 dias no ano
-    if dias_ja + dias_novos > 30:
-        return f"Erro: funcionário já tirou {dias_ja} dias. Somando {dias_novos}, ultrapassa 30."
-
-    # Impede sobreposição de datas
-    if existe_sobreposicao(funcionario_id, inicio, fim):
-        return "Erro: já existe férias cadastrada que se sobrepõe a este período."
-
-    # Inserção no banco
-    adicionar_ferias(
-        funcionario_id,
-        agendado_sap,
-        dias_novos,
-        abono,
-        inicio,
-        fim,
-        cor="#4CAF50"
-    )
+    with transacao():
+        # Período aquisitivo (janela de 12 meses) que contém o início
+        periodo, janela_ini, janela_fim = janela_do_funcionario(funcionario_id, inicio)
+        dias_ja = total_dias_ferias(funcionario_id, periodo)
+
+        # Impede ultrapassar 30 dias no período aquisitivo
+        if dias_ja + dias_novos > LIMITE_DIAS_FERIAS:
+            return (
+                f"Erro: funcionário já tirou {dias_ja} dias no período aquisitivo "
+                f"{janela_ini:%d/%m/%Y} a {janela_fim:%d/%m/%Y}. "
+                f"Somando {dias_novos}, ultrapassa {LIMITE_DIAS_FERIAS}."
+            )
+
+        # Impede sobreposição de datas
+        if existe_sobreposicao(funcionario_id, inicio, fim):
+            return "Erro: já existe férias cadastrada que se sobrepõe a este período."
+
+        # Avisa sobre ausentes demais no mesmo dia
+        aviso = _aviso_conflito(funcionario_id, inicio, fim)
+        if aviso:
+            return aviso
+
+        # Inserção no banco
+        adicionar_ferias(
+            funcionario_id,
+            agendado_sap,
+            dias_novos,
+            abono,
+            inicio,
+            fim,
+            cor="#4CAF50"
+        )
 
     return redirect(url_for("ferias.pagina_inicial"))
 
 
+# ============================================================================
+# API: ADICIONAR VÁRIOS PERÍODOS DE FÉRIAS (LOTE)
+# ============================================================================
+@ferias_bp.route("/api/ferias/lote", methods=["POST"])
+def api_adicionar_ferias_lote():
+    """
+    Cadastra vários períodos de férias numa única chamada (ex.: a escala
+    do ano de uma equipe inteira), tudo ou nada.
+
+    Aplica as mesmas regras do cadastro pelo formulário (limite de 30 dias
+    no período aquisitivo e sobreposição), considerando também os outros
+    itens do lote. O aviso de conflito de escala não é aplicado: use
+    /api/conflitos depois de gravar.
+
+    Corpo (JSON):
+        {"periodos": [{"funcionario_id", "inicio", "fim",
+                       "agendado_sap"?, "abono_peculiario"?}, ...]}
+        - datas no formato YYYY-MM-DD; "sim"/"não" (padrão "não")
+
+    Retorna (JSON):
+        201 {"gravados": n, "resultados": [{"id"}, ...]}
+        400 {"erro", "resultados": [{"erro"} | {"valido": true}, ...]} —
+            nenhum período é gravado se algum for inválido.
+    """
+    corpo = request.get_json(silent=True) or {}
+    periodos = corpo.get("periodos")
+
+    if not isinstance(periodos, list) or not periodos or len(periodos) > FERIAS_MAX_LOTE:
+        return jsonify({"erro": f"Envie 'periodos' com 1 a {FERIAS_MAX_LOTE} itens"}), 400
+
+    with transacao():
+        gravado, resultados = adicionar_ferias_em_lote(periodos)
+
+    if not gravado:
+        invalidos = sum(1 for r in resultados if "erro" in r)
+        return jsonify({
+            "erro": f"{invalidos} período(s) inválido(s); nenhum foi gravado",
+            "resultados": resultados
+        }), 400
+
+    return jsonify({"gravados": len(resultados), "resultados": resultados}), 201
+
+
 # ============================================================================
 # ATUALIZAR FÉRIAS EXISTENTES
 # ============================================================================
@@ -133,6 +383,7 @@ def route_atualizar_ferias(ferias_id):
 
     Validações aplicadas:
     - Impede sobreposição com outros períodos do mesmo funcionário
+    - Avisa sobre conflito de escala, como no cadastro
     - Recalcula quantidade de dias
     - Atualiza valores de SAP, abono, datas e cor
 
@@ -144,27 +395,31 @@ def route_atualizar_ferias(ferias_id):
     funcionario_id = request.form.get("funcionario_id")
     agendado_sap = request.form.get("agendado_sap")
     abono = request.form.get("abono_peculiario")
-    inicio = request.form.get("inicio")
-    fim = request.form.get("fim")
-
-    # Validação de sobreposição ignorando o próprio registro atualizado
-    if existe_sobreposicao(funcionario_id, inicio, fim, ignorar_ferias_id=ferias_id):
-        return "Erro: já existe férias cadastrada que se sobrepõe a este período."
 
     # Converte datas e recalcula dias
-    data_i = datetime.strptime(inicio, "%Y-%m-%d")
-    data_f = datetime.strptime(fim, "%Y-%m-%d")
-    dias_novos = (data_f - data_i).days + 1
-
-    atualizar_ferias(
-        ferias_id,
-        agendado_sap,
-        dias_novos,
-        abono,
-        inicio,
-        fim,
-        cor="#4CAF50"
-    )
+    try:
+        inicio, fim, dias_novos = _periodo_do_formulario()
+    except ValueError:
+        return "Erro: datas inválidas (use o formato AAAA-MM-DD)."
+
+    with transacao():
+        # Validação de sobreposição ignorando o próprio registro atualizado
+        if existe_sobreposicao(funcionario_id, inicio, fim, ignorar_ferias_id=ferias_id):
+            return "Erro: já existe férias cadastrada que se sobrepõe a este período."
+
+        aviso = _aviso_conflito(funcionario_id, inicio, fim, ignorar_ferias_id=ferias_id)
+        if aviso:
+            return aviso
+
+        atualizar_ferias(
+            ferias_id,
+            agendado_sap,
+            dias_novos,
+            abono,
+            inicio,
+            fim,
+            cor="#4CAF50"
+        )
 
     return redirect(url_for("ferias.pagina_inicial"))
 
@@ -198,8 +453,11 @@ def filtrar_ferias():
         mes            : mês desejado
         abono          : filtro opcional por abono pecuniário
         sap            : filtro por agendado no SAP
+        cursor         : cursor da página anterior (opcional)
+        limite         : tamanho da página (padrão 100, máximo 500)
 
-    Retorna JSON contendo os registros filtrados.
+    Retorna JSON {"itens": [...], "proximo": <cursor>} gerado em fluxo,
+    contendo uma página dos registros filtrados.
     """
     funcionario_id = request.form.get("funcionario_id")
     ano = request.form.get("ano")
@@ -207,10 +465,17 @@ def filtrar_ferias():
     abono = request.form.get("abono")
     sap = request.form.get("sap")
 
-    from services.ferias_service import filtrar_ferias_service
-    dados = filtrar_ferias_service(funcionario_id, ano, mes, abono, sap)
+    try:
+        cursor, limite = _parametros_pagina(request.form)
+    except ValueError:
+        return jsonify({"erro": "Parâmetros de paginação inválidos"}), 400
 
-    return jsonify(dados)
+    dados = filtrar_ferias_service(
+        funcionario_id, ano, mes, abono, sap,
+        apos=cursor, limite=limite + 1
+    )
+
+    return _json_paginado(dados, limite, _cursor_do_item)
 
 
 # ============================================================================
@@ -219,13 +484,70 @@ def filtrar_ferias():
 @ferias_bp.route("/saldo/<int:func_id>")
 def pegar_saldo(func_id):
     """
-    Retorna o saldo de férias restantes do funcionário.
+    Retorna o saldo de férias restantes do funcionário num período
+    aquisitivo.
+
+    Parâmetros (query string, opcionais):
+        data    : data (YYYY-MM-DD) dentro do período desejado — o
+                  formulário envia o início das férias (padrão: hoje)
+        periodo : período aquisitivo; tem precedência sobre `data`
 
     Cálculo:
-        saldo = 30 - total_dias_ferias(func_id)
+        saldo = 30 - dias já usados no período
+
+    Retorna:
+        {"saldo", "periodo", "inicio", "fim"}: saldo e datas da janela
+        aquisitiva (dd/MM/yyyy).
+    """
+    try:
+        data = request.args.get("data")
+        data = date.fromisoformat(data).isoformat() if data else date.today().isoformat()
+        periodo = request.args.get("periodo")
+        periodo = int(periodo) if periodo else None
+    except ValueError:
+        return jsonify({"erro": "Data ou período inválido"}), 400
+
+    periodo, inicio, fim = janela_do_funcionario(func_id, data, periodo)
+
+    return jsonify({
+        "saldo": LIMITE_DIAS_FERIAS - total_dias_ferias(func_id, periodo),
+        "periodo": periodo,
+        "inicio": inicio.strftime("%d/%m/%Y"),
+        "fim": fim.strftime("%d/%m/%Y")
+    })
+
+
+# ============================================================================
+# CONSULTAR SALDOS DE VÁRIOS FUNCIONÁRIOS (LOTE)
+# ============================================================================
+@ferias_bp.route("/saldos")
+def pegar_saldos():
+    """
+    Retorna o saldo de vários funcionários numa única chamada.
+
+    Parâmetros (query string):
+        ids     : lista de IDs separados por vírgula (ex.: /saldos?ids=1,2,3).
+                  Sem o parâmetro, retorna todos os funcionários.
+        periodo : período aquisitivo (padrão: o período em curso de cada
+                  funcionário)
 
     Retorna:
-        {"saldo": <valor>}
+        JSON: [{"id", "nome", "periodo", "usados", "saldo"}, ...]
+        ou erro 400 caso algum ID (ou o período) seja inválido.
     """
-    saldo = 30 - total_dias_ferias(func_id)
-    return jsonify({"saldo": saldo})
+    ids_param = request.args.get("ids")
+
+    ids = None
+    if ids_param is not None:
+        try:
+            ids = [int(i) for i in ids_param.split(",") if i.strip()]
+        except ValueError:
+            return jsonify({"erro": "IDs inválidos"}), 400
+
+    try:
+        periodo = request.args.get("periodo")
+        periodo = int(periodo) if periodo else None
+    except ValueError:
+        return jsonify({"erro": "Período inválido"}), 400
+
+    return jsonify(saldos_por_funcionario(ids, periodo))
@@ -14,6 +14,8 @@ Este módulo utiliza o serviço `funcionario_service.py` para executar
 operações diretamente no banco de dados.
 """
 
+from datetime import date
+
 from flask import Blueprint, render_template, request, redirect, url_for, jsonify
 from services.funcionario_service import (
     listar_funcionarios,
@@ -27,6 +29,34 @@ from services.funcionario_service import (
 funcionario_bp = Blueprint("funcionario", __name__)
 
 
+# ============================================================================
+# AUXILIAR: DATA DE ADMISSÃO DO FORMULÁRIO
+# ============================================================================
+def _data_admissao():
+    """
+    Lê o campo opcional `data_admissao` (YYYY-MM-DD) do formulário.
+
+    A data é gravada sempre no formato ISO canônico ("2020-01-15", nunca
+    "2020-1-15"): os períodos aquisitivos recortam o texto (mês e dia) e o
+    gatilho de saldo usa `strftime()`, que não aceita outros formatos.
+
+    Retorna:
+        str | None: a data ISO; "" se o campo veio em branco (limpar a
+        data); None se o campo não veio (manter a data atual).
+
+    Raises:
+        ValueError: se a data for inválida.
+    """
+    data = request.form.get("data_admissao")
+    if data is None:
+        return None
+
+    data = data.strip()
+    if data:
+        data = date.fromisoformat(data).isoformat()
+    return data
+
+
 # ============================================================================
 # PÁGINA PRINCIPAL DO CRUD DE FUNCIONÁRIOS
 # ============================================================================
@@ -53,8 +83,10 @@ def route_adicionar_funcionario():
     """
     Recebe o nome do funcionário via formulário e adiciona no banco.
 
-    Parâmetro esperado (POST):
-        nome: nome do funcionário
+    Parâmetros esperados (POST):
+        nome          : nome do funcionário
+        data_admissao : data de admissão (opcional), que define os
+                        períodos aquisitivos de férias
 
     Caso o nome esteja preenchido, chama `adicionar_funcionario()`.
     Em seguida, redireciona para a página principal do CRUD.
@@ -62,8 +94,13 @@ def route_adicionar_funcionario():
 
     nome = request.form.get("nome")
 
+    try:
+        data_admissao = _data_admissao()
+    except ValueError:
+        return "Erro: data de admissão inválida."
+
     if nome:
-        adicionar_funcionario(nome)
+        adicionar_funcionario(nome, data_admissao or None)
 
     return redirect(url_for("funcionario.pagina_funcionarios"))
 
@@ -84,7 +121,7 @@ def route_buscar_funcionario(func_id):
         func_id (int): ID do funcionário desejado.
 
     Retorna:
-        JSON com {id, nome} ou erro 404 caso não exista.
+        JSON com {id, nome, data_admissao} ou erro 404 caso não exista.
     """
 
     func = obter_funcionario_por_id(func_id)
@@ -92,7 +129,7 @@ def route_buscar_funcionario(func_id):
     if func is None:
         return jsonify({"erro": "Funcionário não encontrado"}), 404
 
-    return jsonify({"id": func[0], "nome": func[1]})
+    return jsonify({"id": func[0], "nome": func[1], "data_admissao": func[2]})
 
 
 # ============================================================================
@@ -104,7 +141,9 @@ def route_atualizar_funcionario(func_id):
     Atualiza o nome de um funcionário existente.
 
     Parâmetros esperados (POST):
-        nome — novo nome a ser atribuído
+        nome          — novo nome a ser atribuído
+        data_admissao — nova data de admissão (opcional; em branco limpa
+                        a data, ausente mantém a atual)
 
     Caso exista novo nome, chama `atualizar_funcionario()`.
 
@@ -113,8 +152,13 @@ def route_atualizar_funcionario(func_id):
 
     novo_nome = request.form.get("nome")
 
+    try:
+        data_admissao = _data_admissao()
+    except ValueError:
+        return "Erro: data de admissão inválida."
+
     if novo_nome:
-        atualizar_funcionario(func_id, novo_nome)
+        atualizar_funcionario(func_id, novo_nome, data_admissao)
 
     return redirect(url_for("funcionario.pagina_funcionarios"))
 
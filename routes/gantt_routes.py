@@ -9,242 +9,476 @@ Módulo responsável pela geração da visualização do gráfico Gantt contendo
 - Realce de finais de semana
 - Suporte a tema claro e escuro
 - Sistema de filtros por funcionário, mês e ano
+- Distribuição do plotly.js como arquivo estático com cache de longa duração
+- Cache LRU do gráfico renderizado, invalidado pela versão dos dados
+- API JSON colunar (`/api/gantt`) usada para redesenhar o gráfico no navegador
+- Modo WebGL para muitas barras e página de benchmark com dados sintéticos
+- Mapa de calor de ausências por dia ou semana (`/gantt/heatmap`)
 """
 
-from flask import Blueprint, render_template, request
-from services.ferias_service import listar_periodos_para_gantt
-from services.folga_service import listar_folgas
-import plotly.express as px
+from flask import Blueprint, Response, jsonify, redirect, render_template, request, url_for
+from database import versao_dados
+from services.ferias_service import (
+    anos_das_ferias,
+    codificar_cursor_faixa,
+    decodificar_cursor_faixa,
+    faixas_do_gantt,
+    janelas_do_filtro,
+    listar_periodos_para_gantt,
+    nomes_com_ferias
+)
+from services.folga_service import anos_das_folgas, listar_folgas_para_gantt
+from services.feriado_service import feriados_no_intervalo
+from services.cobertura_service import ausencias_por_dia, ausencias_por_semana
+import numpy as np
 import plotly.graph_objects as go
+from plotly.offline import get_plotlyjs
+from collections import OrderedDict
 import datetime as dt
-import holidays
+import hashlib
+import json
+import threading
+import time
 
 gantt_bp = Blueprint("gantt", __name__)
 
+# Conteúdo do plotly.js empacotado e seu hash: (bytes, hash)
+_plotlyjs = None
+
+# Faixas (funcionários) por página do gráfico e altura de cada faixa (px)
+FAIXAS_POR_PAGINA = 50
+FAIXAS_POR_PAGINA_MAXIMO = 500
+ALTURA_FAIXA = 30
+ALTURA_MINIMA = 450
+
+# Anos aceitos no filtro: até esta distância do ano atual
+ANOS_FILTRO = 50
+
+# Acima desta quantidade de barras o gráfico usa traces WebGL (Scattergl)
+LIMITE_WEBGL = 2000
+
+# Limites do cache de gráficos renderizados
+CACHE_GRAFICO_MAX_ITENS = 64
+CACHE_GRAFICO_MAX_BYTES = 64 * 1024 * 1024
+
 
 # ============================================================================#
-# FUNÇÃO PARA OBTER LISTA COMPLETA DE FERIADOS (ANO ATUAL + PRÓXIMO)
+# CACHE DO GRÁFICO RENDERIZADO (LRU + LIMITE DE MEMÓRIA)
 # ============================================================================#
-def obter_feriados():
+class CacheGrafico:
     """
-    Retorna um dicionário contendo todos os feriados relevantes para o gráfico.
+    Cache LRU thread-safe dos gráficos já renderizados.
 
-    Inclui:
-    - Feriados nacionais e estaduais usando a biblioteca `holidays`.
-    - Feriados municipais fixos (ex.: Aniversário de Osasco).
-    - Feriados móveis: Carnaval, Corpus Christi, e outros suportados pela lib.
+    A chave inclui a versão dos dados (`database.versao_dados()`), o tema e
+    os filtros: qualquer escrita em férias/folgas/funcionários gera uma
+    versão nova e as entradas antigas simplesmente deixam de ser usadas,
+    saindo do cache pela política LRU.
 
-    Formato do retorno:
-        {
-            "YYYY-MM-DD": "Nome do feriado",
-            ...
-        }
+    O tamanho é limitado tanto pela quantidade de itens quanto pelo total
+    de bytes do HTML guardado.
     """
-    ano_atual = dt.datetime.now().year
-    ano_prox = ano_atual + 1
 
-    feriados = holidays.Brazil(
-        years=[ano_atual, ano_prox],
-        state="SP",
-        language="pt_BR"
+    def __init__(self, max_itens=CACHE_GRAFICO_MAX_ITENS, max_bytes=CACHE_GRAFICO_MAX_BYTES):
+        self.max_itens = max_itens
+        self.max_bytes = max_bytes
+        self._itens = OrderedDict()
+        self._bytes = 0
+        self._trava = threading.Lock()
+
+    def obter(self, chave):
+        """Retorna o valor guardado (ou None), marcando-o como recente."""
+        with self._trava:
+            item = self._itens.get(chave)
+            if item is None:
+                return None
+            self._itens.move_to_end(chave)
+            return item[0]
+
+    def guardar(self, chave, valor, tamanho):
+        """Guarda o valor e descarta os menos usados até caber no limite."""
+        if tamanho > self.max_bytes:
+            return
+
+        with self._trava:
+            antigo = self._itens.pop(chave, None)
+            if antigo is not None:
+                self._bytes -= antigo[1]
+
+            self._itens[chave] = (valor, tamanho)
+            self._bytes += tamanho
+
+            while len(self._itens) > self.max_itens or self._bytes > self.max_bytes:
+                _, (_, tamanho_removido) = self._itens.popitem(last=False)
+                self._bytes -= tamanho_removido
+
+    def limpar(self):
+        with self._trava:
+            self._itens.clear()
+            self._bytes = 0
+
+
+cache_grafico = CacheGrafico()
+
+
+# ============================================================================#
+# PLOTLY.JS COMO ARQUIVO ESTÁTICO (NOME COM HASH + CACHE LONGO)
+# ============================================================================#
+def _plotlyjs_empacotado():
+    """
+    Carrega (uma única vez) o plotly.js que acompanha o pacote `plotly`.
+
+    O arquivo vem de dentro da própria biblioteca, então funciona offline e
+    no executável do PyInstaller (`--collect-data plotly`).
+
+    Retorna:
+        tuple (conteudo_bytes, hash_curto)
+    """
+    global _plotlyjs
+
+    if _plotlyjs is None:
+        conteudo = get_plotlyjs().encode("utf-8")
+        _plotlyjs = (conteudo, hashlib.sha256(conteudo).hexdigest()[:16])
+
+    return _plotlyjs
+
+
+def url_plotlyjs():
+    """
+    URL do plotly.js com o hash do conteúdo no nome do arquivo.
+
+    Como o nome muda sempre que o conteúdo muda (atualização do plotly), o
+    navegador pode guardar o arquivo em cache indefinidamente.
+    """
+    return url_for("gantt.plotlyjs", versao=_plotlyjs_empacotado()[1])
+
+
+@gantt_bp.route("/static/js/plotly-<versao>.min.js")
+def plotlyjs(versao):
+    """
+    Entrega o plotly.js com cache de um ano (`immutable`) e ETag.
+
+    Pedidos com hash antigo são redirecionados para a versão atual.
+    """
+    conteudo, hash_atual = _plotlyjs_empacotado()
+
+    if versao != hash_atual:
+        return redirect(url_plotlyjs())
+
+    resposta = Response(conteudo, mimetype="text/javascript")
+    resposta.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+    resposta.set_etag(hash_atual)
+
+    return resposta.make_conditional(request)
+
+
+# ============================================================================#
+# FUNDO DO GRÁFICO (FINAIS DE SEMANA E FERIADOS)
+# ============================================================================#
+def _data_caminho(data):
+    """Data (date ou ISO) no formato aceito num caminho SVG do Plotly (sem '-')."""
+    return str(data).replace("-", "_")
+
+
+def faixas_fim_de_semana(inicio, fim):
+    """
+    Agrupa os sábados e domingos entre duas datas em faixas contínuas.
+
+    Parâmetros:
+        inicio (date)
+        fim (date): inclusive
+
+    Retorna:
+        list[tuple]: [(primeiro_dia, dia_seguinte_ao_ultimo), ...]
+    """
+    faixas = []
+
+    # Primeiro sábado (ou domingo, se o intervalo começar num domingo)
+    dia = inicio
+    while dia <= fim and dia.weekday() < 5:
+        dia += dt.timedelta(days=1)
+
+    while dia <= fim:
+        # Sábado → segunda; domingo → segunda
+        fim_faixa = dia + dt.timedelta(days=7 - dia.weekday())
+        faixas.append((dia, min(fim_faixa, fim + dt.timedelta(days=1))))
+        dia = fim_faixa + dt.timedelta(days=5)
+
+    return faixas
+
+
+def camada_fins_de_semana(faixas, cor):
+    """
+    Retorna o realce dos finais de semana como uma única forma `path`.
+
+    Cada faixa sábado+domingo vira um retângulo do caminho, com altura
+    relativa à área do gráfico (`yref="paper"`): a forma não depende da
+    quantidade de linhas exibidas.
+
+    Parâmetros:
+        faixas (iterable): [(inicio, fim_exclusivo), ...], datas ou ISO
+        cor (str)
+
+    Retorna:
+        list[dict]: [] ou [forma]
+    """
+    caminho = "".join(
+        f"M{_data_caminho(x0)},0L{_data_caminho(x1)},0"
+        f"L{_data_caminho(x1)},1L{_data_caminho(x0)},1Z"
+        for x0, x1 in faixas
     )
+    if not caminho:
+        return []
 
-    resultado = {}
+    return [dict(
+        type="path",
+        path=caminho,
+        xref="x", yref="paper",
+        fillcolor=cor,
+        line=dict(width=0),
+        layer="below"
+    )]
 
-    # Feriado municipal
-    resultado[f"{ano_atual}-02-19"] = "Aniversário de Osasco"
-    resultado[f"{ano_prox}-02-19"] = "Aniversário de Osasco"
 
-    # Feriados móveis + Santo Antônio
-    for ano in [ano_atual, ano_prox]:
-        try:
-            datas = holidays.Brazil(years=[ano]).get_named("Carnaval")
-            if datas:
-                resultado[datas[0].strftime("%Y-%m-%d")] = "Carnaval"
-        except:
-            pass
+def camada_feriados(feriados):
+    """
+    Retorna as linhas vermelhas dos feriados como uma única forma `path`.
 
-        try:
-            datas = holidays.Brazil(years=[ano]).get_named("Corpus Christi")
-            if datas:
-                resultado[datas[0].strftime("%Y-%m-%d")] = "Corpus Christi"
-        except:
-            pass
+    Parâmetros:
+        feriados (iterable): datas (date ou ISO)
 
-        resultado[f"{ano}-06-13"] = "Santo Antônio"
+    Retorna:
+        list[dict]: [] ou [forma]
+    """
+    caminho = "".join(
+        f"M{_data_caminho(data)},0L{_data_caminho(data)},1" for data in feriados
+    )
+    if not caminho:
+        return []
+
+    return [dict(
+        type="path",
+        path=caminho,
+        xref="x", yref="paper",
+        line=dict(color="red", width=2, dash="dot")
+    )]
 
-    # Feriados padrão
-    for data, nome in feriados.items():
-        if isinstance(data, dt.date):
-            resultado[data.strftime("%Y-%m-%d")] = nome
 
-    return resultado
+# ============================================================================#
+# TEMAS DO GRÁFICO (usados no servidor e enviados ao JavaScript da página)
+# ============================================================================#
+TEMAS = {
+    "light": {
+        "paper_bg": "white",
+        "plot_bg": "white",
+        "text_color": "#222",
+        "grid_color": "#ccc",
+        "weekend_color": "rgba(0,0,0,0.05)",
+        "legend_bg": "white",
+    },
+    "dark": {
+        "paper_bg": "#121212",
+        "plot_bg": "#1a1a1a",
+        "text_color": "#e0e0e0",
+        "grid_color": "#333",
+        "weekend_color": "rgba(255,255,255,0.05)",
+        "legend_bg": "rgba(0,0,0,0)",
+    },
+}
+
+# Tipos de barra (o payload guarda só o índice) e suas cores
+TIPOS = ("Férias", "Folga")
+CORES_TIPOS = {"Férias": "#1e88e5", "Folga": "#ffa726"}
 
 
 # ============================================================================#
 # ROTA DO GRÁFICO GANTT
 # ============================================================================#
+def _tema_do_cookie():
+    """
+    Tema do cookie `theme`, reduzido a "dark" ou "light".
+
+    Os gráficos só distinguem esses dois; normalizar antes de montar a
+    chave do `cache_grafico` evita que valores arbitrários do cookie criem
+    entradas próprias e tirem do cache as verdadeiras.
+    """
+    return "dark" if request.cookies.get("theme") == "dark" else "light"
+
+
+def _filtros_da_requisicao():
+    """
+    Lê os filtros (funcionário, mês, ano) da query string.
+
+    Retorna:
+        tuple (funcionario, mes, ano) de str ("" = todos)
+
+    Raises:
+        ValueError: mês fora de 1..12 ou ano a mais de `ANOS_FILTRO` anos
+                    do atual.
+    """
+    funcionario = request.args.get("funcionario") or ""
+    mes = request.args.get("mes") or ""
+    ano = request.args.get("ano") or ""
+
+    if mes and (not mes.isdigit() or not 1 <= int(mes) <= 12):
+        raise ValueError("Mês inválido: use um número de 1 a 12")
+    if ano and (not ano.isdigit() or abs(int(ano) - dt.date.today().year) > ANOS_FILTRO):
+        raise ValueError(f"Ano inválido: use até {ANOS_FILTRO} anos antes ou depois do atual")
+
+    return funcionario, mes, ano
+
+
+def _parametros_faixas():
+    """
+    Lê `apos`, `antes` e `limite` (paginação das faixas) da query string.
+
+    Retorna:
+        tuple (apos, antes, limite)
+
+    Raises:
+        ValueError: cursor malformado ou limite não numérico.
+    """
+    apos = request.args.get("apos") or None
+    antes = request.args.get("antes") or None
+
+    for cursor in (apos, antes):
+        if cursor:
+            decodificar_cursor_faixa(cursor)
+
+    limite = int(request.args.get("limite") or FAIXAS_POR_PAGINA)
+    limite = max(1, min(limite, FAIXAS_POR_PAGINA_MAXIMO))
+
+    return apos, antes, limite
+
+
 @gantt_bp.route("/gantt")
 def pagina_gantt():
     """
-    Gera e exibe o gráfico de Gantt com todos os períodos de férias, folgas,
+    Exibe o gráfico de Gantt com todos os períodos de férias, folgas,
     feriados e finais de semana.
-    """
 
-    # ---------------- TEMA (LIGHT / DARK) ----------------
-    theme = request.cookies.get("theme", "light")
-
-    if theme == "dark":
-        paper_bg = "#121212"
-        plot_bg = "#1a1a1a"
-        text_color = "#e0e0e0"
-        grid_color = "#333"
-        weekend_color = "rgba(255,255,255,0.05)"
-        legend_bg = "rgba(0,0,0,0)"
-    else:
-        paper_bg = "white"
-        plot_bg = "white"
-        text_color = "#222"
-        grid_color = "#ccc"
-        weekend_color = "rgba(0,0,0,0.05)"
-        legend_bg = "white"
-
-    # ---------------- FILTROS (GET) ----------------
-    funcionario_filtro = request.args.get("funcionario") or ""
-    mes_filtro = request.args.get("mes") or ""
-    ano_filtro = request.args.get("ano") or ""
-
-    # ---------------- DADOS DO BANCO ----------------
-    dados_todos = listar_periodos_para_gantt()   # férias
-    folgas_todas = listar_folgas()               # folgas
-    feriados_dict = obter_feriados()             # feriados (ano atual + próximo)
-
-    # Lista única de funcionários (para possíveis filtros futuros)
-    funcionarios_unicos = sorted({d[0] for d in dados_todos})
-
-    # Lista de anos existentes em férias + folgas
-    anos_set = set()
-    for nome, inicio, fim in dados_todos:
-        try:
-            anos_set.add(int(inicio[:4]))
-            anos_set.add(int(fim[:4]))
-        except Exception:
-            pass
-    for f in folgas_todas:
-        try:
-            anos_set.add(int(f["data_folga"][:4]))
-        except Exception:
-            pass
-    anos_unicos = sorted(anos_set)
-
-    # Copias que serão filtradas
-    dados = list(dados_todos)
-    folgas = list(folgas_todas)
-
-    # ---------------- Função auxiliar de filtro ----------------
-    def dentro_do_filtro(inicio, fim):
-        dt_inicio = dt.datetime.strptime(inicio, "%Y-%m-%d")
-        dt_fim = dt.datetime.strptime(fim, "%Y-%m-%d")
-
-        # Filtro por ano (se selecionado)
-        if ano_filtro:
-            ano_int = int(ano_filtro)
-            if dt_inicio.year != ano_int and dt_fim.year != ano_int:
-                return False
-
-        # Filtro por mês (se selecionado)
-        if mes_filtro:
-            mes_int = int(mes_filtro)
-            if dt_inicio.month != mes_int and dt_fim.month != mes_int:
-                return False
-
-        return True
-
-    # ---------------- FILTRAR POR FUNCIONÁRIO ----------------
-    if funcionario_filtro:
-        dados = [d for d in dados if d[0] == funcionario_filtro]
-        folgas = [f for f in folgas if f["nome"] == funcionario_filtro]
-
-    # ---------------- APLICAR FILTRO DE DATA ----------------
-    dados = [d for d in dados if dentro_do_filtro(d[1], d[2])]
-    folgas = [
-        f for f in folgas
-        if dentro_do_filtro(f["data_folga"], f["data_folga"])
-    ]
+    A primeira visualização (primeira página de faixas) vem pronta do
+    servidor; trocas de filtro e de tema e as páginas seguintes são
+    desenhadas no navegador a partir de `/api/gantt`.
 
-    # =====================================================
-    # GERAR LISTA DE TAREFAS (FÉRIAS + FOLGAS)
-    # =====================================================
-    tasks = []
+    O gráfico renderizado fica no `cache_grafico`, com chave
+    (versão dos dados, tema, filtros, ano atual). Visualizações repetidas
+    sem alterações no banco custam apenas uma consulta ao dicionário.
+    """
 
-    # Férias
-    for nome, inicio, fim in dados:
-        tasks.append({
-            "Funcionário": nome,
-            "Inicio": inicio,
-            "Fim": fim,
-            "Tipo": "Férias"
-        })
-
-    # Folgas
-    for f in folgas:
-        nome = f["nome"]
-        d = f["data_folga"]
-
-        dt_inicio = dt.datetime.strptime(d, "%Y-%m-%d")
-        dt_fim = dt_inicio + dt.timedelta(days=1)
-
-        tasks.append({
-            "Funcionário": nome,
-            "Inicio": dt_inicio.strftime("%Y-%m-%d"),
-            "Fim": dt_fim.strftime("%Y-%m-%d"),
-            "Tipo": "Folga"
-        })
+    theme = _tema_do_cookie()
 
-    # Caso não existam resultados com os filtros aplicados
-    if not tasks:
-        return render_template(
-            "gantt.html",
-            grafico_html="<h3>Sem dados com esses filtros</h3>",
-            feriados={},
-            funcionarios=funcionarios_unicos,
-            anos=anos_unicos,
-            ano_selecionado=ano_filtro
-        )
+    try:
+        funcionario_filtro, mes_filtro, ano_filtro = _filtros_da_requisicao()
+    except ValueError as erro:
+        return f"Erro: {erro}", 400
 
-    # =====================================================
-    # GERAÇÃO DO GRÁFICO COM PLOTLY
-    # =====================================================
-    fig = px.timeline(
-        tasks,
-        x_start="Inicio",
-        x_end="Fim",
-        color="Tipo",
-        color_discrete_map={
-            "Férias": "#1e88e5",
-            "Folga": "#ffa726"
-        },
-        y="Funcionário"
+    # A versão é lida antes dos dados: se houver escrita no meio do caminho,
+    # o resultado fica guardado sob a versão antiga e nunca é reaproveitado
+    chave = (
+        versao_dados(), theme, funcionario_filtro, mes_filtro, ano_filtro,
+        dt.date.today().year
     )
 
-    # Hover personalizado, mas mantendo a cor padrão de cada trace
-    hovertemplate = (
-        "<b>%{customdata[0]}</b><br>"   # Tipo (Férias / Folga)
-        "Início: %{base|%b %d, %Y}<br>"
-        "Fim: %{x|%b %d, %Y}<br>"
-        "Funcionário: %{y}<br>"
-        "<extra></extra>"
+    contexto = cache_grafico.obter(chave)
+    if contexto is None:
+        contexto = montar_gantt(theme, funcionario_filtro, mes_filtro, ano_filtro)
+        cache_grafico.guardar(chave, contexto, len(contexto["grafico_html"]))
+
+    return render_template(
+        "gantt.html",
+        temas=TEMAS,
+        cores_tipos=CORES_TIPOS,
+        faixas_por_pagina=FAIXAS_POR_PAGINA,
+        altura_faixa=ALTURA_FAIXA,
+        altura_minima=ALTURA_MINIMA,
+        limite_webgl=LIMITE_WEBGL,
+        plotlyjs=url_plotlyjs(),
+        **contexto
     )
 
-    for i, trace in enumerate(fig.data):
-        tipo = trace.name  # "Férias" ou "Folga"
-        custom_data = [[tipo] for _ in trace.x]
-        fig.data[i].customdata = custom_data
-        fig.data[i].hovertemplate = hovertemplate
 
-    fig.update_yaxes(autorange="reversed", tickfont=dict(size=18))
+@gantt_bp.route("/api/gantt")
+def api_gantt():
+    """
+    Dados do gráfico de Gantt em formato colunar (ver `dados_gantt()`).
+
+    Aceita os mesmos filtros da página (`funcionario`, `mes`, `ano`) e a
+    paginação das faixas (`apos` ou `antes`, cursores de faixa, e `limite`).
+    A resposta é guardada no `cache_grafico` junto com seu ETag (hash do
+    próprio corpo), então o navegador recebe 304 enquanto o conteúdo não
+    mudar — em qualquer worker, já que o ETag não depende do processo.
+    """
+
+    try:
+        filtros = _filtros_da_requisicao()
+    except ValueError as erro:
+        return jsonify({"erro": str(erro)}), 400
 
-    shapes = []
+    try:
+        pagina = _parametros_faixas()
+    except ValueError:
+        return jsonify({"erro": "Parâmetros de paginação inválidos"}), 400
+
+    chave = ("api", versao_dados(), *filtros, *pagina, dt.date.today().year)
+
+    item = cache_grafico.obter(chave)
+    if item is None:
+        apos, antes, limite = pagina
+        corpo = json.dumps(
+            dados_gantt(*filtros, apos=apos, antes=antes, limite=limite),
+            ensure_ascii=False, separators=(",", ":")
+        ).encode("utf-8")
+        item = (corpo, hashlib.sha256(corpo).hexdigest()[:16])
+        cache_grafico.guardar(chave, item, len(corpo))
+
+    corpo, etag = item
+    resposta = Response(corpo, mimetype="application/json")
+    resposta.headers["Cache-Control"] = "no-cache"
+    resposta.set_etag(etag)
+
+    return resposta.make_conditional(request)
+
+
+# ============================================================================#
+# DADOS DO GRÁFICO (PAYLOAD COLUNAR)
+# ============================================================================#
+def dados_gantt(funcionario_filtro, mes_filtro, ano_filtro,
+                apos=None, antes=None, limite=None):
+    """
+    Consulta os dados do gráfico e devolve-os em colunas.
+
+    Cada barra é uma posição das listas `idx`, `inicio`, `fim` e `tipo`;
+    o nome do funcionário vai uma única vez em `nomes` (`idx` aponta para
+    ele) e o tipo é o índice em `tipos`.
+
+    Com `limite`, o gráfico vem em páginas de faixas (funcionários em ordem
+    de nome, ver `faixas_do_gantt()`) e só as barras dessas faixas são lidas.
+
+    Parâmetros:
+        funcionario_filtro, mes_filtro, ano_filtro (str): filtros ("" = todos)
+        apos, antes (str | None): cursor de faixa (página seguinte/anterior)
+        limite (int | None): faixas por página (None = todas)
+
+    Retorna:
+        dict:
+            {
+                "nomes": [nome, ...],          # uma faixa por funcionário
+                "idx": [int, ...],
+                "inicio": ["YYYY-MM-DD", ...],
+                "fim": ["YYYY-MM-DD", ...],    # exclusivo
+                "tipo": [int, ...],
+                "tipos": ["Férias", "Folga"],
+                "feriados": {"data": [...], "nome": [...]},
+                "fins_de_semana": {"inicio": [...], "fim": [...]},
+                "anos": [int, ...],            # opções do filtro de ano
+                "ano_selecionado": str,
+                "proximo": cursor | None,      # página seguinte de faixas
+                "anterior": cursor | None      # página anterior de faixas
+            }
+
+    Raises:
+        ValueError: se o cursor estiver malformado.
+    """
 
     # =====================================================
     # DEFINIR QUAIS ANOS VÃO APARECER NO GRAFICO
@@ -256,63 +490,304 @@ def pagina_gantt():
         # Sem filtro: ano atual + próximo
         anos_para_grafico = [ano_atual, ano_atual + 1]
 
-    # ---------------- FERIADOS (LINHAS VERMELHAS) ----------------
-    for data, nome in feriados_dict.items():
-        dt_data = dt.datetime.strptime(data, "%Y-%m-%d")
-        if dt_data.year not in anos_para_grafico:
+    inicio_grafico = dt.date(min(anos_para_grafico), 1, 1)
+    fim_grafico = dt.date(max(anos_para_grafico), 12, 31)
+
+    # Feriados dos anos exibidos (calendário memorizado por ano)
+    feriados = feriados_no_intervalo(inicio_grafico, fim_grafico)
+
+    # Opções do filtro de ano: consultas respondidas pelos índices
+    anos_unicos = sorted(set(anos_das_ferias()) | set(anos_das_folgas()))
+
+    # ---------------- DADOS DO BANCO (JÁ FILTRADOS) ----------------
+    # Ano/mês viram janelas de data: só as linhas desenhadas saem do banco
+    janelas = janelas_do_filtro(ano_filtro, mes_filtro, anos_unicos)
+
+    proximo = anterior = None
+
+    if mes_filtro and not janelas:
+        nomes, dados, folgas = [], [], []
+
+    elif limite:
+        # ---------------- PÁGINA DE FAIXAS ----------------
+        # Uma faixa a mais indica se existe outra página nesse sentido
+        faixas = faixas_do_gantt(
+            funcionario_filtro, janelas, apos=apos, antes=antes, limite=limite + 1
+        )
+
+        if antes:
+            if len(faixas) > limite:
+                faixas = faixas[1:]
+                anterior = codificar_cursor_faixa(faixas[0][1], faixas[0][0])
+            proximo = antes
+        else:
+            if len(faixas) > limite:
+                faixas = faixas[:limite]
+                proximo = codificar_cursor_faixa(faixas[-1][1], faixas[-1][0])
+            if apos and faixas:
+                anterior = codificar_cursor_faixa(faixas[0][1], faixas[0][0])
+
+        ids = [f[0] for f in faixas]
+        nomes = [f[1] for f in faixas]
+
+        dados = listar_periodos_para_gantt(funcionario_filtro, janelas, ids) if ids else []
+        folgas = listar_folgas_para_gantt(funcionario_filtro, janelas, ids) if ids else []
+
+    else:
+        dados = listar_periodos_para_gantt(funcionario_filtro, janelas)
+        folgas = listar_folgas_para_gantt(funcionario_filtro, janelas)
+
+        # Faixas em ordem alfabética
+        nomes = sorted({d[0] for d in dados} | {f[0] for f in folgas})
+
+    # =====================================================
+    # COLUNAS (FÉRIAS + FOLGAS)
+    # =====================================================
+    posicao = {}
+    for i, nome in enumerate(nomes):
+        posicao.setdefault(nome, i)
+
+    idx, inicio, fim, tipo = [], [], [], []
+
+    # Férias
+    for nome, data_inicio, data_fim in dados:
+        idx.append(posicao[nome])
+        inicio.append(data_inicio)
+        fim.append(data_fim)
+        tipo.append(0)
+
+    # Folgas (um dia: vai até o dia seguinte)
+    for nome, d in folgas:
+        idx.append(posicao[nome])
+        inicio.append(d)
+        fim.append((dt.date.fromisoformat(d) + dt.timedelta(days=1)).isoformat())
+        tipo.append(1)
+
+    faixas = faixas_fim_de_semana(inicio_grafico, fim_grafico)
+
+    return {
+        "nomes": nomes,
+        "idx": idx,
+        "inicio": inicio,
+        "fim": fim,
+        "tipo": tipo,
+        "tipos": list(TIPOS),
+        "feriados": {
+            "data": [data.isoformat() for data, _ in feriados],
+            "nome": [nome for _, nome in feriados],
+        },
+        "fins_de_semana": {
+            "inicio": [x0.isoformat() for x0, _ in faixas],
+            "fim": [x1.isoformat() for _, x1 in faixas],
+        },
+        "anos": anos_unicos,
+        "ano_selecionado": ano_filtro,
+        "proximo": proximo,
+        "anterior": anterior,
+    }
+
+
+# ============================================================================#
+# FIGURA A PARTIR DAS COLUNAS (SEM plotly.express / pandas)
+# ============================================================================#
+HOVER_GANTT = (
+    "<b>{tipo}</b><br>"
+    "Início: %{{base|%b %d, %Y}}<br>"
+    "Fim: %{{x|%b %d, %Y}}<br>"
+    "Funcionário: %{{y}}<br>"
+    "<extra></extra>"
+)
+
+# No WebGL o hover é sobre as pontas do segmento: as datas vão no customdata
+HOVER_GANTT_WEBGL = (
+    "<b>{tipo}</b><br>"
+    "Início: %{{customdata[0]|%b %d, %Y}}<br>"
+    "Fim: %{{customdata[1]|%b %d, %Y}}<br>"
+    "Funcionário: %{{y}}<br>"
+    "<extra></extra>"
+)
+
+
+def _segmentos(inicio, fim, separador):
+    """
+    Intercala duas colunas em segmentos separados por `separador`:
+    [inicio0, fim0, sep, inicio1, fim1, sep, ...]
+    """
+    segmentos = np.empty(3 * len(inicio), dtype=np.result_type(inicio, fim))
+    segmentos[0::3] = inicio
+    segmentos[1::3] = fim
+    segmentos[2::3] = separador
+    return segmentos
+
+
+def figura_gantt(dados, modo="auto"):
+    """
+    Monta a figura do Gantt direto das colunas de `dados_gantt()`.
+
+    Modo SVG: cada tipo vira um `go.Bar` horizontal com `base` = início e
+    `x` = duração em milissegundos (o mesmo que o `px.timeline` gera),
+    calculados com NumPy sobre as colunas inteiras.
+
+    Modo WebGL: cada tipo vira um `go.Scattergl` de linhas grossas, um
+    segmento por intervalo (bem mais leve de desenhar no navegador quando
+    há milhares de barras).
+
+    O tipo vai no `hovertemplate` da trace, sem `customdata` por ponto no
+    modo SVG.
+
+    Parâmetros:
+        dados (dict): payload de `dados_gantt()`
+        modo (str): "svg", "webgl" ou "auto" (WebGL acima de `LIMITE_WEBGL`)
+
+    Retorna:
+        go.Figure (sem tema, fundo e legendas extras)
+    """
+    if modo == "auto":
+        modo = "webgl" if len(dados["idx"]) > LIMITE_WEBGL else "svg"
+
+    nomes = np.array(dados["nomes"], dtype=object)
+    idx = np.asarray(dados["idx"], dtype=np.int64)
+    tipo = np.asarray(dados["tipo"], dtype=np.int64)
+    inicio = np.asarray(dados["inicio"], dtype="datetime64[D]")
+    fim = np.asarray(dados["fim"], dtype="datetime64[D]")
+
+    # Datas em milissegundos (float64): vão para o navegador como arrays
+    # binários, bem mais leves de serializar do que texto
+    inicio_ms = inicio.astype("datetime64[ms]").astype(np.int64).astype(np.float64)
+    fim_ms = fim.astype("datetime64[ms]").astype(np.int64).astype(np.float64)
+
+    fig = go.Figure()
+
+    for codigo, nome_tipo in enumerate(dados["tipos"]):
+        selecao = tipo == codigo
+        if not selecao.any():
             continue
 
-        shapes.append(dict(
-            type="line",
-            x0=dt_data, x1=dt_data,
-            y0=-0.5, y1=len(tasks) - 0.5,
-            line=dict(color="red", width=2, dash="dot"),
-            xref="x", yref="y"
-        ))
-
-    # ---------------- FINAIS DE SEMANA ----------------
-    for ano in anos_para_grafico:
-        inicio_ano = dt.datetime(ano, 1, 1)
-        fim_ano = dt.datetime(ano, 12, 31)
-        dias_total = (fim_ano - inicio_ano).days + 1
-
-        for i in range(dias_total):
-            dia = inicio_ano + dt.timedelta(days=i)
-            if dia.weekday() in (5, 6):  # sábado ou domingo
-                shapes.append(dict(
-                    type="rect",
-                    x0=dia, x1=dia + dt.timedelta(days=1),
-                    y0=-0.5, y1=len(tasks) - 0.5,
-                    fillcolor=weekend_color,
-                    line=dict(width=0),
-                    layer="below"
-                ))
+        nomes_sel = nomes[idx[selecao]]
+
+        if modo == "webgl":
+            # Segmentos separados por NaN/None; as duas pontas levam
+            # (início, fim) no customdata para o hover
+            periodo = np.full((3 * len(nomes_sel), 2), np.nan)
+            periodo[0::3, 0] = periodo[1::3, 0] = inicio_ms[selecao]
+            periodo[0::3, 1] = periodo[1::3, 1] = fim_ms[selecao]
+
+            fig.add_trace(go.Scattergl(
+                mode="lines",
+                name=nome_tipo,
+                legendgroup=nome_tipo,
+                x=_segmentos(inicio_ms[selecao], fim_ms[selecao], np.nan),
+                y=_segmentos(nomes_sel, nomes_sel, None),
+                customdata=periodo,
+                line=dict(color=CORES_TIPOS[nome_tipo], width=round(ALTURA_FAIXA * 0.6)),
+                hovertemplate=HOVER_GANTT_WEBGL.format(tipo=nome_tipo)
+            ))
+        else:
+            fig.add_trace(go.Bar(
+                orientation="h",
+                name=nome_tipo,
+                legendgroup=nome_tipo,
+                y=nomes_sel,
+                base=inicio[selecao],
+                x=(fim_ms - inicio_ms)[selecao].astype(np.int64),
+                marker=dict(color=CORES_TIPOS[nome_tipo]),
+                hovertemplate=HOVER_GANTT.format(tipo=nome_tipo)
+            ))
+
+    fig.update_layout(
+        barmode="overlay",
+        height=max(ALTURA_MINIMA, 150 + ALTURA_FAIXA * len(dados["nomes"])),
+        margin=dict(t=60),
+        legend=dict(title=dict(text="Tipo"), tracegroupgap=0)
+    )
+    fig.update_xaxes(type="date")
+    fig.update_yaxes(
+        type="category",
+        title=dict(text="Funcionário"),
+        autorange="reversed",
+        categoryorder="array",
+        categoryarray=dados["nomes"],
+        tickfont=dict(size=18)
+    )
+
+    return fig
+
+
+# ============================================================================#
+# GRÁFICO RENDERIZADO NO SERVIDOR (PRIMEIRA VISUALIZAÇÃO)
+# ============================================================================#
+def montar_gantt(theme, funcionario_filtro, mes_filtro, ano_filtro):
+    """
+    Consulta os dados e monta o gráfico de Gantt.
+
+    Parâmetros:
+        theme (str): "light" ou "dark"
+        funcionario_filtro, mes_filtro, ano_filtro (str): filtros ("" = todos)
+
+    Retorna:
+        dict: contexto para o template `gantt.html`.
+    """
+
+    # Só a primeira página de faixas; as demais vêm de `/api/gantt`
+    dados = dados_gantt(
+        funcionario_filtro, mes_filtro, ano_filtro, limite=FAIXAS_POR_PAGINA
+    )
+
+    feriados_dict = dict(zip(dados["feriados"]["data"], dados["feriados"]["nome"]))
+
+    # Caso não existam resultados com os filtros aplicados
+    if not dados["idx"]:
+        return dict(
+            grafico_html="<h3>Sem dados com esses filtros</h3>",
+            feriados={},
+            funcionarios=nomes_com_ferias(),
+            anos=dados["anos"],
+            ano_selecionado=ano_filtro,
+            proximo=None
+        )
+
+    # ---------------- TEMA (LIGHT / DARK) ----------------
+    tema = TEMAS["dark" if theme == "dark" else "light"]
+
+    # =====================================================
+    # GERAÇÃO DO GRÁFICO COM PLOTLY (direto das colunas)
+    # =====================================================
+    fig = figura_gantt(dados)
+
+    # Fundo compacto: uma única forma para todos os feriados e outra para
+    # todos os finais de semana (em vez de uma forma por dia)
+    shapes = camada_feriados(feriados_dict)
+
+    shapes += camada_fins_de_semana(
+        zip(dados["fins_de_semana"]["inicio"], dados["fins_de_semana"]["fim"]),
+        tema["weekend_color"]
+    )
 
     # =====================================================
     # LAYOUT E ESTILO
     # =====================================================
     fig.update_layout(
         shapes=shapes,
-        paper_bgcolor=paper_bg,
-        plot_bgcolor=plot_bg,
-        font=dict(color=text_color),
+        paper_bgcolor=tema["paper_bg"],
+        plot_bgcolor=tema["plot_bg"],
+        font=dict(color=tema["text_color"]),
 
         xaxis=dict(
             showgrid=True,
-            gridcolor=grid_color,
+            gridcolor=tema["grid_color"],
             zeroline=False,
-            tickfont=dict(color=text_color),
-            linecolor=grid_color
+            tickfont=dict(color=tema["text_color"]),
+            linecolor=tema["grid_color"]
         ),
 
         yaxis=dict(
             showgrid=False,
-            tickfont=dict(color=text_color)
+            tickfont=dict(color=tema["text_color"])
         ),
 
         legend=dict(
-            bgcolor=legend_bg,
-            font=dict(color=text_color)
+            bgcolor=tema["legend_bg"],
+            font=dict(color=tema["text_color"])
         )
     )
 
@@ -329,27 +804,281 @@ def pagina_gantt():
         name="Sábados e Domingos"
     ))
 
-    grafico_html = fig.to_html(full_html=False)
+    # O plotly.js não é embutido: a página carrega o arquivo estático, e o
+    # div tem id fixo para ser redesenhado pelo JavaScript
+    grafico_html = fig.to_html(
+        full_html=False, include_plotlyjs=False, div_id="grafico-gantt"
+    )
 
-    # =====================================================
-    # FERIADOS ORDENADOS PARA A TABELA (MESMA LÓGICA DO GRÁFICO)
-    # =====================================================
-    feriados_filtrados = {}
-    for data, nome in feriados_dict.items():
-        ano_data = int(data[:4])
-        if ano_data in anos_para_grafico:
-            feriados_filtrados[data] = nome
-
-    feriados_ordenados = dict(sorted(
-        feriados_filtrados.items(),
-        key=lambda x: x[0]
-    ))
+    # Feriados (já ordenados e restritos aos anos do gráfico) para a tabela
+    return dict(
+        grafico_html=grafico_html,
+        feriados=feriados_dict,
+        funcionarios=nomes_com_ferias(),
+        anos=dados["anos"],
+        ano_selecionado=ano_filtro,
+        proximo=dados["proximo"]
+    )
+
+
+# ============================================================================#
+# MAPA DE CALOR DE AUSÊNCIAS (POR DIA OU SEMANA ISO)
+# ============================================================================#
+DIAS_DA_SEMANA = ("Seg", "Ter", "Qua", "Qui", "Sex", "Sáb", "Dom")
+HEATMAP_MAX_DIAS = 10 * 366
+
+
+@gantt_bp.route("/gantt/heatmap")
+def pagina_heatmap():
+    """
+    Mapa de calor com a quantidade de pessoas ausentes (férias ou folga)
+    por dia ou por semana ISO, com os feriados marcados.
+
+    Parâmetros (query string):
+        inicio, fim (YYYY-MM-DD): período (padrão: ano atual + próximo)
+        granularidade: "dia" (padrão) ou "semana"
+    """
+
+    theme = _tema_do_cookie()
+    ano_atual = dt.date.today().year
+
+    try:
+        inicio = dt.date.fromisoformat(request.args.get("inicio") or f"{ano_atual}-01-01")
+        fim = dt.date.fromisoformat(request.args.get("fim") or f"{ano_atual + 1}-12-31")
+    except ValueError:
+        return "Período inválido", 400
+
+    if fim < inicio or (fim - inicio).days > HEATMAP_MAX_DIAS:
+        return "Período inválido (máximo de 10 anos)", 400
+
+    granularidade = "semana" if request.args.get("granularidade") == "semana" else "dia"
+
+    chave = ("heatmap", versao_dados(), theme, inicio, fim, granularidade)
+
+    grafico_html = cache_grafico.obter(chave)
+    if grafico_html is None:
+        grafico_html = montar_heatmap(theme, inicio, fim, granularidade)
+        cache_grafico.guardar(chave, grafico_html, len(grafico_html))
 
     return render_template(
-        "gantt.html",
+        "gantt_heatmap.html",
         grafico_html=grafico_html,
-        feriados=feriados_ordenados,
-        funcionarios=funcionarios_unicos,
-        anos=anos_unicos,
-        ano_selecionado=ano_filtro
+        inicio=inicio.isoformat(),
+        fim=fim.isoformat(),
+        granularidade=granularidade,
+        plotlyjs=url_plotlyjs()
+    )
+
+
+def montar_heatmap(theme, inicio, fim, granularidade):
+    """
+    Monta o mapa de calor de ausências.
+
+    - "dia": calendário com uma coluna por semana e uma linha por dia da
+      semana; feriados marcados com um "x".
+    - "semana": uma coluna por semana ISO e uma linha por ano ISO; semanas
+      com feriado marcadas com um "x".
+
+    Retorna:
+        str: fragmento HTML do gráfico.
+    """
+    tema = TEMAS["dark" if theme == "dark" else "light"]
+    feriados = feriados_no_intervalo(inicio, fim)
+
+    if granularidade == "semana":
+        segundas, contagem = ausencias_por_semana(inicio, fim)
+        semanas = [d.isocalendar() for d in segundas.astype(dt.date)]
+
+        anos = sorted({s[0] for s in semanas})
+        linha_do_ano = {ano: i for i, ano in enumerate(anos)}
+
+        z = np.full((len(anos), 53), np.nan)
+        rotulos = np.full((len(anos), 53), "", dtype=object)
+        for (ano, semana, _), segunda, valor in zip(semanas, segundas.astype(dt.date), contagem):
+            z[linha_do_ano[ano], semana - 1] = valor
+            rotulos[linha_do_ano[ano], semana - 1] = segunda.strftime("%d/%m/%Y")
+
+        x = list(range(1, 54))
+        y = [str(ano) for ano in anos]
+        hover = "Semana %{x} de %{y} (início %{text})<br>Ausentes: %{z}<extra></extra>"
+
+        # Feriados agrupados por semana ISO
+        nomes_por_semana = {}
+        for data, nome in feriados:
+            ano_iso, semana, _ = data.isocalendar()
+            nomes_por_semana.setdefault((ano_iso, semana), []).append(
+                f"{data.strftime('%d/%m')} {nome}"
+            )
+
+        feriados_x = [semana for _, semana in nomes_por_semana]
+        feriados_y = [str(ano) for ano, _ in nomes_por_semana]
+        feriados_texto = ["<br>".join(nomes) for nomes in nomes_por_semana.values()]
+        titulo_x = "Semana ISO"
+
+    else:
+        dias, contagem = ausencias_por_dia(inicio, fim)
+
+        # Calendário: coluna = semana (a partir da segunda), linha = dia da semana
+        primeira_segunda = dias[0] - inicio.weekday()
+        deslocamento = (dias - primeira_segunda).astype(np.int64)
+        colunas, linhas = deslocamento // 7, deslocamento % 7
+        total_semanas = int(colunas[-1]) + 1
+
+        z = np.full((7, total_semanas), np.nan)
+        z[linhas, colunas] = contagem
+
+        rotulos = np.full((7, total_semanas), "", dtype=object)
+        rotulos[linhas, colunas] = [d.strftime("%d/%m/%Y") for d in dias.astype(dt.date)]
+
+        x = np.datetime_as_string(primeira_segunda + 7 * np.arange(total_semanas)).tolist()
+        y = list(DIAS_DA_SEMANA)
+        hover = "%{text} (%{y})<br>Ausentes: %{z}<extra></extra>"
+
+        feriados_x = [
+            str(np.datetime64(data) - data.weekday()) for data, _ in feriados
+        ]
+        feriados_y = [DIAS_DA_SEMANA[data.weekday()] for data, _ in feriados]
+        feriados_texto = [f"{data.strftime('%d/%m/%Y')} {nome}" for data, nome in feriados]
+        titulo_x = "Semana"
+
+    fig = go.Figure(go.Heatmap(
+        x=x, y=y, z=z,
+        text=rotulos,
+        hovertemplate=hover,
+        colorscale="YlOrRd",
+        xgap=1, ygap=1,
+        colorbar=dict(title=dict(text="Ausentes"))
+    ))
+
+    # Feriados marcados sobre as células
+    fig.add_trace(go.Scatter(
+        x=feriados_x, y=feriados_y,
+        mode="markers",
+        marker=dict(symbol="x", size=8, color="red"),
+        text=feriados_texto,
+        hovertemplate="%{text}<extra>Feriado</extra>",
+        name="Feriados"
+    ))
+
+    fig.update_layout(
+        paper_bgcolor=tema["paper_bg"],
+        plot_bgcolor=tema["plot_bg"],
+        font=dict(color=tema["text_color"]),
+        height=ALTURA_MINIMA if granularidade == "dia" else max(300, 150 + 40 * len(y)),
+        xaxis=dict(title=dict(text=titulo_x), showgrid=False, linecolor=tema["grid_color"]),
+        yaxis=dict(autorange="reversed", showgrid=False, type="category"),
+        legend=dict(bgcolor=tema["legend_bg"], orientation="h", y=-0.2)
+    )
+
+    return fig.to_html(full_html=False, include_plotlyjs=False, div_id="grafico-heatmap")
+
+
+# ============================================================================#
+# BENCHMARK DE RENDERIZAÇÃO (DADOS SINTÉTICOS)
+# ============================================================================#
+BENCHMARK_BARRAS = (1000, 10000, 50000)
+BENCHMARK_MAX_BARRAS = 100000
+BENCHMARK_MAX_FAIXAS = 200
+
+
+def dados_sinteticos(barras):
+    """
+    Gera um payload no formato de `dados_gantt()` com `barras` intervalos
+    aleatórios (sempre os mesmos para a mesma quantidade) no ano atual e
+    no próximo, distribuídos em até `BENCHMARK_MAX_FAIXAS` faixas.
+
+    Nada é lido nem gravado no banco de férias.
+    """
+    gerador = np.random.default_rng(barras)
+
+    ano_atual = dt.date.today().year
+    inicio_grafico = dt.date(ano_atual, 1, 1)
+    fim_grafico = dt.date(ano_atual + 1, 12, 31)
+    dias = (fim_grafico - inicio_grafico).days
+
+    faixas = max(1, min(BENCHMARK_MAX_FAIXAS, barras // 5))
+    tipo = (gerador.random(barras) < 0.1).astype(np.int64)   # ~10% folgas
+    duracao = np.where(tipo == 1, 1, gerador.integers(5, 31, barras))
+
+    inicio = np.datetime64(inicio_grafico) + gerador.integers(0, dias, barras)
+    fim = inicio + duracao
+
+    feriados = feriados_no_intervalo(inicio_grafico, fim_grafico)
+    fins_de_semana = faixas_fim_de_semana(inicio_grafico, fim_grafico)
+
+    return {
+        "nomes": [f"Funcionário {i + 1:04d}" for i in range(faixas)],
+        "idx": gerador.integers(0, faixas, barras).tolist(),
+        "inicio": np.datetime_as_string(inicio, unit="D").tolist(),
+        "fim": np.datetime_as_string(fim, unit="D").tolist(),
+        "tipo": tipo.tolist(),
+        "tipos": list(TIPOS),
+        "feriados": {
+            "data": [data.isoformat() for data, _ in feriados],
+            "nome": [nome for _, nome in feriados],
+        },
+        "fins_de_semana": {
+            "inicio": [x0.isoformat() for x0, _ in fins_de_semana],
+            "fim": [x1.isoformat() for _, x1 in fins_de_semana],
+        },
+        "anos": [ano_atual, ano_atual + 1],
+        "ano_selecionado": "",
+        "proximo": None,
+        "anterior": None,
+    }
+
+
+def _barras_do_benchmark():
+    """Lê `barras` da query string, limitado a `BENCHMARK_MAX_BARRAS`."""
+    barras = int(request.args.get("barras") or BENCHMARK_BARRAS[0])
+    return max(1, min(barras, BENCHMARK_MAX_BARRAS))
+
+
+@gantt_bp.route("/api/gantt/sintetico")
+def api_gantt_sintetico():
+    """Payload sintético para a página de benchmark (`?barras=N`)."""
+    try:
+        barras = _barras_do_benchmark()
+    except ValueError:
+        return jsonify({"erro": "Quantidade de barras inválida"}), 400
+
+    corpo = json.dumps(
+        dados_sinteticos(barras), ensure_ascii=False, separators=(",", ":")
+    )
+    return Response(corpo, mimetype="application/json")
+
+
+@gantt_bp.route("/gantt/benchmark")
+def pagina_benchmark_gantt():
+    """
+    Página de benchmark: mede no servidor a montagem da figura (SVG e WebGL)
+    para 1k, 10k e 50k intervalos sintéticos, e no navegador o tempo de
+    desenho de cada quantidade/modo escolhido.
+    """
+
+    medicoes = []
+
+    for barras in BENCHMARK_BARRAS:
+        dados = dados_sinteticos(barras)
+
+        for modo in ("svg", "webgl"):
+            inicio = time.perf_counter()
+            figura = figura_gantt(dados, modo).to_json()
+            tempo_ms = (time.perf_counter() - inicio) * 1000
+
+            medicoes.append(dict(
+                barras=barras, modo=modo,
+                tempo_ms=round(tempo_ms, 1), tamanho_kb=round(len(figura) / 1024)
+            ))
+
+    return render_template(
+        "gantt_benchmark.html",
+        medicoes=medicoes,
+        opcoes_barras=BENCHMARK_BARRAS,
+        temas=TEMAS,
+        cores_tipos=CORES_TIPOS,
+        altura_faixa=ALTURA_FAIXA,
+        altura_minima=ALTURA_MINIMA,
+        limite_webgl=LIMITE_WEBGL,
+        plotlyjs=url_plotlyjs()
     )
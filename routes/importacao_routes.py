@@ -0,0 +1,79 @@
+"""
+importacao_routes.py
+--------------------
+Módulo responsável pela importação de planilhas (CSV ou XLSX).
+
+Funcionalidades implementadas:
+- Upload de planilha de funcionários, férias ou folgas, com resumo da
+  importação e as linhas recusadas
+
+A leitura, a validação e a gravação em blocos ficam em
+`importacao_service.py`. Para arquivos grandes, o comando
+`flask --app app importar` grava o relatório completo de rejeições.
+"""
+
+from flask import Blueprint, jsonify, request
+
+from services.importacao_service import (
+    ERROS_DE_LEITURA,
+    RelatorioRejeicoes,
+    TIPOS_IMPORTACAO,
+    importar,
+    linhas_do_arquivo,
+)
+
+# Blueprint dedicado às importações
+importacao_bp = Blueprint("importacao", __name__)
+
+# Máximo de linhas recusadas listadas na resposta
+IMPORTACAO_MAX_REJEICOES = 1000
+
+
+# ============================================================================
+# API: IMPORTAR PLANILHA
+# ============================================================================
+@importacao_bp.route("/api/importar/<tipo>", methods=["POST"])
+def api_importar(tipo):
+    """
+    Importa uma planilha enviada como `arquivo` (multipart/form-data).
+
+    Tipos e colunas (cabeçalho na primeira linha, com ou sem acento):
+        funcionarios : nome, admissao (opcional)
+        ferias       : nome, inicio, fim, sap e abono (opcionais, sim/não)
+        folgas       : nome, data_folga, ano (opcional: ano da data)
+
+    Datas em AAAA-MM-DD ou dd/mm/aaaa (ou células de data no XLSX).
+    Linhas válidas são gravadas mesmo que outras sejam recusadas.
+
+    Parâmetros (formulário):
+        arquivo  : planilha .csv ou .xlsx
+        encoding : codificação do CSV (padrão utf-8-sig)
+
+    Retorna (JSON):
+        {"lidas", "gravadas", "rejeitadas",
+         "rejeicoes": [{"linha", "erro"}, ...]} — as primeiras 1000
+        ou erro 400:
+        - {"erro"}: tipo, formato, codificação ou cabeçalho inválido
+          (nada gravado);
+        - o resumo acima mais "erro": a leitura falhou no meio do arquivo.
+          As linhas anteriores à falha já foram gravadas (`gravadas`).
+    """
+    if tipo not in TIPOS_IMPORTACAO:
+        return jsonify({"erro": f"Tipo inválido: use {', '.join(TIPOS_IMPORTACAO)}"}), 400
+
+    arquivo = request.files.get("arquivo")
+    if arquivo is None or not arquivo.filename:
+        return jsonify({"erro": "Envie a planilha no campo 'arquivo'"}), 400
+
+    relatorio = RelatorioRejeicoes(limite=IMPORTACAO_MAX_REJEICOES)
+
+    try:
+        linhas = linhas_do_arquivo(
+            arquivo.stream, arquivo.filename, request.form.get("encoding") or "utf-8-sig"
+        )
+        resumo = importar(tipo, linhas, relatorio)
+    except ERROS_DE_LEITURA as erro:
+        return jsonify({"erro": str(erro)}), 400
+
+    resposta = jsonify({**resumo, "rejeicoes": relatorio.primeiras})
+    return (resposta, 400) if "erro" in resumo else resposta
@@ -0,0 +1,290 @@
+"""
+cobertura_service.py
+--------------------
+Camada de serviço responsável pela contagem de ausências (férias e folgas)
+por dia e por semana, usada no mapa de calor de ausências.
+
+Este módulo fornece:
+
+- Carga dos intervalos de ausência que tocam um período
+- Motor de cobertura: contagem diária de todo o histórico (pessoas
+  distintas por dia), montada uma vez e memorizada até a próxima gravação
+  no banco
+- Quantidade de ausentes por dia (vetorizada com NumPy)
+- Quantidade de ausentes por semana ISO (pessoas distintas: quem tem mais
+  de uma ausência na mesma semana conta uma vez)
+
+A contagem usa "vetor de diferenças": cada intervalo soma +1 no dia de
+início e -1 no dia seguinte ao fim; a soma acumulada (`cumsum`) dá o total
+de ausentes em cada dia. Antes disso, os intervalos de cada pessoa são
+unidos (`_uniao_por_pessoa()`), para que uma folga dentro das próprias
+férias não conte duas vezes. Tudo é vetorizado, sem laço por dia nem por
+funcionário, e o resultado tem um valor por dia (o tamanho não depende da
+quantidade de funcionários).
+"""
+
+import threading
+
+import numpy as np
+
+from database import get_db, versao_dados
+
+# Acima desta quantidade de ausentes no mesmo dia a equipe fica desfalcada
+LIMITE_AUSENTES = 5
+
+# julianday() de 1970-01-01: julianday(data) - EPOCA_JULIANA = dias desde
+# a época Unix (o valor inteiro de `datetime64[D]`)
+EPOCA_JULIANA = 2440587.5
+
+# Memória do motor: (versao_dados, primeiro dia, contagem por dia)
+_cobertura = None
+_trava = threading.Lock()
+
+
+# ============================================================================
+# INTERVALOS DE AUSÊNCIA (FÉRIAS + FOLGAS)
+# ============================================================================
+def carregar_intervalos(inicio, fim):
+    """
+    Carrega as ausências que tocam o período [inicio, fim], de funcionários
+    cadastrados.
+
+    Férias valem de `data_inicio` a `data_fim` (inclusive); uma folga vale
+    apenas o próprio dia.
+
+    Parâmetros:
+        inicio (date)
+        fim (date)
+
+    Retorna:
+        tuple (funcionarios, inicios, fins): IDs (np.ndarray[int]) e datas
+        (`datetime64[D]`), fins inclusivos.
+    """
+
+    conn = get_db()
+    cursor = conn.cursor()
+
+    cursor.execute("""
+        SELECT funcionario_id, data_inicio, data_fim
+        FROM ferias
+        WHERE data_fim >= ? AND data_inicio <= ?
+          AND funcionario_id IN (SELECT id FROM funcionarios)
+        UNION ALL
+        SELECT funcionario_id, data_folga, data_folga
+        FROM folga_assiduidade
+        WHERE data_folga BETWEEN ? AND ?
+          AND funcionario_id IN (SELECT id FROM funcionarios)
+    """, (inicio.isoformat(), fim.isoformat(), inicio.isoformat(), fim.isoformat()))
+
+    linhas = cursor.fetchall()
+    if not linhas:
+        vazio = np.array([], dtype="datetime64[D]")
+        return np.array([], dtype=np.int64), vazio, vazio
+
+    funcionarios, inicios, fins = zip(*linhas)
+    return (
+        np.array(funcionarios, dtype=np.int64),
+        np.array(inicios, dtype="datetime64[D]"),
+        np.array(fins, dtype="datetime64[D]"),
+    )
+
+
+def _uniao_por_pessoa(funcionarios, inicios, fins):
+    """
+    Une os intervalos sobrepostos de cada pessoa, para que ela conte uma
+    única vez em cada posição (ex.: folga dentro das próprias férias).
+
+    Vetorizado: ordena por (pessoa, início), acumula o maior fim já visto
+    dentro de cada pessoa e começa um intervalo novo onde o início passa
+    dele.
+
+    Parâmetros:
+        funcionarios, inicios, fins (np.ndarray[int]): fins inclusivos
+
+    Retorna:
+        tuple (inicios, fins): intervalos sem sobreposição dentro de cada
+        pessoa.
+    """
+    if len(inicios) == 0:
+        return inicios, fins
+
+    ordem = np.lexsort((inicios, funcionarios))
+    funcionarios, inicios, fins = funcionarios[ordem], inicios[ordem], fins[ordem]
+
+    nova_pessoa = np.ones(len(funcionarios), dtype=bool)
+    nova_pessoa[1:] = funcionarios[1:] != funcionarios[:-1]
+
+    # Cada pessoa numa faixa própria de valores: um único maximum.accumulate
+    # não deixa o fim de uma pessoa passar para a seguinte
+    base = inicios.min()
+    faixa = int(fins.max() - base) + 1
+    deslocamento = (np.cumsum(nova_pessoa) - 1) * faixa
+    maior_fim = np.maximum.accumulate(fins - base + deslocamento) - deslocamento + base
+
+    novo = nova_pessoa.copy()
+    novo[1:] |= inicios[1:] > maior_fim[:-1]
+    posicoes = np.flatnonzero(novo)
+
+    return inicios[posicoes], np.maximum.reduceat(fins, posicoes)
+
+
+def _contar(posicoes_inicio, posicoes_fim, tamanho):
+    """
+    Vetor de diferenças: +1 no início, -1 depois do fim, soma acumulada.
+
+    Parâmetros:
+        posicoes_inicio, posicoes_fim (np.ndarray[int]): já limitadas a
+            [0, tamanho - 1], fim inclusivo
+        tamanho (int)
+
+    Retorna:
+        np.ndarray[int]: contagem por posição.
+    """
+    diferencas = np.zeros(tamanho + 1, dtype=np.int64)
+    np.add.at(diferencas, posicoes_inicio, 1)
+    np.add.at(diferencas, posicoes_fim + 1, -1)
+    return np.cumsum(diferencas[:-1])
+
+
+# ============================================================================
+# MOTOR DE COBERTURA (HISTÓRICO INTEIRO, MEMORIZADO)
+# ============================================================================
+def _montar_cobertura():
+    """
+    Conta os ausentes de cada dia do histórico inteiro, do primeiro início
+    ao último fim registrados.
+
+    O banco devolve cada ausência já como números de dia (sem converter
+    texto de data no Python); os intervalos de cada pessoa são unidos e só
+    então entram no vetor de diferenças. Ausências de funcionários removidos
+    (sem cadastro) ficam de fora.
+
+    Retorna:
+        tuple (primeiro, contagem):
+            primeiro (np.datetime64[D] | None): dia da posição 0
+            contagem (np.ndarray[int])
+    """
+    conn = get_db()
+    cursor = conn.cursor()
+
+    cursor.execute("""
+        SELECT funcionario_id,
+               CAST(julianday(data_inicio) - ? AS INTEGER),
+               CAST(julianday(data_fim) - ? AS INTEGER)
+        FROM ferias
+        UNION ALL
+        SELECT funcionario_id, dia, dia
+        FROM (
+            SELECT funcionario_id, CAST(julianday(data_folga) - ? AS INTEGER) AS dia
+            FROM folga_assiduidade
+        )
+    """, (EPOCA_JULIANA,) * 3)
+    ausencias = np.array(cursor.fetchall(), dtype=np.int64).reshape(-1, 3)
+
+    cursor.execute("SELECT id FROM funcionarios")
+    cadastrados = np.array([linha[0] for linha in cursor], dtype=np.int64)
+    ausencias = ausencias[np.isin(ausencias[:, 0], cadastrados)]
+
+    if not len(ausencias):
+        return None, np.zeros(0, dtype=np.int64)
+
+    inicios, fins = _uniao_por_pessoa(ausencias[:, 0], ausencias[:, 1], ausencias[:, 2])
+
+    primeiro = inicios.min()
+    tamanho = int(fins.max() - primeiro) + 1
+
+    return np.datetime64(int(primeiro), "D"), _contar(inicios - primeiro, fins - primeiro, tamanho)
+
+
+def _cobertura_atual():
+    """
+    Retorna a contagem do histórico, remontando-a apenas quando os dados
+    mudaram (`versao_dados()`).
+
+    Retorna:
+        tuple (primeiro, contagem) — não devem ser alterados por quem chama.
+    """
+    global _cobertura
+
+    versao = versao_dados()
+    memoria = _cobertura
+    if memoria is not None and memoria[0] == versao:
+        return memoria[1], memoria[2]
+
+    with _trava:
+        memoria = _cobertura
+        if memoria is not None and memoria[0] == versao:
+            return memoria[1], memoria[2]
+
+        primeiro, contagem = _montar_cobertura()
+        _cobertura = (versao, primeiro, contagem)
+        return primeiro, contagem
+
+
+# ============================================================================
+# AUSENTES POR DIA / POR SEMANA
+# ============================================================================
+def ausencias_por_dia(inicio, fim):
+    """
+    Quantidade de pessoas ausentes (férias ou folga) em cada dia do período.
+
+    É um recorte da contagem memorizada do histórico: nenhuma consulta ao
+    banco enquanto os dados não mudam.
+
+    Parâmetros:
+        inicio (date)
+        fim (date): inclusive
+
+    Retorna:
+        tuple (dias, contagem):
+            dias (np.ndarray[datetime64[D]])
+            contagem (np.ndarray[int])
+    """
+    dias = np.datetime64(inicio, "D") + np.arange((fim - inicio).days + 1)
+    contagem = np.zeros(len(dias), dtype=np.int64)
+
+    primeiro, historico = _cobertura_atual()
+    if primeiro is None:
+        return dias, contagem
+
+    # Trecho do período coberto pelo histórico (fora dele ninguém está ausente)
+    desloc = int((dias[0] - primeiro).astype(np.int64))
+    de = max(desloc, 0)
+    ate = min(desloc + len(dias), len(historico))
+    if de < ate:
+        contagem[de - desloc:ate - desloc] = historico[de:ate]
+
+    return dias, contagem
+
+
+def ausencias_por_semana(inicio, fim):
+    """
+    Quantidade de pessoas distintas ausentes em algum dia de cada semana
+    ISO (segunda a domingo) que toca o período.
+
+    As semanas de cada ausência são unidas por pessoa antes da contagem:
+    duas férias, ou férias e folga, na mesma semana contam uma pessoa só.
+
+    Parâmetros:
+        inicio (date)
+        fim (date): inclusive
+
+    Retorna:
+        tuple (segundas, contagem):
+            segundas (np.ndarray[datetime64[D]]): início de cada semana
+            contagem (np.ndarray[int])
+    """
+    # Segunda-feira da semana do início e da semana do fim
+    primeira_segunda = np.datetime64(inicio, "D") - inicio.weekday()
+    ultima_segunda = np.datetime64(fim, "D") - fim.weekday()
+    total_semanas = int((ultima_segunda - primeira_segunda).astype(np.int64)) // 7 + 1
+
+    funcionarios, inicios, fins = carregar_intervalos(inicio, fim)
+
+    # Semana de cada ponta (divisão inteira por 7 a partir da primeira segunda)
+    sem_inicio = np.clip((inicios - primeira_segunda).astype(np.int64) // 7, 0, total_semanas - 1)
+    sem_fim = np.clip((fins - primeira_segunda).astype(np.int64) // 7, 0, total_semanas - 1)
+    sem_inicio, sem_fim = _uniao_por_pessoa(funcionarios, sem_inicio, sem_fim)
+
+    segundas = primeira_segunda + 7 * np.arange(total_semanas)
+    return segundas, _contar(sem_inicio, sem_fim, total_semanas)
@@ -0,0 +1,345 @@
+"""
+conflito_service.py
+-------------------
+Camada de serviço responsável por detectar conflitos de escala: períodos
+em que mais de N pessoas estão ausentes (férias ou folga) ao mesmo tempo.
+
+Este módulo fornece:
+
+- Índice em memória de todas as ausências (`IndiceIntervalos`), montado
+  uma vez e depois atualizado pelas próprias escritas de férias e folgas
+  (`ausencias_alteradas()`); só é relido do banco se as tabelas mudarem
+  por outro caminho (outro processo, SQL manual)
+- Varredura (sweep line) que encontra as janelas com ausentes demais e
+  quem são eles
+- Relatório de conflitos de um período inteiro
+- Checagem incremental de um período novo/alterado, usada antes de salvar
+  férias: consulta só as ausências que tocam o período, pelo índice
+
+O sistema ainda não tem o conceito de equipe: todos os funcionários formam
+uma única equipe e há um único índice. Ausências de funcionários removidos
+(sem cadastro) ficam no índice, mas não entram na contagem.
+"""
+
+import threading
+from collections import Counter
+from functools import partial
+
+from database import ao_confirmar, get_connection, get_db, pendentes, versao_dados
+from services.cobertura_service import LIMITE_AUSENTES
+from services.indice_intervalos import (
+    AJUSTE_JULIANO,
+    IndiceIntervalos,
+    data_do_dia,
+    dia,
+)
+
+# Tabela de cada origem de ausência
+TABELAS_AUSENCIAS = {"ferias": "ferias", "folga": "folga_assiduidade"}
+
+# Memória do índice: (versões das tabelas de ausências, IndiceIntervalos).
+# O índice é alterado no lugar: só é usado com `_trava` adquirida.
+_indice = None
+_trava = threading.Lock()
+
+
+# ============================================================================
+# ÍNDICE DE TODAS AS AUSÊNCIAS
+# ============================================================================
+def _carregar_ausencias():
+    """
+    Lê todas as férias e folgas como intervalos do índice, junto com a
+    versão das tabelas, numa conexão própria e numa única leitura: o índice
+    reflete exatamente o que estava confirmado naquela versão (nunca
+    escritas ainda pendentes da requisição).
+
+    As datas já saem do SQLite como número do dia (ordinal).
+
+    Retorna:
+        tuple (versao, IndiceIntervalos) — chaves (funcionario_id, origem,
+        id), onde origem é "ferias" ou "folga".
+    """
+    conn = get_connection()
+
+    try:
+        conn.execute("BEGIN")
+        versoes = dict(conn.execute("SELECT tabela, versao FROM versao_dados;"))
+
+        cursor = conn.execute("""
+            SELECT CAST(julianday(data_inicio) AS INTEGER) - ?,
+                   CAST(julianday(data_fim) AS INTEGER) - ?,
+                   funcionario_id, 'ferias', id
+            FROM ferias
+            UNION ALL
+            SELECT CAST(julianday(data_folga) AS INTEGER) - ?,
+                   CAST(julianday(data_folga) AS INTEGER) - ?,
+                   funcionario_id, 'folga', id
+            FROM folga_assiduidade
+        """, (AJUSTE_JULIANO,) * 4)
+
+        indice = IndiceIntervalos(
+            (inicio, fim, (funcionario_id, origem, registro_id))
+            for inicio, fim, funcionario_id, origem, registro_id in cursor
+        )
+    finally:
+        conn.close()
+
+    return _versao(versoes), indice
+
+
+def _versao(versoes):
+    """Versões das tabelas de ausências, de um dict {tabela: versao}."""
+    return tuple(versoes[tabela] for tabela in TABELAS_AUSENCIAS.values())
+
+
+def _sobrepostos(de, ate):
+    """
+    Ausências que tocam [de, ate] (números do dia), pelo índice.
+
+    O índice é relido do banco só quando as tabelas mudaram sem passar por
+    `ausencias_alteradas()` (ou na primeira vez).
+
+    Retorna:
+        list[tuple]: (inicio, fim, (funcionario_id, origem, id))
+    """
+    global _indice
+
+    versao = versao_dados(*TABELAS_AUSENCIAS.values())
+
+    with _trava:
+        if _indice is None or _indice[0] != versao:
+            _indice = _carregar_ausencias()
+
+        return _indice[1].sobrepostos(de, ate)
+
+
+# ============================================================================
+# ATUALIZAÇÃO DO ÍNDICE PELAS ESCRITAS
+# ============================================================================
+def ausencias_alteradas():
+    """
+    Lista das ausências alteradas pela escrita em andamento, aplicada ao
+    índice depois do commit (e descartada no rollback).
+
+    Deve ser obtida antes de gravar (o banco fica reservado a partir daí) e
+    receber um item por linha inserida, alterada ou removida:
+
+        (origem, funcionario_id, registro_id, antigo, novo)
+
+    com origem "ferias" ou "folga" e `antigo`/`novo` = (inicio, fim) em
+    número do dia, ou None na inclusão/remoção.
+
+    Retorna:
+        list — a mesma durante toda a transação.
+    """
+    alteracoes = pendentes().get("ausencias")
+    if alteracoes is None:
+        alteracoes = pendentes()["ausencias"] = []
+        ao_confirmar(partial(_aplicar_alteracoes, alteracoes))
+
+    return alteracoes
+
+
+def _aplicar_alteracoes(alteracoes, antes, depois):
+    """
+    Aplica no índice as alterações de uma escrita confirmada.
+
+    Só vale se o índice estava exatamente na versão de antes da escrita e
+    se cada linha alterada nas tabelas (contada pelos gatilhos de versão)
+    foi anotada; senão o índice é descartado e relido sob demanda.
+    """
+    global _indice
+
+    with _trava:
+        memoria, _indice = _indice, None
+
+        if memoria is None or antes is None or memoria[0] != _versao(antes):
+            return
+
+        anotadas = Counter(TABELAS_AUSENCIAS[item[0]] for item in alteracoes)
+        if any(depois[t] - antes[t] != anotadas[t] for t in TABELAS_AUSENCIAS.values()):
+            return
+
+        indice = memoria[1]
+        for origem, funcionario_id, registro_id, antigo, novo in alteracoes:
+            chave = (funcionario_id, origem, registro_id)
+            if antigo:
+                indice.remover(*antigo, chave)
+            if novo:
+                indice.adicionar(*novo, chave)
+
+        _indice = (_versao(depois), indice)
+
+
+# ============================================================================
+# VARREDURA (SWEEP LINE)
+# ============================================================================
+def _varrer(intervalos, limite, de=None, ate=None):
+    """
+    Percorre os eventos de entrada/saída em ordem de dia, mantendo quem está
+    ausente, e devolve os trechos com mais de `limite` pessoas distintas.
+
+    Trechos vizinhos com as mesmas pessoas viram uma única janela.
+
+    Parâmetros:
+        intervalos (iterable): (inicio, fim, chave) com chave[0] =
+            funcionario_id; datas em número do dia, fim inclusivo
+        limite (int)
+        de, ate (int | None): recorte opcional em número do dia
+
+    Retorna:
+        list[tuple]: (inicio, fim, frozenset de funcionario_id)
+    """
+    eventos = []
+    for inicio, fim, chave in intervalos:
+        if de is not None:
+            inicio = max(inicio, de)
+        if ate is not None:
+            fim = min(fim, ate)
+        if inicio <= fim:
+            eventos.append((inicio, 1, chave[0]))
+            eventos.append((fim + 1, -1, chave[0]))
+
+    eventos.sort()
+
+    # Uma pessoa pode ter mais de um intervalo no mesmo dia (férias e folga)
+    ausentes = Counter()
+    janelas = []
+
+    i = 0
+    while i < len(eventos):
+        dia_atual = eventos[i][0]
+
+        while i < len(eventos) and eventos[i][0] == dia_atual:
+            _, variacao, funcionario_id = eventos[i]
+            ausentes[funcionario_id] += variacao
+            if not ausentes[funcionario_id]:
+                del ausentes[funcionario_id]
+            i += 1
+
+        if len(ausentes) > limite:
+            # Todo ausente ainda tem um evento de saída pela frente
+            fim_trecho = eventos[i][0] - 1
+            pessoas = frozenset(ausentes)
+
+            if janelas and janelas[-1][1] == dia_atual - 1 and janelas[-1][2] == pessoas:
+                janelas[-1] = (janelas[-1][0], fim_trecho, pessoas)
+            else:
+                janelas.append((dia_atual, fim_trecho, pessoas))
+
+    return janelas
+
+
+def _nomes(ids):
+    """
+    Nomes dos funcionários informados, numa consulta por bloco.
+
+    Retorna:
+        dict {funcionario_id: nome} — só funcionários cadastrados.
+    """
+    ids = sorted(ids)
+
+    conn = get_db()
+    cursor = conn.cursor()
+    nomes = {}
+
+    # Em blocos, abaixo do limite de parâmetros do SQLite
+    for i in range(0, len(ids), 500):
+        bloco = ids[i:i + 500]
+        cursor.execute(
+            f"SELECT id, nome FROM funcionarios WHERE id IN ({','.join('?' * len(bloco))})",
+            bloco
+        )
+        nomes.update(cursor.fetchall())
+
+    return nomes
+
+
+def _com_nomes(janelas, nomes):
+    """
+    Converte as janelas da varredura para o formato de resposta.
+
+    Retorna:
+        list[dict]: {"inicio", "fim", "ausentes": [{"id", "nome"}, ...]}
+    """
+    return [
+        {
+            "inicio": data_do_dia(inicio).isoformat(),
+            "fim": data_do_dia(fim).isoformat(),
+            "ausentes": sorted(
+                ({"id": f, "nome": nomes.get(f, "")} for f in pessoas),
+                key=lambda p: (p["nome"], p["id"])
+            )
+        }
+        for inicio, fim, pessoas in janelas
+    ]
+
+
+# ============================================================================
+# RELATÓRIO DE CONFLITOS DE UM PERÍODO
+# ============================================================================
+def listar_conflitos(inicio, fim, limite=LIMITE_AUSENTES):
+    """
+    Todas as janelas do período com mais de `limite` pessoas ausentes.
+
+    Parâmetros:
+        inicio (date | str)
+        fim (date | str): inclusive
+        limite (int)
+
+    Retorna:
+        list[dict]: {"inicio", "fim", "ausentes": [{"id", "nome"}, ...]}
+    """
+    de, ate = dia(inicio), dia(fim)
+    intervalos = _sobrepostos(de, ate)
+    nomes = _nomes({chave[0] for _, _, chave in intervalos})
+
+    intervalos = [item for item in intervalos if item[2][0] in nomes]
+    return _com_nomes(_varrer(intervalos, limite, de, ate), nomes)
+
+
+# ============================================================================
+# CHECAGEM INCREMENTAL (ANTES DE SALVAR FÉRIAS)
+# ============================================================================
+def verificar_conflito(funcionario_id, inicio, fim, ignorar_ferias_id=None,
+                       limite=LIMITE_AUSENTES):
+    """
+    Verifica se incluir o período [inicio, fim] para o funcionário deixaria
+    mais de `limite` pessoas ausentes em algum dia.
+
+    Só as ausências que tocam o período são consideradas (busca no índice),
+    sem percorrer o histórico.
+
+    Parâmetros:
+        funcionario_id (int)
+        inicio (date | str)
+        fim (date | str): inclusive
+        ignorar_ferias_id (int | None): registro em edição, que sai da conta
+        limite (int)
+
+    Retorna:
+        list[dict]: janelas em conflito (vazia se não houver), no formato
+        de `listar_conflitos()`.
+    """
+    funcionario_id = int(funcionario_id)
+    de, ate = dia(inicio), dia(fim)
+
+    ignorado = None
+    if ignorar_ferias_id is not None:
+        ignorado = ("ferias", int(ignorar_ferias_id))
+
+    intervalos = _sobrepostos(de, ate)
+    nomes = _nomes({chave[0] for _, _, chave in intervalos} | {funcionario_id})
+
+    intervalos = [
+        item for item in intervalos
+        if item[2][1:] != ignorado and item[2][0] in nomes
+    ]
+    intervalos.append((de, ate, (funcionario_id, "novo", 0)))
+
+    # Só interessam as janelas em que o próprio funcionário está ausente
+    janelas = [
+        janela for janela in _varrer(intervalos, limite, de, ate)
+        if funcionario_id in janela[2]
+    ]
+    return _com_nomes(janelas, nomes)
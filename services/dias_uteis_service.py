@@ -0,0 +1,234 @@
+"""
+dias_uteis_service.py
+---------------------
+Camada de serviço responsável pelo cálculo de dias úteis (segunda a sexta,
+sem feriados), usado no formulário de férias e em relatórios.
+
+Este módulo fornece:
+
+- Mapa de bits dos feriados de cada ano (um booleano por dia do ano)
+- Calendário de dias úteis do NumPy (`np.busdaycalendar`) montado a partir
+  dos mapas, memorizado e ampliado só quando um ano novo é pedido
+- Contagem de dias úteis de um ou de vários períodos de uma vez
+  (`np.busday_count`)
+- Projeção "início + N dias úteis → data final" (`np.busday_offset`)
+
+As funções aceitam datas avulsas ou listas/arrays: o cálculo é sempre
+vetorizado, então um relatório com milhares de períodos custa uma chamada.
+
+O calendário só atende `ANOS_CALENDARIO` anos antes e depois do atual
+(`anos_permitidos()`): cada ano coberto é memorizado e tem seus feriados
+gravados no banco, então datas arbitrárias não podem ampliá-lo sem limite.
+"""
+
+import datetime as dt
+import threading
+
+import numpy as np
+
+from services.feriado_service import LOCALIDADE_PADRAO, feriados_do_ano
+
+# Dias úteis da semana (segunda a domingo)
+SEMANA_UTIL = "1111100"
+
+# Anos atendidos pelo calendário: até esta distância do ano atual
+ANOS_CALENDARIO = 50
+
+# Ordinal de 1970-01-01, a origem do datetime64
+_ORDINAL_1970 = dt.date(1970, 1, 1).toordinal()
+
+# Memória: (ano, localidade) → np.ndarray[bool] com True nos feriados
+_mapas = {}
+
+# Memória: localidade → (primeiro ano, último ano, np.busdaycalendar)
+_calendarios = {}
+_trava = threading.Lock()
+
+
+# ============================================================================
+# MAPA DE FERIADOS DO ANO
+# ============================================================================
+def mapa_feriados(ano, localidade=LOCALIDADE_PADRAO):
+    """
+    Mapa de bits dos feriados do ano: posição i = i-ésimo dia do ano.
+
+    Parâmetros:
+        ano (int)
+        localidade (tuple): (país, estado, município)
+
+    Retorna:
+        np.ndarray[bool] com 365 ou 366 posições — não deve ser alterado
+        por quem chama.
+    """
+    chave = (ano, localidade)
+
+    mapa = _mapas.get(chave)
+    if mapa is None:
+        primeiro = dt.date(ano, 1, 1)
+        mapa = np.zeros((dt.date(ano + 1, 1, 1) - primeiro).days, dtype=bool)
+
+        posicoes = [(data - primeiro).days for data in feriados_do_ano(ano, localidade)]
+        mapa[posicoes] = True
+
+        _mapas[chave] = mapa
+
+    return mapa
+
+
+def anos_permitidos():
+    """
+    Primeiro e último ano aceitos nos cálculos (`ANOS_CALENDARIO` anos em
+    torno do atual).
+
+    Retorna:
+        tuple (primeiro, ultimo)
+    """
+    atual = dt.date.today().year
+    return atual - ANOS_CALENDARIO, atual + ANOS_CALENDARIO
+
+
+def _calendario(ano_inicio, ano_fim, localidade=LOCALIDADE_PADRAO):
+    """
+    Calendário de dias úteis do NumPy cobrindo ao menos [ano_inicio, ano_fim].
+
+    O calendário memorizado só é remontado quando o pedido sai dos anos que
+    ele já cobre (e passa a cobrir a união dos dois intervalos).
+
+    Retorna:
+        np.busdaycalendar
+
+    Raises:
+        ValueError: anos fora de `anos_permitidos()`.
+    """
+    primeiro, ultimo = anos_permitidos()
+    if ano_inicio < primeiro or ano_fim > ultimo:
+        raise ValueError(f"Datas devem estar entre {primeiro} e {ultimo}")
+
+    memoria = _calendarios.get(localidade)
+    if memoria and memoria[0] <= ano_inicio and ano_fim <= memoria[1]:
+        return memoria[2]
+
+    with _trava:
+        memoria = _calendarios.get(localidade)
+        if memoria and memoria[0] <= ano_inicio and ano_fim <= memoria[1]:
+            return memoria[2]
+
+        if memoria:
+            ano_inicio = min(ano_inicio, memoria[0])
+            ano_fim = max(ano_fim, memoria[1])
+
+        feriados = np.concatenate([
+            np.datetime64(f"{ano:04d}-01-01") + np.flatnonzero(mapa_feriados(ano, localidade))
+            for ano in range(ano_inicio, ano_fim + 1)
+        ]).astype("datetime64[D]")
+
+        calendario = np.busdaycalendar(weekmask=SEMANA_UTIL, holidays=feriados)
+        _calendarios[localidade] = (ano_inicio, ano_fim, calendario)
+        return calendario
+
+
+def _datas(valores):
+    """Converte date/str (avulso, lista ou array) em array `datetime64[D]`."""
+    if isinstance(valores, (str, dt.date)):
+        valores = [valores]
+    if isinstance(valores, np.ndarray):
+        return valores.astype("datetime64[D]")
+
+    valores = list(valores)
+    if valores and isinstance(valores[0], dt.date):
+        # O NumPy converte objetos date um a um (lento); pelo ordinal é direto
+        ordinais = np.fromiter((d.toordinal() for d in valores), np.int64, len(valores))
+        return (ordinais - _ORDINAL_1970).astype("datetime64[D]")
+
+    return np.asarray(valores, dtype="datetime64[D]")
+
+
+def _anos(datas):
+    """Primeiro e último ano de um array `datetime64[D]`."""
+    anos = datas.astype("datetime64[Y]").astype(int) + 1970
+    return int(anos.min()), int(anos.max())
+
+
+# ============================================================================
+# CONTAGEM DE DIAS ÚTEIS
+# ============================================================================
+def contar_dias_uteis(inicios, fins, localidade=LOCALIDADE_PADRAO):
+    """
+    Quantidade de dias úteis de cada período [inicio, fim] (ambos inclusivos).
+
+    Parâmetros:
+        inicios (date | str | list): um início ou vários
+        fins (date | str | list): o(s) fim(ns) correspondente(s)
+        localidade (tuple)
+
+    Retorna:
+        np.ndarray[int]: um valor por período (períodos invertidos dão 0).
+
+    Raises:
+        ValueError: datas fora de `anos_permitidos()`.
+    """
+    inicios = _datas(inicios)
+    fins = _datas(fins)
+    if inicios.size == 0:
+        return np.zeros(0, dtype=np.int64)
+
+    ano_inicio, _ = _anos(inicios)
+    _, ano_fim = _anos(fins)
+    calendario = _calendario(min(ano_inicio, ano_fim), max(ano_inicio, ano_fim), localidade)
+
+    # busday_count conta [inicio, fim): soma 1 dia para incluir o fim
+    contagem = np.busday_count(inicios, fins + 1, busdaycal=calendario)
+    return np.maximum(contagem, 0)
+
+
+def dias_uteis(inicio, fim, localidade=LOCALIDADE_PADRAO):
+    """
+    Dias úteis de um único período [inicio, fim] (ambos inclusivos).
+
+    Retorna:
+        int
+    """
+    return int(contar_dias_uteis(inicio, fim, localidade)[0])
+
+
+# ============================================================================
+# PROJEÇÃO DA DATA FINAL
+# ============================================================================
+def projetar_fim(inicios, dias, localidade=LOCALIDADE_PADRAO):
+    """
+    Data final de períodos que começam em `inicios` e têm `dias` dias úteis.
+
+    Se o início cair num dia não útil, a contagem começa no próximo dia
+    útil. O fim é o último dia útil do período.
+
+    Parâmetros:
+        inicios (date | str | list)
+        dias (int | list): quantidade de dias úteis (>= 1) de cada período
+        localidade (tuple)
+
+    Retorna:
+        np.ndarray[datetime64[D]]: uma data final por período.
+
+    Raises:
+        ValueError: início ou data final projetada fora de
+                    `anos_permitidos()`.
+    """
+    inicios = _datas(inicios)
+    dias = np.atleast_1d(np.asarray(dias, dtype=np.int64))
+    if inicios.size == 0:
+        return inicios
+
+    # Cada ano tem bem mais de 200 dias úteis: cobre anos suficientes (sem
+    # passar do último ano permitido)
+    _, ultimo = anos_permitidos()
+    ano_inicio, ano_ultimo = _anos(inicios)
+    ano_fim = min(ano_ultimo + int(dias.max()) // 200 + 1, max(ano_ultimo, ultimo))
+    calendario = _calendario(ano_inicio, ano_fim, localidade)
+
+    fins = np.busday_offset(inicios, dias - 1, roll="forward", busdaycal=calendario)
+
+    # Além do calendário os feriados não seriam pulados
+    if fins.max() > np.datetime64(f"{ultimo:04d}-12-31"):
+        raise ValueError(f"A data final projetada passa de {ultimo}")
+
+    return fins
@@ -0,0 +1,244 @@
+"""
+feriado_service.py
+------------------
+Camada de serviço responsável pelo calendário de feriados usado no gráfico
+Gantt e nos cálculos de dias úteis.
+
+Este módulo fornece:
+
+- Feriados de um ano (nacionais, estaduais, móveis e municipais)
+- Consulta O(1) "esta data é feriado?"
+- Consulta de feriados num intervalo de datas
+- Persistência opcional na tabela `feriados`, preenchida no startup
+
+Feriados de um ano não mudam, então cada (ano, localidade) é calculado
+uma única vez com a biblioteca `holidays` e fica memorizado em memória
+(e, se habilitado, gravado no banco para as próximas execuções).
+"""
+
+import datetime as dt
+import sqlite3
+import threading
+
+import holidays
+
+from database import get_connection, get_db
+
+# Localidade padrão do sistema: (país, estado, município)
+LOCALIDADE_PADRAO = ("BR", "SP", "Osasco")
+
+# Feriados municipais fixos (mês-dia → nome), por município
+FERIADOS_MUNICIPAIS = {
+    "Osasco": {
+        "02-19": "Aniversário de Osasco",
+        "06-13": "Santo Antônio",
+    },
+}
+
+# Feriados móveis que não fazem parte da categoria pública da biblioteca
+FERIADOS_MOVEIS = ("Carnaval", "Corpus Christi")
+
+# Grava/lê os feriados calculados na tabela `feriados`
+PERSISTIR_FERIADOS = True
+
+# Memória: (ano, localidade) → {date: nome}
+_cache = {}
+_trava = threading.Lock()
+
+
+# ============================================================================
+# CÁLCULO DOS FERIADOS DE UM ANO (BIBLIOTECA holidays)
+# ============================================================================
+def _calcular_feriados(ano, localidade):
+    """
+    Calcula os feriados de um ano com a biblioteca `holidays`.
+
+    Parâmetros:
+        ano (int)
+        localidade (tuple): (país, estado, município)
+
+    Retorna:
+        dict {date: nome}
+    """
+    _pais, estado, municipio = localidade
+
+    resultado = {}
+
+    # Feriados municipais
+    for mes_dia, nome in FERIADOS_MUNICIPAIS.get(municipio, {}).items():
+        mes, dia = mes_dia.split("-")
+        resultado[dt.date(ano, int(mes), int(dia))] = nome
+
+    # Feriados móveis (Carnaval, Corpus Christi): nas versões atuais da
+    # biblioteca ficam na categoria "optional"
+    try:
+        moveis = holidays.Brazil(years=[ano], categories=("public", "optional"))
+    except (TypeError, NotImplementedError):
+        moveis = holidays.Brazil(years=[ano])
+
+    for nome in FERIADOS_MOVEIS:
+        datas = moveis.get_named(nome)
+        if datas:
+            resultado[min(datas)] = nome
+
+    # Feriados nacionais e estaduais
+    feriados = holidays.Brazil(years=[ano], state=estado, language="pt_BR")
+    for data, nome in feriados.items():
+        if isinstance(data, dt.date):
+            resultado[data] = nome
+
+    return resultado
+
+
+# ============================================================================
+# TABELA `feriados` (PERSISTÊNCIA OPCIONAL)
+# ============================================================================
+def _chave_localidade(localidade):
+    return "-".join(localidade)
+
+
+def _ler_do_banco(ano, localidade):
+    """
+    Lê os feriados do ano gravados na tabela `feriados`.
+
+    Retorna:
+        dict {date: nome}, ou None se o ano ainda não foi gravado.
+    """
+    cursor = get_db().cursor()
+
+    cursor.execute("""
+        SELECT data, nome
+        FROM feriados
+        WHERE localidade = ? AND data BETWEEN ? AND ?
+    """, (_chave_localidade(localidade), f"{ano}-01-01", f"{ano}-12-31"))
+
+    dados = cursor.fetchall()
+    if not dados:
+        return None
+
+    return {dt.date.fromisoformat(data): nome for data, nome in dados}
+
+
+def _gravar_no_banco(ano, localidade, feriados):
+    """
+    Grava os feriados do ano na tabela `feriados`.
+
+    A gravação usa uma conexão própria, com commit próprio: pode acontecer
+    no meio de uma consulta (GET) e não deve confirmar o que a requisição
+    tem pendente nem disparar as ações de `ao_confirmar()` (a tabela
+    `feriados` não entra em `versao_dados()`, então nenhuma memória é
+    descartada).
+
+    A tabela é só um cache do cálculo: se a requisição já tem uma escrita
+    em andamento (o banco está reservado por ela) ou o banco está ocupado,
+    a gravação fica para a próxima vez.
+    """
+    if get_db().in_transaction:
+        return
+
+    conn = get_connection()
+    try:
+        conn.execute("PRAGMA busy_timeout = 0")
+        conn.executemany("""
+            INSERT OR REPLACE INTO feriados (localidade, data, nome)
+            VALUES (?, ?, ?)
+        """, [
+            (_chave_localidade(localidade), data.isoformat(), nome)
+            for data, nome in feriados.items()
+        ])
+        conn.commit()
+    except sqlite3.OperationalError:
+        conn.rollback()
+    finally:
+        conn.close()
+
+
+# ============================================================================
+# FERIADOS DE UM ANO (MEMORIZADO)
+# ============================================================================
+def feriados_do_ano(ano, localidade=LOCALIDADE_PADRAO):
+    """
+    Retorna os feriados de um ano, calculando-os apenas na primeira vez.
+
+    Ordem de busca: memória → tabela `feriados` → biblioteca `holidays`
+    (o resultado calculado é gravado na tabela e memorizado).
+
+    Parâmetros:
+        ano (int)
+        localidade (tuple): (país, estado, município)
+
+    Retorna:
+        dict {date: nome} — não deve ser alterado por quem chama.
+    """
+    chave = (ano, localidade)
+
+    feriados = _cache.get(chave)
+    if feriados is not None:
+        return feriados
+
+    with _trava:
+        feriados = _cache.get(chave)
+        if feriados is not None:
+            return feriados
+
+        if PERSISTIR_FERIADOS:
+            feriados = _ler_do_banco(ano, localidade)
+
+        if feriados is None:
+            feriados = _calcular_feriados(ano, localidade)
+            if PERSISTIR_FERIADOS:
+                _gravar_no_banco(ano, localidade, feriados)
+
+        _cache[chave] = feriados
+        return feriados
+
+
+def preparar_feriados(anos, localidade=LOCALIDADE_PADRAO):
+    """
+    Carrega (e grava, se necessário) os feriados dos anos informados.
+
+    Chamado uma vez no startup, para que as requisições já encontrem o
+    calendário pronto em memória.
+    """
+    for ano in anos:
+        feriados_do_ano(ano, localidade)
+
+
+# ============================================================================
+# CONSULTAS
+# ============================================================================
+def eh_feriado(data, localidade=LOCALIDADE_PADRAO):
+    """
+    Indica se a data é feriado (consulta O(1) após o primeiro acesso ao ano).
+
+    Parâmetros:
+        data (date | datetime)
+
+    Retorna:
+        bool
+    """
+    if isinstance(data, dt.datetime):
+        data = data.date()
+    return data in feriados_do_ano(data.year, localidade)
+
+
+def feriados_no_intervalo(inicio, fim, localidade=LOCALIDADE_PADRAO):
+    """
+    Retorna os feriados entre duas datas (inclusive), em ordem.
+
+    Parâmetros:
+        inicio (date)
+        fim (date)
+
+    Retorna:
+        list[tuple]: [(date, nome), ...]
+    """
+    resultado = []
+
+    for ano in range(inicio.year, fim.year + 1):
+        for data, nome in feriados_do_ano(ano, localidade).items():
+            if inicio <= data <= fim:
+                resultado.append((data, nome))
+
+    resultado.sort()
+    return resultado
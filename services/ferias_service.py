@@ -8,16 +8,41 @@ Este módulo fornece:
 
 - Conversão e formatação de datas
 - Consulta completa de férias com folgas relacionadas
-- Cálculo de total de dias de férias de um funcionário
-- Verificação de sobreposição entre períodos
+- Dias de férias usados por funcionário e período aquisitivo (tabela
+  `saldo_ferias`, mantida por gatilhos)
+- Saldos de todos (ou vários) funcionários numa única consulta
+- Verificação de sobreposição entre períodos, por um índice em memória
+  das férias de cada funcionário (sem consultar o banco a cada checagem)
 - Cadastro, atualização e remoção de férias
+- Cadastro de vários períodos de uma vez (lote validado em memória e
+  gravado com um único `executemany`)
 - Filtros avançados para exibição
+- Paginação por cursor (keyset) das listagens
 - Retorno de dados especializados para o gráfico Gantt
 
-Todas as funções aqui acessam o banco de dados usando `get_connection()`.
+Todas as funções aqui acessam o banco de dados usando `get_db()`, ou seja,
+a conexão única da requisição atual (ver `database.py`).
 """
 
-from database import get_connection
+import calendar
+import threading
+from datetime import date, datetime, timedelta
+from functools import partial
+
+from database import get_db, confirmar, ao_confirmar, pendentes, versao_dados
+from services.conflito_service import ausencias_alteradas
+from services.indice_intervalos import AJUSTE_JULIANO, IndiceIntervalos, dia
+
+# Limite de dias de férias por funcionário
+LIMITE_DIAS_FERIAS = 30
+
+# Índices de férias confirmadas, por funcionário: funcionario_id → IndiceIntervalos
+# com itens (inicio, fim, ferias_id). Carregados na primeira consulta.
+_indices_ferias = {}
+_indices_trava = threading.Lock()
+
+# Versão da tabela `ferias` refletida em `_indices_ferias` (None = nenhuma)
+_indices_versao = None
 
 
 # ============================================================================
@@ -40,10 +65,100 @@ def formatar_data(data_str):
     return f"{dia}/{mes}/{ano}"
 
 
+# ============================================================================
+# JANELAS DE DATA PARA FILTROS DE ANO / MÊS
+# ============================================================================
+def janelas_do_filtro(ano, mes, anos_disponiveis=()):
+    """
+    Converte os filtros de ano e mês em janelas de datas ISO.
+
+    Filtrar por janelas (em vez de `strftime()` sobre a coluna) permite que o
+    SQLite use índices, e a comparação por sobreposição faz um período que
+    atravessa a virada de mês/ano aparecer nos dois meses.
+
+    Parâmetros:
+        ano (int | str | None)
+        mes (int | str | None)
+        anos_disponiveis (iterable[int]): anos usados quando só o mês é
+            informado (uma janela por ano).
+
+    Retorna:
+        list[tuple]: [(inicio_iso, fim_iso), ...]; lista vazia = sem filtro.
+    """
+
+    def janela_mes(a, m):
+        ultimo_dia = calendar.monthrange(a, m)[1]
+        return (f"{a:04d}-{m:02d}-01", f"{a:04d}-{m:02d}-{ultimo_dia:02d}")
+
+    if ano and mes:
+        return [janela_mes(int(ano), int(mes))]
+
+    if ano:
+        return [(f"{int(ano):04d}-01-01", f"{int(ano):04d}-12-31")]
+
+    if mes:
+        return [janela_mes(a, int(mes)) for a in anos_disponiveis]
+
+    return []
+
+
+def anos_com_ferias():
+    """
+    Retorna a faixa de anos que pode conter férias, do ano anterior à
+    menor data final até a maior data final cadastrada.
+
+    Usa MIN/MAX sobre `data_fim`, respondidos direto pelo índice
+    `idx_ferias_periodo` (sem varrer a tabela).
+
+    Retorna:
+        range: anos possíveis (vazio se não houver férias).
+    """
+
+    conn = get_db()
+    cursor = conn.cursor()
+
+    menor = cursor.execute("SELECT MIN(data_fim) FROM ferias;").fetchone()[0]
+    maior = cursor.execute("SELECT MAX(data_fim) FROM ferias;").fetchone()[0]
+
+    if not menor:
+        return range(0)
+
+    # Um período que termina no ano X pode ter começado no ano X - 1
+    return range(int(menor[:4]) - 1, int(maior[:4]) + 1)
+
+
+# ============================================================================
+# CURSOR DE PAGINAÇÃO (KEYSET)
+# ============================================================================
+def codificar_cursor(funcionario_id, data_inicio, ferias_id):
+    """
+    Monta o cursor de paginação a partir da última férias de uma página.
+
+    A paginação é por chave (keyset) em (funcionario_id, data_inicio, id):
+    a próxima página começa logo após esse registro, então o custo de
+    cada página não cresce com o histórico (ao contrário de OFFSET).
+
+    Retorna:
+        str: cursor no formato "funcionario_id|data_inicio|id".
+    """
+    return f"{funcionario_id}|{data_inicio}|{ferias_id}"
+
+
+def decodificar_cursor(cursor):
+    """
+    Converte o cursor de volta em (funcionario_id, data_inicio, id).
+
+    Raises:
+        ValueError: se o cursor estiver malformado.
+    """
+    funcionario_id, data_inicio, ferias_id = cursor.split("|")
+    return int(funcionario_id), data_inicio, int(ferias_id)
+
+
 # ============================================================================
 # LISTAR TODAS AS FÉRIAS (+ FOLGAS) POR ANO
 # ============================================================================
-def listar_ferias(ano_atual, ano_proximo):
+def listar_ferias(ano_atual, ano_proximo, apos=None, limite=None):
     """
     Retorna lista de férias com informações completas,
     incluindo folga de assiduidade do ano atual e do ano seguinte.
@@ -53,6 +168,9 @@ def listar_ferias(ano_atual, ano_proximo):
     Parâmetros:
         ano_atual (int)
         ano_proximo (int)
+        apos (str | None): cursor de paginação (ver `codificar_cursor()`);
+                           retorna apenas as férias posteriores a ele.
+        limite (int | None): quantidade máxima de registros.
 
     Retorna:
         list[tuple]: contendo:
@@ -61,51 +179,97 @@ def listar_ferias(ano_atual, ano_proximo):
              folga_atual_formatada, folga_proximo_formatada,
              inicio_iso, fim_iso)
     """
+    return list(iterar_ferias(ano_atual, ano_proximo, apos, limite))
+
+
+def iterar_ferias(ano_atual, ano_proximo, apos=None, limite=None):
+    """
+    Mesma consulta de `listar_ferias()`, mas entregando uma tupla por vez
+    (gerador), sem materializar o resultado inteiro em memória.
+
+    Ordem: (funcionario_id, data_inicio, id) — a mesma chave do cursor de
+    paginação, que é aplicado como comparação de row value e resolvido
+    pelo índice `idx_ferias_funcionario_periodo`.
 
-    conn = get_connection()
+    Férias de funcionários removidos (sem cadastro) ficam de fora já na
+    seleção da página, antes do LIMIT: senão ocupariam a página e seriam
+    descartadas no JOIN, encurtando-a (ou esvaziando-a).
+    """
+
+    conn = get_db()
     cursor = conn.cursor()
 
-    query = """
-        SELECT 
-            f.id,
-            f.funcionario_id,
+    params = {"ano_atual": ano_atual, "ano_proximo": ano_proximo}
+
+    filtro_cursor = ""
+    if apos:
+        filtro_cursor = "AND (f.funcionario_id, f.data_inicio, f.id) > (:c_func, :c_inicio, :c_id)"
+        params["c_func"], params["c_inicio"], params["c_id"] = decodificar_cursor(apos)
+
+    clausula_limite = ""
+    filtro_folgas = ""
+    if limite:
+        clausula_limite = "LIMIT :limite"
+        params["limite"] = int(limite)
+        # Numa página, pivota só as folgas dos funcionários que aparecem nela
+        filtro_folgas = "AND funcionario_id IN (SELECT funcionario_id FROM pagina)"
+
+    # Primeiro seleciona as férias (a página, se houver limite); depois as
+    # folgas dos dois anos são pivotadas uma única vez por funcionário (uma
+    # linha por funcionario_id) e juntadas às férias, em vez de duas
+    # subconsultas correlacionadas por linha de férias.
+    query = f"""
+        WITH pagina AS (
+            SELECT
+                f.id,
+                f.funcionario_id,
+                f.agendado_sap,
+                f.periodo_dias,
+                f.abono_peculiario,
+                f.data_inicio,
+                f.data_fim
+            FROM ferias f
+            WHERE EXISTS (SELECT 1 FROM funcionarios func WHERE func.id = f.funcionario_id)
+            {filtro_cursor}
+            ORDER BY f.funcionario_id, f.data_inicio, f.id
+            {clausula_limite}
+        )
+        SELECT
+            p.id,
+            p.funcionario_id,
             func.nome,
-            f.agendado_sap,
-            f.periodo_dias,
-            f.abono_peculiario,
-            f.data_inicio,
-            f.data_fim,
-            (
-                SELECT data_folga 
-                FROM folga_assiduidade 
-                WHERE funcionario_id = f.funcionario_id AND ano = ? 
-                LIMIT 1
-            ) AS folga_atual,
-            (
-                SELECT data_folga 
-                FROM folga_assiduidade 
-                WHERE funcionario_id = f.funcionario_id AND ano = ? 
-                LIMIT 1
-            ) AS folga_proximo
-        FROM ferias f
-        JOIN funcionarios func ON func.id = f.funcionario_id
-        ORDER BY f.funcionario_id, f.data_inicio;
+            p.agendado_sap,
+            p.periodo_dias,
+            p.abono_peculiario,
+            p.data_inicio,
+            p.data_fim,
+            fo.folga_atual,
+            fo.folga_proximo
+        FROM pagina p
+        JOIN funcionarios func ON func.id = p.funcionario_id
+        LEFT JOIN (
+            SELECT
+                funcionario_id,
+                MIN(CASE WHEN ano = :ano_atual THEN data_folga END) AS folga_atual,
+                MIN(CASE WHEN ano = :ano_proximo THEN data_folga END) AS folga_proximo
+            FROM folga_assiduidade
+            WHERE ano IN (:ano_atual, :ano_proximo)
+            {filtro_folgas}
+            GROUP BY funcionario_id
+        ) fo ON fo.funcionario_id = p.funcionario_id
+        ORDER BY p.funcionario_id, p.data_inicio, p.id;
     """
 
-    cursor.execute(query, (ano_atual, ano_proximo))
-    dados = cursor.fetchall()
-    conn.close()
-
-    dados_formatados = []
+    cursor.execute(query, params)
 
-    for row in dados:
+    for row in cursor:
         (
             id, func_id, nome, sap, dias, abono,
             inicio_iso, fim_iso,
             folga_atual_iso, folga_proximo_iso
         ) = row
 
-        dados_formatados.append((
+        yield (
             id,
             func_id,
             nome,
@@ -118,36 +282,297 @@ def listar_ferias(ano_atual, ano_proximo):
             formatar_data(folga_proximo_iso),
             inicio_iso,
             fim_iso
-        ))
+        )
 
-    return dados_formatados
+
+# ============================================================================
+# PERÍODO AQUISITIVO
+# ============================================================================
+def periodo_aquisitivo(data_inicio, data_admissao=None):
+    """
+    Período aquisitivo a que pertencem férias que começam em `data_inicio`.
+
+    Cada período é uma janela de 12 meses que começa no aniversário da
+    admissão e é identificada pelo ano em que começa (mesma regra dos
+    gatilhos de `saldo_ferias`). Sem data de admissão, a janela é o ano
+    civil.
+
+    Parâmetros:
+        data_inicio (str ISO | date)
+        data_admissao (str ISO | date | None)
+
+    Retorna:
+        int
+    """
+    data_inicio = str(data_inicio)
+    periodo = int(data_inicio[:4])
+
+    if data_admissao and data_inicio[5:10] < str(data_admissao)[5:10]:
+        periodo -= 1
+
+    return periodo
+
+
+def _aniversario(ano, data_admissao):
+    """Aniversário da admissão no ano (29/02 vira 01/03 fora dos bissextos)."""
+    if not data_admissao:
+        return date(ano, 1, 1)
+
+    mes, dia_mes = int(str(data_admissao)[5:7]), int(str(data_admissao)[8:10])
+    if (mes, dia_mes) == (2, 29) and not calendar.isleap(ano):
+        return date(ano, 3, 1)
+    return date(ano, mes, dia_mes)
+
+
+def janela_aquisitiva(periodo, data_admissao=None):
+    """
+    Primeiro e último dia do período aquisitivo.
+
+    Parâmetros:
+        periodo (int): ver `periodo_aquisitivo()`
+        data_admissao (str ISO | date | None)
+
+    Retorna:
+        tuple (date, date): início e fim (inclusivo) da janela.
+    """
+    return (
+        _aniversario(periodo, data_admissao),
+        _aniversario(periodo + 1, data_admissao) - timedelta(days=1)
+    )
+
+
+def janela_do_funcionario(funcionario_id, data, periodo=None):
+    """
+    Período aquisitivo do funcionário que contém a data.
+
+    Parâmetros:
+        funcionario_id (int)
+        data (str ISO | date)
+        periodo (int | None): período já conhecido (ignora `data`)
+
+    Retorna:
+        tuple (periodo, inicio, fim): período e datas da janela.
+    """
+    conn = get_db()
+    cursor = conn.cursor()
+
+    cursor.execute("SELECT data_admissao FROM funcionarios WHERE id = ?", (funcionario_id,))
+    linha = cursor.fetchone()
+    data_admissao = linha[0] if linha else None
+
+    if periodo is None:
+        periodo = periodo_aquisitivo(data, data_admissao)
+    return (periodo, *janela_aquisitiva(periodo, data_admissao))
 
 
 # ============================================================================
 # SOMA DE DIAS DE FÉRIAS DO FUNCIONÁRIO
 # ============================================================================
-def total_dias_ferias(funcionario_id):
+def total_dias_ferias(funcionario_id, periodo):
     """
-    Soma todos os dias de férias já tirados pelo funcionário.
+    Dias de férias já usados pelo funcionário no período aquisitivo.
 
-    Serve para impedir que ultrapasse o limite de 30 dias.
+    Serve para impedir que ultrapasse o limite de 30 dias. A soma vem
+    pronta da tabela `saldo_ferias` (mantida por gatilhos): é uma leitura
+    por chave primária, qualquer que seja o tamanho do histórico.
+
+    Parâmetros:
+        funcionario_id (int)
+        periodo (int): período aquisitivo (ver `janela_do_funcionario()`)
 
     Retorna:
-        int: total de dias já registrados.
+        int: total de dias já registrados no período.
     """
 
-    conn = get_connection()
+    conn = get_db()
     cursor = conn.cursor()
 
     cursor.execute("""
-        SELECT SUM(periodo_dias)
-        FROM ferias
-        WHERE funcionario_id = ?
-    """, (funcionario_id,))
+        SELECT dias_usados
+        FROM saldo_ferias
+        WHERE funcionario_id = ? AND periodo_aquisitivo = ?
+    """, (funcionario_id, periodo))
+
+    linha = cursor.fetchone()
+    return linha[0] if linha else 0
+
+
+# ============================================================================
+# SALDO DE FÉRIAS EM LOTE (TODOS OU VÁRIOS FUNCIONÁRIOS)
+# ============================================================================
+def saldos_por_funcionario(ids=None, periodo=None):
+    """
+    Retorna dias usados e saldo restante de vários funcionários de uma vez,
+    num período aquisitivo.
+
+    Uma única consulta (LEFT JOIN de `funcionarios` com `saldo_ferias` pela
+    chave primária) substitui uma chamada de `total_dias_ferias()` por
+    funcionário. Funcionários sem férias no período aparecem com 0 dias
+    usados.
+
+    Parâmetros:
+        ids (list[int] | None): restringe aos funcionários informados;
+                                None retorna todos.
+        periodo (int | None): período aquisitivo; None usa o período em
+                              curso de cada funcionário (conforme a data
+                              de admissão).
+
+    Retorna:
+        list[dict]: ordenada por nome:
+            [{"id", "nome", "periodo", "usados", "saldo"}, ...]
+    """
+
+    hoje = datetime.now().date().isoformat()
+
+    conn = get_db()
+    cursor = conn.cursor()
+
+    # Sem período informado, aplica a regra de `periodo_aquisitivo()` a hoje
+    query = """
+        SELECT id, nome,
+               COALESCE(?, CAST(strftime('%Y', ?) AS INTEGER)
+                 - COALESCE(strftime('%m-%d', ?) < strftime('%m-%d', data_admissao), 0)) AS periodo
+        FROM funcionarios
+    """
+
+    params = [periodo, hoje, hoje]
+
+    if ids is not None:
+        if not ids:
+            return []
+        query += f" WHERE id IN ({', '.join('?' for _ in ids)})"
+        params.extend(ids)
+
+    query = f"""
+        SELECT func.id, func.nome, func.periodo, COALESCE(s.dias_usados, 0)
+        FROM ({query}) AS func
+        LEFT JOIN saldo_ferias s
+               ON s.funcionario_id = func.id
+              AND s.periodo_aquisitivo = func.periodo
+        ORDER BY func.nome, func.id
+    """
+
+    cursor.execute(query, params)
 
-    total = cursor.fetchone()[0]
-    conn.close()
-    return total or 0
+    return [
+        {
+            "id": func_id,
+            "nome": nome,
+            "periodo": periodo_func,
+            "usados": usados,
+            "saldo": LIMITE_DIAS_FERIAS - usados
+        }
+        for func_id, nome, periodo_func, usados in cursor.fetchall()
+    ]
+
+
+# ============================================================================
+# ÍNDICE DE FÉRIAS POR FUNCIONÁRIO (EM MEMÓRIA)
+# ============================================================================
+def _conferir_indices():
+    """
+    Descarta todos os índices carregados se a tabela `ferias` mudou sem
+    passar por este processo (outro worker, `flask importar`, SQL manual):
+    a versão gravada no banco (`versao_dados()`) deixa de ser a que os
+    índices refletem. Deve ser usada com `_indices_trava` adquirida.
+    """
+    global _indices_versao
+
+    versao, = versao_dados("ferias")
+    if versao != _indices_versao:
+        _indices_ferias.clear()
+        _indices_versao = versao
+
+
+def _indice_ferias(funcionario_id):
+    """
+    Índice das férias confirmadas do funcionário, lido do banco apenas na
+    primeira vez. Deve ser usado com `_indices_trava` adquirida, depois de
+    `_conferir_indices()`.
+
+    Só é carregado antes de qualquer escrita da requisição nas férias do
+    funcionário (ver `_indice_para_escrita()`), então nunca inclui dados
+    não confirmados.
+    """
+    indice = _indices_ferias.get(funcionario_id)
+    if indice is None:
+        cursor = get_db().cursor()
+        cursor.execute("""
+            SELECT CAST(julianday(data_inicio) AS INTEGER) - ?,
+                   CAST(julianday(data_fim) AS INTEGER) - ?,
+                   id
+            FROM ferias
+            WHERE funcionario_id = ?
+        """, (AJUSTE_JULIANO, AJUSTE_JULIANO, funcionario_id))
+
+        indice = IndiceIntervalos(cursor.fetchall())
+        _indices_ferias[funcionario_id] = indice
+
+    return indice
+
+
+def _indice_para_escrita(funcionario_id):
+    """
+    Prepara o índice do funcionário para uma escrita em andamento.
+
+    A escrita altera uma cópia privada da requisição (as próximas checagens
+    da mesma transação já a enxergam) e registra as operações, que só são
+    aplicadas no índice compartilhado depois do commit.
+
+    Deve ser chamada ANTES de executar o SQL da escrita.
+
+    Retorna:
+        tuple (indice, operacoes): cópia da requisição e lista de operações
+        ("incluir" | "remover", funcionario_id, item).
+    """
+    escritas = pendentes().get("ferias")
+    if escritas is None:
+        escritas = pendentes()["ferias"] = {"indices": {}, "operacoes": []}
+
+        # Reserva o banco: a partir daqui ninguém mais grava até o commit
+        ao_confirmar(partial(_aplicar_operacoes, escritas["operacoes"]))
+        with _indices_trava:
+            _conferir_indices()
+
+    indice = escritas["indices"].get(funcionario_id)
+    if indice is None:
+        with _indices_trava:
+            indice = _indice_ferias(funcionario_id).copia()
+        escritas["indices"][funcionario_id] = indice
+
+    return indice, escritas["operacoes"]
+
+
+def _aplicar_operacoes(operacoes, antes, depois):
+    """
+    Aplica no índice compartilhado as operações de uma escrita confirmada.
+
+    Só vale se os índices refletiam exatamente a versão de antes da
+    escrita; caso contrário (gravação por fora no meio do caminho) são
+    todos descartados e relidos do banco sob demanda.
+
+    Funcionários ainda não carregados são ignorados: serão lidos do banco,
+    já com os dados confirmados, na primeira consulta.
+    """
+    global _indices_versao
+
+    with _indices_trava:
+        if antes is None or antes["ferias"] != _indices_versao:
+            _indices_ferias.clear()
+            _indices_versao = None
+            return
+
+        _indices_versao = depois["ferias"]
+
+        for tipo, funcionario_id, item in operacoes:
+            indice = _indices_ferias.get(funcionario_id)
+            if indice is None:
+                continue
+
+            if tipo == "incluir":
+                indice.adicionar(*item)
+            else:
+                indice.remover(*item)
 
 
 # ============================================================================
@@ -162,6 +587,10 @@ def existe_sobreposicao(funcionario_id, inicio, fim, ignorar_ferias_id=None):
             data_inicio <= fim_novo  AND
             data_fim >= inicio_novo
 
+    A checagem usa o índice em memória do funcionário (busca binária), sem
+    consultar o banco; escritas ainda não confirmadas da própria requisição
+    já são consideradas.
+
     Parâmetros:
         funcionario_id (int)
         inicio (str)  → formato ISO (yyyy-mm-dd)
@@ -171,29 +600,20 @@ def existe_sobreposicao(funcionario_id, inicio, fim, ignorar_ferias_id=None):
     Retorna:
         bool: True se houver conflito, False caso contrário.
     """
+    funcionario_id = int(funcionario_id)
+    ignorar = int(ignorar_ferias_id) if ignorar_ferias_id else None
 
-    conn = get_connection()
-    cursor = conn.cursor()
-
-    query = """
-        SELECT COUNT(*)
-        FROM ferias
-        WHERE funcionario_id = ?
-        AND data_inicio <= ?
-        AND data_fim >= ?
-    """
+    escritas = pendentes().get("ferias")
+    with _indices_trava:
+        indice = escritas["indices"].get(funcionario_id) if escritas else None
+        if indice is None:
+            _conferir_indices()
+            indice = _indice_ferias(funcionario_id)
 
-    params = [funcionario_id, fim, inicio]
-
-    if ignorar_ferias_id:
-        query += " AND id != ?"
-        params.append(ignorar_ferias_id)
-
-    cursor.execute(query, params)
-    resultado = cursor.fetchone()[0]
-
-    conn.close()
-    return resultado > 0
+        return any(
+            ferias_id != ignorar
+            for _, _, ferias_id in indice.sobrepostos(dia(inicio), dia(fim))
+        )
 
 
 # ============================================================================
@@ -214,9 +634,12 @@ def adicionar_ferias(funcionario_id, agendado_sap, periodo_dias,
         cor (str): cor usada no gráfico Gantt
     """
 
-    conn = get_connection()
+    conn = get_db()
     cursor = conn.cursor()
 
+    funcionario_id = int(funcionario_id)
+    indice, operacoes = _indice_para_escrita(funcionario_id)
+
     cursor.execute("""
         INSERT INTO ferias (
             funcionario_id,
@@ -237,8 +660,216 @@ def adicionar_ferias(funcionario_id, agendado_sap, periodo_dias,
         cor
     ))
 
-    conn.commit()
-    conn.close()
+    item = (dia(data_inicio), dia(data_fim), cursor.lastrowid)
+    indice.adicionar(*item)
+    operacoes.append(("incluir", funcionario_id, item))
+    ausencias_alteradas().append(("ferias", funcionario_id, item[2], None, item[:2]))
+
+    confirmar(conn)
+
+
+# ============================================================================
+# ADICIONAR VÁRIOS PERÍODOS DE FÉRIAS (LOTE)
+# ============================================================================
+def _periodo_do_lote(item):
+    """
+    Valida o formato de um item do lote.
+
+    Retorna:
+        tuple (funcionario_id, inicio, fim, agendado_sap, abono_peculiario)
+
+    Raises:
+        ValueError: com a mensagem de erro do item.
+    """
+    if not isinstance(item, dict):
+        raise ValueError("Item deve ser um objeto")
+
+    try:
+        funcionario_id = int(item.get("funcionario_id"))
+    except (TypeError, ValueError):
+        raise ValueError("Funcionário inválido")
+
+    try:
+        inicio = date.fromisoformat(item.get("inicio") or "")
+        fim = date.fromisoformat(item.get("fim") or "")
+    except (TypeError, ValueError):
+        raise ValueError("Datas devem estar no formato AAAA-MM-DD")
+
+    if fim < inicio:
+        raise ValueError("A data final deve ser igual ou posterior à data inicial")
+
+    agendado_sap = item.get("agendado_sap", "não")
+    abono = item.get("abono_peculiario", "não")
+    if agendado_sap not in ("sim", "não") or abono not in ("sim", "não"):
+        raise ValueError("agendado_sap e abono_peculiario devem ser 'sim' ou 'não'")
+
+    return funcionario_id, inicio, fim, agendado_sap, abono
+
+
+def adicionar_ferias_em_lote(itens, cor="#4CAF50", parcial=False):
+    """
+    Valida e insere vários períodos de férias de uma vez: tudo ou nada, ou
+    (com `parcial`) só os itens válidos.
+
+    Toda a validação é feita em memória, com uma leitura por bloco de
+    funcionários (datas de admissão e `saldo_ferias`):
+    - formato dos campos e data final >= data inicial
+    - funcionário existente
+    - limite de 30 dias no período aquisitivo, somando os itens do lote
+    - sobreposição com férias cadastradas (índice em memória) e com os
+      outros itens do lote
+
+    Os itens aceitos são gravados com um único `executemany`. Sem
+    `parcial`, basta um item inválido para nada ser gravado.
+
+    Deve ser chamada dentro de `transacao()`: os IDs gerados são lidos logo
+    após a inserção, contando com a reserva de escrita da transação.
+
+    Parâmetros:
+        itens (list[dict]): {"funcionario_id", "inicio", "fim",
+                             "agendado_sap"?, "abono_peculiario"?,
+                             "linha"?}; `linha` identifica o item nas
+                             mensagens (ex.: linha da planilha)
+        cor (str): cor usada no gráfico Gantt
+        parcial (bool): grava os itens válidos mesmo se houver inválidos
+                        (importação de planilhas)
+
+    Retorna:
+        tuple (gravado, resultados):
+            gravado (bool): True se os itens válidos foram inseridos
+            resultados (list[dict]): um por item, na mesma ordem —
+                {"id"} quando gravado, {"erro"} para os itens inválidos e
+                {"valido": True} para os válidos de um lote recusado.
+    """
+    conn = get_db()
+    cursor = conn.cursor()
+
+    erros = [None] * len(itens)
+    periodos = [None] * len(itens)
+    for i, item in enumerate(itens):
+        try:
+            periodos[i] = _periodo_do_lote(item)
+        except ValueError as erro:
+            erros[i] = str(erro)
+
+    # Datas de admissão e dias já usados de todos os envolvidos, só nos
+    # períodos aquisitivos que o lote pode atingir
+    ids = sorted({p[0] for p in periodos if p})
+    anos = [p[1].year for p in periodos if p]
+    admissoes, usados = {}, {}
+
+    # Em blocos, abaixo do limite de parâmetros do SQLite
+    for i in range(0, len(ids), 500):
+        bloco = ids[i:i + 500]
+        marcadores = ",".join("?" * len(bloco))
+
+        cursor.execute(
+            f"SELECT id, data_admissao FROM funcionarios WHERE id IN ({marcadores})",
+            bloco
+        )
+        admissoes.update(cursor.fetchall())
+
+        cursor.execute(f"""
+            SELECT funcionario_id, periodo_aquisitivo, dias_usados
+            FROM saldo_ferias
+            WHERE funcionario_id IN ({marcadores})
+              AND periodo_aquisitivo BETWEEN ? AND ?
+        """, [*bloco, min(anos) - 1, max(anos)])
+        usados.update(((f, periodo), dias) for f, periodo, dias in cursor)
+
+    # Itens já aceitos do lote, por funcionário (sobreposição entre eles)
+    aceitos = {}
+
+    # Índice de cada funcionário preparado para a escrita: (indice, operacoes)
+    escritas = {}
+
+    for i, periodo in enumerate(periodos):
+        if periodo is None:
+            continue
+
+        funcionario_id, inicio, fim = periodo[:3]
+        if funcionario_id not in admissoes:
+            erros[i] = "Funcionário não encontrado"
+            continue
+
+        de, ate = dia(inicio), dia(fim)
+        dias = ate - de + 1
+
+        admissao = admissoes[funcionario_id]
+        chave = (funcionario_id, periodo_aquisitivo(inicio, admissao))
+        if usados.get(chave, 0) + dias > LIMITE_DIAS_FERIAS:
+            janela_ini, janela_fim = janela_aquisitiva(chave[1], admissao)
+            erros[i] = (
+                f"Ultrapassa {LIMITE_DIAS_FERIAS} dias no período aquisitivo "
+                f"{janela_ini:%d/%m/%Y} a {janela_fim:%d/%m/%Y} "
+                f"(já usados: {usados.get(chave, 0)}, pedidos: {dias})"
+            )
+            continue
+
+        if funcionario_id not in escritas:
+            escritas[funcionario_id] = _indice_para_escrita(funcionario_id)
+
+        indice, _ = escritas[funcionario_id]
+        if indice.sobrepostos(de, ate):
+            erros[i] = "Sobrepõe férias já cadastradas"
+            continue
+
+        do_lote = aceitos.setdefault(funcionario_id, IndiceIntervalos())
+        outros = do_lote.sobrepostos(de, ate)
+        if outros:
+            outro = itens[outros[0][2]]
+            erros[i] = (
+                f"Sobrepõe a linha {outro['linha']}" if "linha" in outro
+                else f"Sobrepõe o item {outros[0][2]} do lote"
+            )
+            continue
+
+        do_lote.adicionar(de, ate, i)
+        usados[chave] = usados.get(chave, 0) + dias
+
+    if any(erros) and not parcial:
+        return False, [{"erro": erro} if erro else {"valido": True} for erro in erros]
+
+    resultados = [{"erro": erro} for erro in erros]
+    validos = [i for i, erro in enumerate(erros) if erro is None]
+    if not validos:
+        return True, resultados
+
+    cursor.execute("SELECT COALESCE(MAX(id), 0) FROM ferias")
+    ultimo_id = cursor.fetchone()[0]
+
+    cursor.executemany("""
+        INSERT INTO ferias (
+            funcionario_id,
+            agendado_sap,
+            periodo_dias,
+            abono_peculiario,
+            data_inicio,
+            data_fim,
+            cor
+        ) VALUES (?, ?, ?, ?, ?, ?, ?)
+    """, [
+        (funcionario_id, agendado_sap, (fim - inicio).days + 1, abono,
+         inicio.isoformat(), fim.isoformat(), cor)
+        for funcionario_id, inicio, fim, agendado_sap, abono in (periodos[i] for i in validos)
+    ])
+
+    # A transação reserva o banco: os IDs novos são exatamente os acima do último
+    cursor.execute("SELECT id FROM ferias WHERE id > ? ORDER BY id", (ultimo_id,))
+    novos_ids = [linha[0] for linha in cursor]
+
+    ausencias = ausencias_alteradas()
+    for ferias_id, i in zip(novos_ids, validos):
+        funcionario_id, inicio, fim = periodos[i][:3]
+        indice, operacoes = escritas[funcionario_id]
+        item = (dia(inicio), dia(fim), ferias_id)
+        indice.adicionar(*item)
+        operacoes.append(("incluir", funcionario_id, item))
+        ausencias.append(("ferias", funcionario_id, ferias_id, None, item[:2]))
+        resultados[i] = {"id": ferias_id}
+
+    confirmar(conn)
+    return True, resultados
 
 
 # ============================================================================
@@ -251,12 +882,46 @@ def deletar_ferias(ferias_id):
     Parâmetros:
         ferias_id (int)
     """
-    conn = get_connection()
+    conn = get_db()
     cursor = conn.cursor()
 
+    atual = _ferias_do_indice(cursor, ferias_id)
+
     cursor.execute("DELETE FROM ferias WHERE id = ?;", (ferias_id,))
-    conn.commit()
-    conn.close()
+
+    if atual:
+        funcionario_id, item, indice, operacoes = atual
+        indice.remover(*item)
+        operacoes.append(("remover", funcionario_id, item))
+        ausencias_alteradas().append(("ferias", funcionario_id, item[2], item[:2], None))
+
+    confirmar(conn)
+
+
+def _ferias_do_indice(cursor, ferias_id):
+    """
+    Localiza um registro de férias antes de alterá-lo/removê-lo, preparando
+    o índice do funcionário para a escrita.
+
+    Retorna:
+        tuple (funcionario_id, item, indice, operacoes) ou None se o
+        registro não existe.
+    """
+    cursor.execute("""
+        SELECT funcionario_id,
+               CAST(julianday(data_inicio) AS INTEGER) - ?,
+               CAST(julianday(data_fim) AS INTEGER) - ?
+        FROM ferias
+        WHERE id = ?
+    """, (AJUSTE_JULIANO, AJUSTE_JULIANO, ferias_id))
+
+    linha = cursor.fetchone()
+    if linha is None:
+        return None
+
+    funcionario_id, inicio, fim = linha
+    indice, operacoes = _indice_para_escrita(funcionario_id)
+    return funcionario_id, (inicio, fim, int(ferias_id)), indice, operacoes
 
 
 # ============================================================================
@@ -277,9 +942,11 @@ def atualizar_ferias(ferias_id, agendado_sap, periodo_dias,
         cor (str)
     """
 
-    conn = get_connection()
+    conn = get_db()
     cursor = conn.cursor()
 
+    atual = _ferias_do_indice(cursor, ferias_id)
+
     cursor.execute("""
         UPDATE ferias
         SET agendado_sap = ?,
@@ -299,14 +966,22 @@ def atualizar_ferias(ferias_id, agendado_sap, periodo_dias,
         ferias_id
     ))
 
-    conn.commit()
-    conn.close()
+    if atual:
+        funcionario_id, item, indice, operacoes = atual
+        novo = (dia(data_inicio), dia(data_fim), int(ferias_id))
+        indice.remover(*item)
+        indice.adicionar(*novo)
+        operacoes.append(("remover", funcionario_id, item))
+        operacoes.append(("incluir", funcionario_id, novo))
+        ausencias_alteradas().append(("ferias", funcionario_id, novo[2], item[:2], novo[:2]))
+
+    confirmar(conn)
 
 
 # ============================================================================
 # FILTRO AVANÇADO (USADO NA TELA PRINCIPAL / AJAX)
 # ============================================================================
-def filtrar_ferias_service(funcionario_id, ano, mes, abono, sap):
+def filtrar_ferias_service(funcionario_id, ano, mes, abono, sap, apos=None, limite=None):
     """
     Aplica filtros dinâmicos nas férias para exibição no frontend.
 
@@ -317,19 +992,36 @@ def filtrar_ferias_service(funcionario_id, ano, mes, abono, sap):
         abono pecuniário
         agendado no SAP
 
+    Ano e mês viram janelas de datas (`janelas_do_filtro()`): um período
+    entra no resultado quando se sobrepõe à janela, então férias de
+    28/01 a 10/02 aparecem tanto em janeiro quanto em fevereiro.
+
+    Paginação:
+        apos   : cursor (ver `codificar_cursor()`) da última férias já exibida.
+        limite : quantidade máxima de registros.
+
     Retorna:
-        lista de objetos JSON serializáveis.
+        gerador de objetos JSON serializáveis (um por férias), lido do
+        cursor do banco sob demanda.
     """
 
-    conn = get_connection()
+    conn = get_db()
     cursor = conn.cursor()
 
-    query = """
+    anos = anos_com_ferias() if mes and not ano else ()
+    janelas = janelas_do_filtro(ano, mes, anos)
+
+    # Sem filtro de funcionário, o SQLite preferiria percorrer o índice da
+    # ordenação (funcionário, início) inteiro; as janelas são bem mais
+    # seletivas pelo índice de períodos
+    indice = "INDEXED BY idx_ferias_periodo" if janelas and not funcionario_id else ""
+
+    query = f"""
         SELECT
             f.id, f.funcionario_id, func.nome,
             f.agendado_sap, f.periodo_dias, f.abono_peculiario,
             f.data_inicio, f.data_fim
-        FROM ferias f
+        FROM ferias f {indice}
         JOIN funcionarios func ON func.id = f.funcionario_id
         WHERE 1=1
     """
@@ -340,13 +1032,16 @@ def filtrar_ferias_service(funcionario_id, ano, mes, abono, sap):
         query += " AND f.funcionario_id = ?"
         params.append(funcionario_id)
 
-    if ano:
-        query += " AND strftime('%Y', f.data_inicio) = ?"
-        params.append(str(ano))
-
-    if mes:
-        query += " AND strftime('%m', f.data_inicio) = ?"
-        params.append(f"{int(mes):02d}")
+    if janelas:
+        # Sobreposição: termina depois do início da janela e começa antes do fim
+        query += " AND (" + " OR ".join(
+            "(f.data_fim >= ? AND f.data_inicio <= ?)" for _ in janelas
+        ) + ")"
+        for inicio, fim in janelas:
+            params.extend([inicio, fim])
+    elif mes:
+        # Filtro de mês sem nenhuma férias cadastrada
+        return
 
     if abono:
         query += " AND f.abono_peculiario = ?"
@@ -356,31 +1051,37 @@ def filtrar_ferias_service(funcionario_id, ano, mes, abono, sap):
         query += " AND f.agendado_sap = ?"
         params.append(sap)
 
-    query += " ORDER BY f.funcionario_id, f.data_inicio"
+    if apos:
+        query += " AND (f.funcionario_id, f.data_inicio, f.id) > (?, ?, ?)"
+        params.extend(decodificar_cursor(apos))
+
+    query += " ORDER BY f.funcionario_id, f.data_inicio, f.id"
+
+    if limite:
+        query += " LIMIT ?"
+        params.append(int(limite))
 
     cursor.execute(query, params)
-    dados = cursor.fetchall()
-    conn.close()
 
-    lista = []
-    for r in dados:
-        lista.append({
+    for r in cursor:
+        yield {
             "id": r[0],
+            "funcionario_id": r[1],
             "funcionario": r[2],
             "sap": r[3],
             "dias": r[4],
             "abono": r[5],
             "inicio": formatar_data(r[6]),
-            "fim": formatar_data(r[7])
-        })
-
-    return lista
+            "fim": formatar_data(r[7]),
+            "inicio_iso": r[6],
+            "fim_iso": r[7]
+        }
 
 
 # ============================================================================
 # LISTAR PERÍODOS PARA GANTT
 # ============================================================================
-def listar_periodos_para_gantt():
+def listar_periodos_para_gantt(funcionario=None, janelas=(), ids=None):
     """
     Retorna apenas os dados necessários para montar o gráfico Gantt:
         - Nome do funcionário
@@ -389,25 +1090,230 @@ def listar_periodos_para_gantt():
 
     O gráfico não precisa de detalhes como SAP, abono, cor etc.
 
+    Os filtros são aplicados no SQL, então só voltam as linhas que serão
+    desenhadas.
+
+    Parâmetros:
+        funcionario (str | None): nome do funcionário (None = todos)
+        janelas (list[tuple]): janelas de `janelas_do_filtro()`; o período
+            entra quando se sobrepõe a alguma delas (vazia = sem filtro)
+        ids (list[int] | None): restringe às faixas (funcionários) de uma
+            página do gráfico (ver `faixas_do_gantt()`)
+
     Retorna:
         list[tuple]: [(nome, inicio_iso, fim_iso), ...]
     """
 
-    conn = get_connection()
+    conn = get_db()
     cursor = conn.cursor()
 
-    cursor.execute("""
+    query = """
         SELECT func.nome, f.data_inicio, f.data_fim
         FROM ferias f
         JOIN funcionarios func ON func.id = f.funcionario_id
-        ORDER BY func.nome, f.data_inicio
-    """)
+        WHERE 1=1
+    """
+
+    params = []
+
+    if funcionario:
+        query += " AND func.nome = ?"
+        params.append(funcionario)
+
+    if ids is not None:
+        query += f" AND f.funcionario_id IN ({', '.join('?' for _ in ids)})"
+        params.extend(ids)
+
+    if janelas:
+        query += " AND (" + " OR ".join(
+            "(f.data_fim >= ? AND f.data_inicio <= ?)" for _ in janelas
+        ) + ")"
+        for inicio, fim in janelas:
+            params.extend([inicio, fim])
+
+    query += " ORDER BY func.nome, func.id, f.data_inicio"
+
+    cursor.execute(query, params)
+
+    return cursor.fetchall()
+
+
+# ============================================================================
+# FAIXAS (FUNCIONÁRIOS) DO GANTT EM PÁGINAS
+# ============================================================================
+def codificar_cursor_faixa(nome, funcionario_id):
+    """
+    Monta o cursor de uma faixa do Gantt (paginação por (nome, id)).
+
+    Retorna:
+        str: cursor no formato "funcionario_id|nome".
+    """
+    return f"{funcionario_id}|{nome}"
+
+
+def decodificar_cursor_faixa(cursor):
+    """
+    Converte o cursor de faixa de volta em (nome, funcionario_id).
+
+    Raises:
+        ValueError: se o cursor estiver malformado.
+    """
+    funcionario_id, nome = cursor.split("|", 1)
+    return nome, int(funcionario_id)
+
+
+def faixas_do_gantt(funcionario=None, janelas=(), apos=None, antes=None, limite=50):
+    """
+    Retorna uma página de faixas do Gantt: funcionários, em ordem de nome,
+    que têm férias ou folga dentro dos filtros.
+
+    A paginação é por chave em (nome, id), percorrendo `idx_funcionarios_nome`;
+    a existência de férias/folgas é testada pelos índices por funcionário.
+    O custo de uma página não depende do total de funcionários.
+
+    Parâmetros:
+        funcionario (str | None): nome do funcionário (None = todos)
+        janelas (list[tuple]): janelas de `janelas_do_filtro()`
+        apos (str | None): cursor; página seguinte a esta faixa
+        antes (str | None): cursor; página anterior a esta faixa
+        limite (int): quantidade máxima de faixas
+
+    Retorna:
+        list[tuple]: [(funcionario_id, nome), ...] em ordem crescente.
+
+    Raises:
+        ValueError: se o cursor estiver malformado.
+    """
 
-    dados = cursor.fetchall()
-    conn.close()
+    conn = get_db()
+    cursor = conn.cursor()
+
+    filtro_ferias = ""
+    filtro_folgas = ""
+    params_janelas = []
+
+    if janelas:
+        filtro_ferias = " AND (" + " OR ".join(
+            "(f.data_fim >= ? AND f.data_inicio <= ?)" for _ in janelas
+        ) + ")"
+        filtro_folgas = " AND (" + " OR ".join(
+            "fo.data_folga BETWEEN ? AND ?" for _ in janelas
+        ) + ")"
+        for inicio, fim in janelas:
+            params_janelas.extend([inicio, fim])
+
+    query = f"""
+        SELECT func.id, func.nome
+        FROM funcionarios func
+        WHERE (
+            EXISTS (
+                SELECT 1 FROM ferias f
+                WHERE f.funcionario_id = func.id{filtro_ferias}
+            )
+            OR EXISTS (
+                SELECT 1 FROM folga_assiduidade fo
+                WHERE fo.funcionario_id = func.id{filtro_folgas}
+            )
+        )
+    """
+
+    # As mesmas janelas valem para os dois EXISTS
+    params = params_janelas * 2
+
+    if funcionario:
+        query += " AND func.nome = ?"
+        params.append(funcionario)
+
+    if apos:
+        query += " AND (func.nome, func.id) > (?, ?)"
+        params.extend(decodificar_cursor_faixa(apos))
+
+    if antes:
+        # Página anterior: lê de trás para frente e inverte no fim
+        query += " AND (func.nome, func.id) < (?, ?)"
+        params.extend(decodificar_cursor_faixa(antes))
+        query += " ORDER BY func.nome DESC, func.id DESC"
+    else:
+        query += " ORDER BY func.nome, func.id"
+
+    query += " LIMIT ?"
+    params.append(int(limite))
+
+    cursor.execute(query, params)
+    faixas = cursor.fetchall()
 
-    lista = []
-    for nome, inicio, fim in dados:
-        lista.append((nome, inicio, fim))
+    if antes:
+        faixas.reverse()
+
+    return faixas
+
+
+def anos_das_ferias():
+    """
+    Lista os anos em que algum período de férias começa ou termina.
+
+    Em vez de ler todas as linhas, "salta" pelo índice `idx_ferias_periodo`:
+    uma busca por ano para achar o próximo `data_fim`, mais uma checagem de
+    período que começa no ano anterior (só quando esse ano ainda não está
+    na lista). O custo depende da quantidade de anos, não do histórico.
+
+    Retorna:
+        list[int]: anos em ordem crescente.
+    """
+
+    conn = get_db()
+    cursor = conn.cursor()
+
+    anos = set()
+    proximo = ""
+
+    while True:
+        data_fim = cursor.execute(
+            "SELECT MIN(data_fim) FROM ferias WHERE data_fim >= ?;", (proximo,)
+        ).fetchone()[0]
+
+        if not data_fim:
+            break
+
+        ano = int(data_fim[:4])
+        anos.add(ano)
+
+        # Período que atravessa a virada do ano (começa no ano anterior)
+        if ano - 1 not in anos:
+            cruzando = cursor.execute("""
+                SELECT 1 FROM ferias
+                WHERE data_fim BETWEEN ? AND ? AND data_inicio < ?
+                LIMIT 1;
+            """, (f"{ano:04d}-01-01", f"{ano:04d}-12-31", f"{ano:04d}-01-01")).fetchone()
+            if cruzando:
+                anos.add(ano - 1)
+
+        proximo = f"{ano + 1:04d}-01-01"
+
+    return sorted(anos)
+
+
+def nomes_com_ferias():
+    """
+    Lista (em ordem) os nomes dos funcionários que têm férias cadastradas.
+
+    Percorre `idx_funcionarios_nome` e testa a existência de férias pelo
+    índice `idx_ferias_funcionario_periodo`.
+
+    Retorna:
+        list[str]
+    """
+
+    conn = get_db()
+    cursor = conn.cursor()
+
+    cursor.execute("""
+        SELECT DISTINCT func.nome
+        FROM funcionarios func
+        WHERE EXISTS (
+            SELECT 1 FROM ferias f WHERE f.funcionario_id = func.id
+        )
+        ORDER BY func.nome
+    """)
 
-    return lista
+    return [r[0] for r in cursor.fetchall()]
@@ -8,15 +8,20 @@ aos funcionários.
 Este módulo fornece funções para:
 
 - Consultar folga existente para um funcionário e ano
-- Inserir nova folga
+- Inserir nova folga (uma ou várias de uma vez)
 - Atualizar folga existente
 - Deletar folga
 - Listar todas as folgas registradas junto com o nome do funcionário
+- Consultas filtradas para o gráfico Gantt
 
-Cada função acessa o banco utilizando `get_connection()`.
+Cada função acessa o banco utilizando `get_db()` (conexão da requisição).
+As escritas anotam as folgas alteradas para o índice de conflitos
+(`conflito_service.ausencias_alteradas()`).
 """
 
-from database import get_connection
+from database import get_db, confirmar
+from services.conflito_service import ausencias_alteradas
+from services.indice_intervalos import dia
 
 
 # ============================================================================
@@ -36,7 +41,7 @@ def obter_folga(funcionario_id, ano):
         None → se não houver registro para o ano informado.
     """
 
-    conn = get_connection()
+    conn = get_db()
     cursor = conn.cursor()
 
     cursor.execute("""
@@ -47,7 +52,6 @@ def obter_folga(funcionario_id, ano):
     """, (funcionario_id, ano))
 
     dado = cursor.fetchone()
-    conn.close()
     return dado  # (id, data_folga) ou None
 
 
@@ -64,16 +68,81 @@ def adicionar_folga(funcionario_id, ano, data_folga):
         data_folga (str → formato ISO yyyy-mm-dd)
     """
 
-    conn = get_connection()
+    conn = get_db()
     cursor = conn.cursor()
+    ausencias = ausencias_alteradas()
 
     cursor.execute("""
         INSERT INTO folga_assiduidade (funcionario_id, ano, data_folga)
         VALUES (?, ?, ?)
     """, (funcionario_id, ano, data_folga))
 
-    conn.commit()
-    conn.close()
+    ausencias.append(("folga", int(funcionario_id), cursor.lastrowid, None, (dia(data_folga),) * 2))
+    confirmar(conn)
+
+
+# ============================================================================
+# ADICIONAR VÁRIAS FOLGAS (IMPORTAÇÃO)
+# ============================================================================
+def anos_com_folga(ids, ano_inicio, ano_fim):
+    """
+    Anos de [ano_inicio, ano_fim] em que os funcionários informados já têm
+    folga registrada (lidos pelo índice `idx_folga_funcionario_ano`).
+
+    Parâmetros:
+        ids (list[int])
+        ano_inicio, ano_fim (int)
+
+    Retorna:
+        set[tuple]: {(funcionario_id, ano), ...}
+    """
+
+    conn = get_db()
+    cursor = conn.cursor()
+    anos = set()
+
+    # Em blocos, abaixo do limite de parâmetros do SQLite
+    for i in range(0, len(ids), 500):
+        bloco = ids[i:i + 500]
+        cursor.execute(f"""
+            SELECT funcionario_id, ano
+            FROM folga_assiduidade
+            WHERE funcionario_id IN ({','.join('?' * len(bloco))})
+              AND ano BETWEEN ? AND ?
+        """, [*bloco, ano_inicio, ano_fim])
+        anos.update(cursor.fetchall())
+
+    return anos
+
+
+def adicionar_folgas_em_lote(folgas):
+    """
+    Insere várias folgas com um único `executemany`.
+
+    Os IDs gerados (para o índice de conflitos) são lidos logo após a
+    inserção, contando com a reserva de escrita feita antes dela.
+
+    Parâmetro:
+        folgas (list[tuple]): [(funcionario_id, ano, data_folga ISO), ...]
+    """
+
+    conn = get_db()
+    cursor = conn.cursor()
+    ausencias = ausencias_alteradas()
+
+    cursor.execute("SELECT COALESCE(MAX(id), 0) FROM folga_assiduidade")
+    ultimo_id = cursor.fetchone()[0]
+
+    cursor.executemany("""
+        INSERT INTO folga_assiduidade (funcionario_id, ano, data_folga)
+        VALUES (?, ?, ?)
+    """, folgas)
+
+    cursor.execute("SELECT id FROM folga_assiduidade WHERE id > ? ORDER BY id", (ultimo_id,))
+    for (folga_id,), (funcionario_id, _, data_folga) in zip(cursor.fetchall(), folgas):
+        ausencias.append(("folga", funcionario_id, folga_id, None, (dia(data_folga),) * 2))
+
+    confirmar(conn)
 
 
 # ============================================================================
@@ -88,8 +157,10 @@ def atualizar_folga(folga_id, nova_data):
         nova_data (str ISO)
     """
 
-    conn = get_connection()
+    conn = get_db()
     cursor = conn.cursor()
+    ausencias = ausencias_alteradas()
+    atual = _folga_atual(cursor, folga_id)
 
     cursor.execute("""
         UPDATE folga_assiduidade
@@ -97,8 +168,11 @@ def atualizar_folga(folga_id, nova_data):
         WHERE id = ?
     """, (nova_data, folga_id))
 
-    conn.commit()
-    conn.close()
+    if atual:
+        funcionario_id, data_folga = atual
+        ausencias.append(("folga", funcionario_id, int(folga_id),
+                          (dia(data_folga),) * 2, (dia(nova_data),) * 2))
+    confirmar(conn)
 
 
 # ============================================================================
@@ -112,12 +186,26 @@ def deletar_folga(folga_id):
         folga_id (int)
     """
 
-    conn = get_connection()
+    conn = get_db()
     cursor = conn.cursor()
+    ausencias = ausencias_alteradas()
+    atual = _folga_atual(cursor, folga_id)
 
     cursor.execute("DELETE FROM folga_assiduidade WHERE id = ?;", (folga_id,))
-    conn.commit()
-    conn.close()
+
+    if atual:
+        funcionario_id, data_folga = atual
+        ausencias.append(("folga", funcionario_id, int(folga_id), (dia(data_folga),) * 2, None))
+    confirmar(conn)
+
+
+def _folga_atual(cursor, folga_id):
+    """(funcionario_id, data_folga) de uma folga, ou None se não existe."""
+    cursor.execute(
+        "SELECT funcionario_id, data_folga FROM folga_assiduidade WHERE id = ?;",
+        (folga_id,)
+    )
+    return cursor.fetchone()
 
 
 # ============================================================================
@@ -147,18 +235,17 @@ def listar_folgas():
             ]
     """
 
-    conn = get_connection()
+    conn = get_db()
     cursor = conn.cursor()
 
     cursor.execute("""
         SELECT f.id, func.nome, f.ano, f.data_folga
         FROM folga_assiduidade f
         JOIN funcionarios func ON func.id = f.funcionario_id
-        ORDER BY func.nome, f.ano;
+        ORDER BY func.nome, func.id, f.ano;
     """)
 
     dados = cursor.fetchall()
-    conn.close()
 
     # Converte linhas em objetos (dicionários)
     return [
@@ -170,3 +257,87 @@ def listar_folgas():
         }
         for row in dados
     ]
+
+
+# ============================================================================
+# FOLGAS PARA O GANTT
+# ============================================================================
+def listar_folgas_para_gantt(funcionario=None, janelas=(), ids=None):
+    """
+    Retorna as folgas que serão desenhadas no gráfico Gantt.
+
+    Parâmetros:
+        funcionario (str | None): nome do funcionário (None = todos)
+        janelas (list[tuple]): janelas (inicio_iso, fim_iso); a folga entra
+            quando sua data cai em alguma delas (vazia = sem filtro)
+        ids (list[int] | None): restringe aos funcionários de uma página
+            do gráfico
+
+    Retorna:
+        list[tuple]: [(nome, data_folga), ...]
+    """
+
+    conn = get_db()
+    cursor = conn.cursor()
+
+    query = """
+        SELECT func.nome, f.data_folga
+        FROM folga_assiduidade f
+        JOIN funcionarios func ON func.id = f.funcionario_id
+        WHERE 1=1
+    """
+
+    params = []
+
+    if funcionario:
+        query += " AND func.nome = ?"
+        params.append(funcionario)
+
+    if ids is not None:
+        query += f" AND f.funcionario_id IN ({', '.join('?' for _ in ids)})"
+        params.extend(ids)
+
+    if janelas:
+        query += " AND (" + " OR ".join(
+            "f.data_folga BETWEEN ? AND ?" for _ in janelas
+        ) + ")"
+        for inicio, fim in janelas:
+            params.extend([inicio, fim])
+
+    query += " ORDER BY func.nome, func.id, f.ano"
+
+    cursor.execute(query, params)
+
+    return cursor.fetchall()
+
+
+def anos_das_folgas():
+    """
+    Lista os anos que têm alguma folga cadastrada.
+
+    "Salta" pelo índice `idx_folga_data`, com uma busca por ano (o custo
+    depende da quantidade de anos, não da quantidade de folgas).
+
+    Retorna:
+        list[int]: anos em ordem crescente.
+    """
+
+    conn = get_db()
+    cursor = conn.cursor()
+
+    anos = []
+    proximo = ""
+
+    while True:
+        data = cursor.execute(
+            "SELECT MIN(data_folga) FROM folga_assiduidade WHERE data_folga >= ?;",
+            (proximo,)
+        ).fetchone()[0]
+
+        if not data:
+            break
+
+        anos.append(int(data[:4]))
+        proximo = f"{anos[-1] + 1:04d}-01-01"
+
+    return anos
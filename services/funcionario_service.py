@@ -5,15 +5,17 @@ Camada de serviço responsável por manipular os dados da tabela `funcionarios`.
 
 Este módulo fornece funções CRUD para:
 - Listar funcionários
-- Inserir novo funcionário
+- Inserir novo funcionário (um ou vários de uma vez)
+- Mapa nome → ID, para importações
 - Consultar funcionário por ID
-- Atualizar nome de funcionário
+- Atualizar nome e data de admissão de funcionário
 - Remover funcionário
 
-Todas as operações utilizam `get_connection()` para acessar o banco SQLite.
+Todas as operações utilizam `get_db()` para acessar o banco SQLite
+(conexão única da requisição atual).
 """
 
-from database import get_connection
+from database import get_db, confirmar
 
 
 # ============================================================================
@@ -26,38 +28,92 @@ def listar_funcionarios():
     A consulta é ordenada alfabeticamente.
 
     Retorno:
-        list[tuple]: [(id, nome), ...]
+        list[tuple]: [(id, nome, data_admissao), ...]
     """
 
-    conn = get_connection()
+    conn = get_db()
     cursor = conn.cursor()
 
-    cursor.execute("SELECT id, nome FROM funcionarios ORDER BY nome;")
+    cursor.execute("SELECT id, nome, data_admissao FROM funcionarios ORDER BY nome;")
     dados = cursor.fetchall()
 
-    conn.close()
     return dados
 
 
 # ============================================================================
 # ADICIONAR NOVO FUNCIONÁRIO
 # ============================================================================
-def adicionar_funcionario(nome):
+def adicionar_funcionario(nome, data_admissao=None):
     """
     Insere um novo funcionário na tabela.
 
-    Parâmetro:
+    Parâmetros:
         nome (str): nome do funcionário
+        data_admissao (str ISO | None): início dos períodos aquisitivos
 
     Não retorna valor, apenas grava no banco.
     """
 
-    conn = get_connection()
+    conn = get_db()
+    cursor = conn.cursor()
+
+    cursor.execute(
+        "INSERT INTO funcionarios (nome, data_admissao) VALUES (?, ?);",
+        (nome, data_admissao)
+    )
+    confirmar(conn)
+
+
+# ============================================================================
+# ADICIONAR VÁRIOS FUNCIONÁRIOS (IMPORTAÇÃO)
+# ============================================================================
+def adicionar_funcionarios_em_lote(funcionarios):
+    """
+    Insere vários funcionários com um único `executemany`.
+
+    Parâmetro:
+        funcionarios (list[tuple]): [(nome, data_admissao | None), ...]
+    """
+
+    conn = get_db()
     cursor = conn.cursor()
 
-    cursor.execute("INSERT INTO funcionarios (nome) VALUES (?);", (nome,))
-    conn.commit()
-    conn.close()
+    cursor.executemany(
+        "INSERT INTO funcionarios (nome, data_admissao) VALUES (?, ?);",
+        funcionarios
+    )
+    confirmar(conn)
+
+
+# ============================================================================
+# MAPA NOME → ID
+# ============================================================================
+def normalizar_nome(nome):
+    """Nome comparável: espaços repetidos removidos e sem caixa."""
+    return " ".join(str(nome).split()).casefold()
+
+
+def mapa_de_nomes():
+    """
+    Mapa de todos os funcionários pelo nome normalizado
+    (`normalizar_nome()`), lido numa única consulta.
+
+    Retorna:
+        dict {nome: id}; nomes repetidos no cadastro ficam com None
+        (ambíguos).
+    """
+
+    conn = get_db()
+    cursor = conn.cursor()
+
+    cursor.execute("SELECT nome, id FROM funcionarios;")
+
+    mapa = {}
+    for nome, func_id in cursor:
+        chave = normalizar_nome(nome)
+        mapa[chave] = None if chave in mapa else func_id
+
+    return mapa
 
 
 # ============================================================================
@@ -71,41 +127,47 @@ def obter_funcionario_por_id(func_id):
         func_id (int): ID do funcionário
 
     Retorna:
-        tuple (id, nome) ou None caso não exista.
+        tuple (id, nome, data_admissao) ou None caso não exista.
     """
 
-    conn = get_connection()
+    conn = get_db()
     cursor = conn.cursor()
 
-    cursor.execute("SELECT id, nome FROM funcionarios WHERE id = ?;", (func_id,))
+    cursor.execute("SELECT id, nome, data_admissao FROM funcionarios WHERE id = ?;", (func_id,))
     dado = cursor.fetchone()
 
-    conn.close()
     return dado
 
 
 # ============================================================================
 # ATUALIZAR FUNCIONÁRIO
 # ============================================================================
-def atualizar_funcionario(func_id, novo_nome):
+def atualizar_funcionario(func_id, novo_nome, data_admissao=None):
     """
-    Atualiza o nome de um funcionário existente.
+    Atualiza o nome (e, se informada, a data de admissão) de um
+    funcionário existente.
+
+    Mudar a data de admissão muda as janelas aquisitivas: o gatilho
+    `trg_saldo_ferias_admissao` recalcula o saldo do funcionário.
 
     Parâmetros:
         func_id (int): ID do funcionário
         novo_nome (str): novo nome para atualizar
+        data_admissao (str ISO | "" | None): nova data de admissão;
+            "" apaga a data e None mantém a atual
     """
 
-    conn = get_connection()
+    conn = get_db()
     cursor = conn.cursor()
 
-    cursor.execute(
-        "UPDATE funcionarios SET nome = ? WHERE id = ?;",
-        (novo_nome, func_id)
-    )
+    cursor.execute("""
+        UPDATE funcionarios
+        SET nome = ?,
+            data_admissao = CASE WHEN ? IS NULL THEN data_admissao ELSE NULLIF(?, '') END
+        WHERE id = ?;
+    """, (novo_nome, data_admissao, data_admissao, func_id))
 
-    conn.commit()
-    conn.close()
+    confirmar(conn)
 
 
 # ============================================================================
@@ -115,13 +177,15 @@ def deletar_funcionario(func_id):
     """
     Remove um funcionário do banco de dados.
 
+    Apenas o cadastro é apagado: férias e folgas ficam no histórico (as
+    listagens e relatórios ignoram as de funcionários sem cadastro).
+
     Parâmetro:
         func_id (int): ID do funcionário a ser apagado
     """
 
-    conn = get_connection()
+    conn = get_db()
     cursor = conn.cursor()
 
     cursor.execute("DELETE FROM funcionarios WHERE id = ?;", (func_id,))
-    conn.commit()
-    conn.close()
+    confirmar(conn)
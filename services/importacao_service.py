@@ -0,0 +1,481 @@
+"""
+importacao_service.py
+---------------------
+Camada de serviço responsável pela importação de planilhas (CSV ou XLSX)
+de funcionários, férias e folgas.
+
+Este módulo fornece:
+
+- Leitura das linhas em fluxo, sem carregar o arquivo inteiro (CSV pelo
+  módulo `csv`; XLSX pelo `openpyxl` em modo `read_only`)
+- Colunas reconhecidas pelo cabeçalho, com ou sem acento (ver `_COLUNAS`)
+- Resolução do nome do funcionário para o ID por um mapa em memória,
+  montado uma única vez
+- Validação e gravação em blocos: cada bloco é validado de uma vez e
+  gravado com `executemany` numa transação própria
+- Relatório das linhas recusadas (número da linha, motivo e valores)
+
+Linhas válidas são gravadas mesmo que outras sejam recusadas. As férias
+passam pelas mesmas regras do cadastro em lote (`adicionar_ferias_em_lote`).
+Se a leitura falhar no meio do arquivo (ex.: byte inválido na codificação),
+a importação para ali: o que veio antes da falha fica gravado e o resumo
+traz o erro.
+
+O `openpyxl` é opcional: só é necessário para importar XLSX.
+"""
+
+import codecs
+import csv
+import datetime as dt
+import io
+import itertools
+import unicodedata
+
+from database import transacao
+from services.ferias_service import adicionar_ferias_em_lote
+from services.folga_service import adicionar_folgas_em_lote, anos_com_folga
+from services.funcionario_service import (
+    adicionar_funcionarios_em_lote,
+    mapa_de_nomes,
+    normalizar_nome,
+)
+
+# Tipos de importação aceitos
+TIPOS_IMPORTACAO = ("funcionarios", "ferias", "folgas")
+
+# Linhas validadas e gravadas por transação
+TAMANHO_BLOCO = 2000
+
+# Erros de leitura do arquivo (codificação, CSV malformado, XLSX inválido)
+ERROS_DE_LEITURA = (ValueError, csv.Error)
+
+# Cabeçalho (sem acento, minúsculo, "_" no lugar de espaços) → campo
+_COLUNAS = {
+    "nome": "nome",
+    "funcionario": "nome",
+    "admissao": "data_admissao",
+    "data_admissao": "data_admissao",
+    "data_de_admissao": "data_admissao",
+    "inicio": "inicio",
+    "data_inicio": "inicio",
+    "fim": "fim",
+    "data_fim": "fim",
+    "sap": "agendado_sap",
+    "agendado_sap": "agendado_sap",
+    "abono": "abono_peculiario",
+    "abono_peculiario": "abono_peculiario",
+    "abono_pecuniario": "abono_peculiario",
+    "ano": "ano",
+    "folga": "data_folga",
+    "data_folga": "data_folga",
+}
+
+# Valores de sim/não aceitos (já em minúsculas; em branco = "não")
+_SIM_NAO = {
+    "sim": "sim", "s": "sim", "x": "sim", "1": "sim", "true": "sim",
+    "não": "não", "nao": "não", "n": "não", "0": "não", "false": "não", "": "não",
+}
+
+# Colunas obrigatórias de cada tipo
+_OBRIGATORIAS = {
+    "funcionarios": ("nome",),
+    "ferias": ("nome", "inicio", "fim"),
+    "folgas": ("nome", "data_folga"),
+}
+
+
+# ============================================================================
+# LEITURA DO ARQUIVO (EM FLUXO)
+# ============================================================================
+def linhas_csv(arquivo, encoding="utf-8-sig"):
+    """
+    Lê um CSV linha a linha. O separador (";" ou ",") é detectado pelo
+    cabeçalho.
+
+    Parâmetros:
+        arquivo: arquivo binário aberto (ou o `stream` de um upload)
+        encoding (str)
+
+    Retorna:
+        iterator de (numero_linha, list[str]), começando pelo cabeçalho.
+    """
+    texto = io.TextIOWrapper(arquivo, encoding=encoding, newline="")
+    primeira = texto.readline()
+    separador = ";" if primeira.count(";") >= primeira.count(",") else ","
+
+    leitor = csv.reader(itertools.chain([primeira], texto), delimiter=separador)
+    for valores in leitor:
+        yield leitor.line_num, valores
+
+
+def linhas_xlsx(arquivo):
+    """
+    Lê a primeira aba de um XLSX linha a linha (`openpyxl` em modo
+    `read_only`, que não monta a planilha inteira em memória).
+
+    Parâmetros:
+        arquivo: caminho ou arquivo binário aberto
+
+    Retorna:
+        iterator de (numero_linha, list[valor]), começando pelo cabeçalho.
+
+    Raises:
+        ValueError: se o `openpyxl` não estiver instalado.
+    """
+    try:
+        import openpyxl
+    except ImportError:
+        raise ValueError("Importar XLSX requer o pacote openpyxl (pip install openpyxl)")
+
+    livro = openpyxl.load_workbook(arquivo, read_only=True, data_only=True)
+    try:
+        for numero, valores in enumerate(livro.active.iter_rows(values_only=True), start=1):
+            yield numero, list(valores)
+    finally:
+        livro.close()
+
+
+def linhas_do_arquivo(arquivo, nome_arquivo, encoding="utf-8-sig"):
+    """
+    Escolhe o leitor pela extensão do arquivo (.csv/.txt ou .xlsx).
+
+    Raises:
+        ValueError: formato não suportado ou codificação desconhecida.
+    """
+    extensao = nome_arquivo.rsplit(".", 1)[-1].lower() if "." in nome_arquivo else ""
+
+    if extensao in ("csv", "txt"):
+        try:
+            # `lookup` recusa nomes desconhecidos; `encode`, codecs que não
+            # são de texto (ex.: base64)
+            codecs.lookup(encoding)
+            "".encode(encoding)
+        except LookupError:
+            raise ValueError(f"Codificação desconhecida: {encoding}")
+
+        return linhas_csv(arquivo, encoding)
+    if extensao == "xlsx":
+        return linhas_xlsx(arquivo)
+
+    raise ValueError("Formato não suportado: envie um arquivo .csv ou .xlsx")
+
+
+# ============================================================================
+# RELATÓRIO DE REJEIÇÕES
+# ============================================================================
+class RelatorioRejeicoes:
+    """
+    Linhas recusadas numa importação.
+
+    Guarda só as primeiras `limite` rejeições em memória (para a resposta
+    da API); com um `destino`, grava todas nele em CSV (linha, erro e os
+    valores originais) à medida que aparecem.
+    """
+
+    def __init__(self, destino=None, limite=1000):
+        self.total = 0
+        self.primeiras = []
+        self._limite = limite
+        self._escritor = csv.writer(destino, delimiter=";") if destino is not None else None
+
+    def cabecalho(self, colunas):
+        """Registra o cabeçalho do arquivo importado."""
+        if self._escritor:
+            self._escritor.writerow(["linha", "erro", *colunas])
+
+    def rejeitar(self, linha, erro, valores):
+        """Registra uma linha recusada."""
+        self.total += 1
+        if len(self.primeiras) < self._limite:
+            self.primeiras.append({"linha": linha, "erro": erro})
+        if self._escritor:
+            self._escritor.writerow([linha, erro, *("" if v is None else v for v in valores)])
+
+
+# ============================================================================
+# CONVERSÃO DE VALORES
+# ============================================================================
+def _sem_acento(texto):
+    """Texto minúsculo, sem acentos e sem espaços nas pontas."""
+    texto = unicodedata.normalize("NFKD", str(texto)).encode("ascii", "ignore").decode()
+    return texto.strip().lower()
+
+
+def _texto(valor):
+    return "" if valor is None else str(valor).strip()
+
+
+def _data(valor, rotulo, obrigatoria=True):
+    """
+    Converte data da planilha (date/datetime, "YYYY-MM-DD" ou "dd/mm/aaaa")
+    em texto ISO.
+
+    Raises:
+        ValueError: data inválida (ou ausente, se obrigatória).
+    """
+    if isinstance(valor, dt.datetime):
+        return valor.date().isoformat()
+    if isinstance(valor, dt.date):
+        return valor.isoformat()
+
+    texto = _texto(valor)
+    if not texto:
+        if obrigatoria:
+            raise ValueError(f"{rotulo} em branco")
+        return None
+
+    try:
+        return dt.date.fromisoformat(texto[:10]).isoformat()
+    except ValueError:
+        pass
+
+    try:
+        return dt.datetime.strptime(texto, "%d/%m/%Y").date().isoformat()
+    except ValueError:
+        raise ValueError(f"{rotulo} inválida: {texto}")
+
+
+def _sim_nao(valor, rotulo):
+    """Converte sim/não da planilha (em branco = "não")."""
+    if isinstance(valor, bool):
+        return "sim" if valor else "não"
+
+    resposta = _SIM_NAO.get(_texto(valor).lower())
+    if resposta is None:
+        raise ValueError(f"{rotulo} deve ser sim ou não: {valor}")
+
+    return resposta
+
+
+def _funcionario_id(nome, nomes):
+    """
+    Resolve o nome do funcionário pelo mapa em memória.
+
+    Raises:
+        ValueError: nome desconhecido ou repetido no cadastro.
+    """
+    chave = normalizar_nome(_texto(nome))
+    if chave not in nomes:
+        raise ValueError(f"Funcionário não encontrado: {_texto(nome)}")
+
+    funcionario_id = nomes[chave]
+    if funcionario_id is None:
+        raise ValueError(f"Há mais de um funcionário com o nome {_texto(nome)}")
+
+    return funcionario_id
+
+
+# ============================================================================
+# VALIDAÇÃO E GRAVAÇÃO DE UM BLOCO (POR TIPO)
+# ============================================================================
+def _bloco_funcionarios(bloco, nomes):
+    """Grava os funcionários válidos do bloco; retorna o erro de cada linha."""
+    erros = []
+    novos = []
+
+    for _, campos, _ in bloco:
+        try:
+            nome = " ".join(_texto(campos.get("nome")).split())
+            if not nome:
+                raise ValueError("Nome em branco")
+
+            chave = normalizar_nome(nome)
+            if chave in nomes:
+                raise ValueError(f"Funcionário já cadastrado: {nome}")
+
+            admissao = _data(campos.get("data_admissao"), "Data de admissão", obrigatoria=False)
+        except ValueError as erro:
+            erros.append(str(erro))
+            continue
+
+        # O ID só importa para férias e folgas, lidas em outra importação
+        nomes[chave] = None
+        novos.append((nome, admissao))
+        erros.append(None)
+
+    if novos:
+        adicionar_funcionarios_em_lote(novos)
+
+    return erros
+
+
+def _bloco_ferias(bloco, nomes):
+    """Grava as férias válidas do bloco; retorna o erro de cada linha."""
+    erros = [None] * len(bloco)
+    itens = []
+    posicoes = []
+
+    for i, (numero, campos, _) in enumerate(bloco):
+        try:
+            itens.append({
+                "funcionario_id": _funcionario_id(campos.get("nome"), nomes),
+                "inicio": _data(campos.get("inicio"), "Data de início"),
+                "fim": _data(campos.get("fim"), "Data final"),
+                "agendado_sap": _sim_nao(campos.get("agendado_sap"), "Agendado no SAP"),
+                "abono_peculiario": _sim_nao(campos.get("abono_peculiario"), "Abono"),
+                "linha": numero
+            })
+            posicoes.append(i)
+        except ValueError as erro:
+            erros[i] = str(erro)
+
+    if itens:
+        _, resultados = adicionar_ferias_em_lote(itens, parcial=True)
+        for i, resultado in zip(posicoes, resultados):
+            erros[i] = resultado.get("erro")
+
+    return erros
+
+
+def _bloco_folgas(bloco, nomes):
+    """Grava as folgas válidas do bloco; retorna o erro de cada linha."""
+    erros = [None] * len(bloco)
+    folgas = []
+
+    for i, (_, campos, _) in enumerate(bloco):
+        try:
+            funcionario_id = _funcionario_id(campos.get("nome"), nomes)
+            data_folga = _data(campos.get("data_folga"), "Data da folga")
+
+            ano = campos.get("ano")
+            if _texto(ano):
+                try:
+                    ano = int(float(_texto(ano)))
+                except ValueError:
+                    raise ValueError(f"Ano inválido: {_texto(ano)}")
+            else:
+                ano = int(data_folga[:4])
+        except ValueError as erro:
+            erros[i] = str(erro)
+            continue
+
+        folgas.append((i, funcionario_id, ano, data_folga))
+
+    # Uma folga por funcionário e ano (mesma regra da tela de folgas)
+    if not folgas:
+        return erros
+
+    anos = [f[2] for f in folgas]
+    existentes = anos_com_folga(sorted({f[1] for f in folgas}), min(anos), max(anos))
+    novas = []
+
+    for i, funcionario_id, ano, data_folga in folgas:
+        if (funcionario_id, ano) in existentes:
+            erros[i] = f"Funcionário já tem folga registrada em {ano}"
+            continue
+
+        existentes.add((funcionario_id, ano))
+        novas.append((funcionario_id, ano, data_folga))
+
+    if novas:
+        adicionar_folgas_em_lote(novas)
+
+    return erros
+
+
+_BLOCOS = {
+    "funcionarios": _bloco_funcionarios,
+    "ferias": _bloco_ferias,
+    "folgas": _bloco_folgas,
+}
+
+
+# ============================================================================
+# IMPORTAÇÃO
+# ============================================================================
+def _ate_falhar(registros, falha):
+    """
+    Repassa os registros até o primeiro erro de leitura, que é guardado em
+    `falha` em vez de propagado: os blocos já lidos seguem para gravação.
+    """
+    try:
+        yield from registros
+    except ERROS_DE_LEITURA as erro:
+        falha.append(erro)
+
+
+def importar(tipo, linhas, relatorio=None, tamanho_bloco=TAMANHO_BLOCO):
+    """
+    Importa as linhas de uma planilha, bloco a bloco.
+
+    A primeira linha não vazia é o cabeçalho. Cada bloco de
+    `tamanho_bloco` linhas é validado de uma vez e suas linhas válidas são
+    gravadas com `executemany` numa transação própria; as recusadas vão
+    para o relatório. A memória usada não cresce com o tamanho do arquivo.
+
+    Um erro de leitura depois do cabeçalho não desfaz o que já foi gravado:
+    as linhas lidas até ali são importadas normalmente e o resumo ganha a
+    chave "erro", com a linha em que a leitura parou.
+
+    Parâmetros:
+        tipo (str): "funcionarios", "ferias" ou "folgas"
+        linhas (iterable): (numero_linha, valores), ver `linhas_do_arquivo()`
+        relatorio (RelatorioRejeicoes | None)
+        tamanho_bloco (int)
+
+    Retorna:
+        dict {"lidas", "gravadas", "rejeitadas"} e, se a leitura falhou no
+        meio do arquivo, "erro"
+
+    Raises:
+        ValueError: tipo desconhecido, arquivo vazio, cabeçalho sem as
+                    colunas obrigatórias ou ilegível (nada é gravado).
+        csv.Error: CSV malformado já no cabeçalho (nada é gravado).
+    """
+    if tipo not in _BLOCOS:
+        raise ValueError(f"Tipo de importação inválido: use {', '.join(TIPOS_IMPORTACAO)}")
+
+    relatorio = relatorio or RelatorioRejeicoes(limite=0)
+    linhas = iter(linhas)
+
+    # Cabeçalho: primeira linha não vazia
+    for numero, cabecalho in linhas:
+        if any(_texto(v) for v in cabecalho):
+            break
+    else:
+        raise ValueError("Arquivo vazio")
+
+    campos = [_COLUNAS.get("_".join(_sem_acento(_texto(c)).split())) for c in cabecalho]
+    faltando = [c for c in _OBRIGATORIAS[tipo] if c not in campos]
+    if faltando:
+        raise ValueError(f"Colunas obrigatórias ausentes: {', '.join(faltando)}")
+
+    relatorio.cabecalho(cabecalho)
+
+    registros = (
+        (numero, {campo: valor for campo, valor in zip(campos, valores) if campo}, valores)
+        for numero, valores in linhas
+        if any(_texto(v) for v in valores)
+    )
+    falha = []
+    registros = _ate_falhar(registros, falha)
+
+    nomes = mapa_de_nomes()
+    processar_bloco = _BLOCOS[tipo]
+    resumo = {"lidas": 0, "gravadas": 0, "rejeitadas": 0}
+    ultima_linha = numero
+
+    while True:
+        bloco = list(itertools.islice(registros, tamanho_bloco))
+        if not bloco:
+            break
+
+        with transacao():
+            erros = processar_bloco(bloco, nomes)
+
+        resumo["lidas"] += len(bloco)
+        ultima_linha = bloco[-1][0]
+        for (numero, _, valores), erro in zip(bloco, erros):
+            if erro:
+                resumo["rejeitadas"] += 1
+                relatorio.rejeitar(numero, erro, valores)
+            else:
+                resumo["gravadas"] += 1
+
+    if falha:
+        resumo["erro"] = (
+            f"Leitura interrompida depois da linha {ultima_linha}: {falha[0]}. "
+            f"As linhas anteriores foram importadas."
+        )
+
+    return resumo
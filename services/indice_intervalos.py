@@ -0,0 +1,123 @@
+"""
+indice_intervalos.py
+--------------------
+Índice de intervalos em memória, usado para responder "quais períodos tocam
+[inicio, fim]?" sem consultar o banco.
+
+Este módulo fornece:
+
+- Conversão entre datas e números de dia (ordinal)
+- `IndiceIntervalos`: intervalos fechados ordenados pelo início, com
+  inclusão/remoção pontual e busca por sobreposição
+
+A busca usa duas buscas binárias (`bisect`): um intervalo só pode tocar
+[inicio, fim] se começar entre `inicio - maior_duracao` e `fim`. O custo é
+O(log n) mais os poucos intervalos dessa faixa, em vez de percorrer tudo.
+"""
+
+import datetime as dt
+from bisect import bisect_left, bisect_right
+
+# CAST(julianday(data) AS INTEGER) - AJUSTE_JULIANO = date.toordinal()
+AJUSTE_JULIANO = 1721424
+
+
+# ============================================================================
+# DATAS ↔ NÚMERO DO DIA
+# ============================================================================
+def dia(data):
+    """
+    Número do dia (ordinal) de uma data.
+
+    Parâmetros:
+        data (date | str): data ou texto "YYYY-MM-DD"
+
+    Retorna:
+        int
+    """
+    if isinstance(data, str):
+        data = dt.date.fromisoformat(data)
+    return data.toordinal()
+
+
+def data_do_dia(numero):
+    """Data correspondente a um número de dia (inverso de `dia()`)."""
+    return dt.date.fromordinal(numero)
+
+
+# ============================================================================
+# ÍNDICE
+# ============================================================================
+class IndiceIntervalos:
+    """
+    Intervalos fechados (inicio, fim, chave), com datas em número do dia,
+    mantidos em ordem de início.
+
+    `chave` identifica o registro (ex.: ("ferias", id)) e deve ser
+    comparável, pois desempata a ordenação.
+    """
+
+    def __init__(self, intervalos=()):
+        self._itens = sorted(intervalos)
+        self._inicios = [item[0] for item in self._itens]
+
+        # Maior duração vista: limita até onde olhar para trás na busca
+        self._maior = max((fim - inicio for inicio, fim, _ in self._itens), default=0)
+
+    def __len__(self):
+        return len(self._itens)
+
+    def __iter__(self):
+        return iter(self._itens)
+
+    def copia(self):
+        """Cópia independente do índice."""
+        nova = IndiceIntervalos()
+        nova._itens = list(self._itens)
+        nova._inicios = list(self._inicios)
+        nova._maior = self._maior
+        return nova
+
+    def adicionar(self, inicio, fim, chave):
+        """
+        Inclui um intervalo mantendo a ordem (sem duplicar um já existente).
+
+        Retorna:
+            bool: True se o intervalo foi incluído.
+        """
+        item = (inicio, fim, chave)
+        posicao = bisect_left(self._itens, item)
+        if posicao < len(self._itens) and self._itens[posicao] == item:
+            return False
+
+        self._itens.insert(posicao, item)
+        self._inicios.insert(posicao, inicio)
+        self._maior = max(self._maior, fim - inicio)
+        return True
+
+    def remover(self, inicio, fim, chave):
+        """
+        Remove um intervalo, se existir.
+
+        Retorna:
+            bool: True se o intervalo estava no índice.
+        """
+        item = (inicio, fim, chave)
+        posicao = bisect_left(self._itens, item)
+        if posicao < len(self._itens) and self._itens[posicao] == item:
+            del self._itens[posicao]
+            del self._inicios[posicao]
+            return True
+        return False
+
+    def sobrepostos(self, inicio, fim):
+        """
+        Intervalos que tocam [inicio, fim] (ambos inclusivos).
+
+        Retorna:
+            list[tuple]: (inicio, fim, chave), em ordem de início.
+        """
+        de = bisect_left(self._inicios, inicio - self._maior)
+        ate = bisect_right(self._inicios, fim)
+        return [item for item in self._itens[de:ate] if item[1] >= inicio]
+
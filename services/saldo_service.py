@@ -0,0 +1,90 @@
+"""
+saldo_service.py
+----------------
+Camada de serviço responsável pela manutenção da tabela `saldo_ferias`
+(dias de férias usados por funcionário e período aquisitivo).
+
+A tabela é mantida pelos gatilhos de `ferias` (ver migrações em
+`database.py`); este módulo fornece:
+
+- Comparação da tabela com a soma recalculada a partir de `ferias`
+- Reconstrução completa da tabela (correção de divergências)
+
+Usado pelo comando `flask verificar-saldos` (ver `app.py`).
+"""
+
+from database import get_db, confirmar
+
+# Soma de referência, recalculada a partir de `ferias` (mesma regra dos gatilhos)
+_SALDOS_CALCULADOS = """
+    SELECT f.funcionario_id,
+           CAST(strftime('%Y', f.data_inicio) AS INTEGER)
+             - COALESCE(strftime('%m-%d', f.data_inicio) < strftime('%m-%d', func.data_admissao), 0)
+             AS periodo_aquisitivo,
+           SUM(f.periodo_dias) AS dias_usados
+    FROM ferias f
+    LEFT JOIN funcionarios func ON func.id = f.funcionario_id
+    GROUP BY f.funcionario_id, periodo_aquisitivo
+"""
+
+
+# ============================================================================
+# VERIFICAÇÃO
+# ============================================================================
+def divergencias_saldo():
+    """
+    Compara `saldo_ferias` com a soma recalculada a partir de `ferias`.
+
+    Linhas com 0 dias usados e sem férias correspondentes não contam como
+    divergência (sobram quando todas as férias de um período são apagadas).
+
+    Retorna:
+        list[tuple]: [(funcionario_id, periodo_aquisitivo, gravado, calculado), ...]
+    """
+    conn = get_db()
+    cursor = conn.cursor()
+
+    cursor.execute(f"""
+        WITH calculado AS ({_SALDOS_CALCULADOS})
+        SELECT s.funcionario_id, s.periodo_aquisitivo, s.dias_usados, COALESCE(c.dias_usados, 0)
+        FROM saldo_ferias s
+        LEFT JOIN calculado c
+               ON c.funcionario_id = s.funcionario_id
+              AND c.periodo_aquisitivo = s.periodo_aquisitivo
+        WHERE s.dias_usados != COALESCE(c.dias_usados, 0)
+        UNION ALL
+        SELECT c.funcionario_id, c.periodo_aquisitivo, 0, c.dias_usados
+        FROM calculado c
+        WHERE NOT EXISTS (
+            SELECT 1 FROM saldo_ferias s
+            WHERE s.funcionario_id = c.funcionario_id
+              AND s.periodo_aquisitivo = c.periodo_aquisitivo
+        )
+        ORDER BY 1, 2
+    """)
+
+    return cursor.fetchall()
+
+
+# ============================================================================
+# RECONSTRUÇÃO
+# ============================================================================
+def reconstruir_saldos():
+    """
+    Recalcula toda a tabela `saldo_ferias` a partir de `ferias`.
+
+    Retorna:
+        int: quantidade de linhas gravadas.
+    """
+    conn = get_db()
+    cursor = conn.cursor()
+
+    cursor.execute("DELETE FROM saldo_ferias;")
+    cursor.execute(f"""
+        INSERT INTO saldo_ferias (funcionario_id, periodo_aquisitivo, dias_usados)
+        {_SALDOS_CALCULADOS}
+    """)
+    gravadas = cursor.rowcount
+
+    confirmar(conn)
+    return gravadas
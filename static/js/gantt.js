@@ -0,0 +1,171 @@
+/* ============================================================
+   gantt.js
+   ------------------------------------------------------------
+   Desenho do gráfico Gantt no navegador a partir do payload
+   colunar de /api/gantt (ver `dados_gantt()` em gantt_routes.py).
+
+   Usado pela página do Gantt e pela página de benchmark.
+
+   Dois modos de desenho:
+   - "svg"  : uma trace de barras por tipo (base = início, x = duração)
+   - "webgl": uma trace Scattergl por tipo, cada intervalo é um
+              segmento de linha grossa (para milhares de barras)
+   O modo "auto" usa WebGL quando a quantidade de barras passa de
+   `opcoes.limiteWebgl`.
+   ============================================================ */
+
+function dataCaminhoGantt(data) {
+    return data.replaceAll("-", "_");
+}
+
+function hoverGantt(tipo, webgl) {
+    // No WebGL o hover é sobre as pontas do segmento: as datas vão no customdata
+    const inicio = webgl ? "%{customdata[0]|%b %d, %Y}" : "%{base|%b %d, %Y}";
+    const fim = webgl ? "%{customdata[1]|%b %d, %Y}" : "%{x|%b %d, %Y}";
+
+    return "<b>" + tipo + "</b><br>" +
+        "Início: " + inicio + "<br>" +
+        "Fim: " + fim + "<br>" +
+        "Funcionário: %{y}<br>" +
+        "<extra></extra>";
+}
+
+/* -------------------------
+   TRACES (UMA POR TIPO)
+------------------------- */
+function tracesBarrasGantt(dados, cores) {
+    const traces = dados.tipos.map(tipo => ({
+        type: "bar",
+        orientation: "h",
+        name: tipo,
+        y: [], base: [], x: [],
+        marker: { color: cores[tipo] },
+        hovertemplate: hoverGantt(tipo, false)
+    }));
+
+    for (let i = 0; i < dados.idx.length; i++) {
+        const trace = traces[dados.tipo[i]];
+        trace.y.push(dados.nomes[dados.idx[i]]);
+        trace.base.push(dados.inicio[i]);
+        trace.x.push(Date.parse(dados.fim[i]) - Date.parse(dados.inicio[i]));
+    }
+
+    return traces;
+}
+
+function tracesWebglGantt(dados, cores, largura) {
+    // Segmentos separados por null: [início, fim, null, início, fim, null, ...]
+    const traces = dados.tipos.map(tipo => ({
+        type: "scattergl",
+        mode: "lines",
+        name: tipo,
+        x: [], y: [], customdata: [],
+        line: { color: cores[tipo], width: largura },
+        hovertemplate: hoverGantt(tipo, true)
+    }));
+
+    for (let i = 0; i < dados.idx.length; i++) {
+        const trace = traces[dados.tipo[i]];
+        const nome = dados.nomes[dados.idx[i]];
+        const periodo = [dados.inicio[i], dados.fim[i]];
+
+        trace.x.push(dados.inicio[i], dados.fim[i], null);
+        trace.y.push(nome, nome, null);
+        trace.customdata.push(periodo, periodo, null);
+    }
+
+    return traces;
+}
+
+/* -------------------------
+   FUNDO COMPACTO: UMA FORMA PARA OS FERIADOS, OUTRA PARA OS FINS DE SEMANA
+------------------------- */
+function camadasFundoGantt(dados, tema) {
+    const shapes = [];
+    const fds = dados.fins_de_semana;
+
+    if (fds.inicio.length) {
+        let caminho = "";
+        for (let i = 0; i < fds.inicio.length; i++) {
+            const x0 = dataCaminhoGantt(fds.inicio[i]);
+            const x1 = dataCaminhoGantt(fds.fim[i]);
+            caminho += `M${x0},0L${x1},0L${x1},1L${x0},1Z`;
+        }
+        shapes.push({
+            type: "path", path: caminho, xref: "x", yref: "paper",
+            fillcolor: tema.weekend_color, line: { width: 0 }, layer: "below"
+        });
+    }
+
+    if (dados.feriados.data.length) {
+        shapes.push({
+            type: "path", xref: "x", yref: "paper",
+            path: dados.feriados.data
+                .map(d => `M${dataCaminhoGantt(d)},0L${dataCaminhoGantt(d)},1`)
+                .join(""),
+            line: { color: "red", width: 2, dash: "dot" }
+        });
+    }
+
+    return shapes;
+}
+
+/* -------------------------
+   DESENHAR
+   opcoes: { tema, cores, alturaFaixa, alturaMinima, limiteWebgl, modo }
+   Retorna uma Promise resolvida com o modo usado ("svg" ou "webgl")
+   quando o Plotly termina de desenhar.
+------------------------- */
+function desenharGantt(div, dados, opcoes) {
+    const tema = opcoes.tema;
+    const modo = opcoes.modo || "auto";
+    const webgl = modo === "webgl" || (modo === "auto" && dados.idx.length > opcoes.limiteWebgl);
+
+    const traces = webgl
+        ? tracesWebglGantt(dados, opcoes.cores, Math.round(opcoes.alturaFaixa * 0.6))
+        : tracesBarrasGantt(dados, opcoes.cores);
+
+    // Legenda extra (Feriado e Final de Semana)
+    traces.push({
+        x: [null], y: [null], mode: "lines", type: "scatter",
+        line: { color: "red", width: 2, dash: "dot" },
+        name: "Feriados"
+    });
+    traces.push({
+        x: [null], y: [null], mode: "markers", type: "scatter",
+        marker: { size: 15, color: "rgba(200,200,200,0.6)" },
+        name: "Sábados e Domingos"
+    });
+
+    const layout = {
+        barmode: "overlay",
+        height: Math.max(opcoes.alturaMinima, 150 + opcoes.alturaFaixa * dados.nomes.length),
+        shapes: camadasFundoGantt(dados, tema),
+        paper_bgcolor: tema.paper_bg,
+        plot_bgcolor: tema.plot_bg,
+        font: { color: tema.text_color },
+        xaxis: {
+            type: "date",
+            showgrid: true,
+            gridcolor: tema.grid_color,
+            zeroline: false,
+            tickfont: { color: tema.text_color },
+            linecolor: tema.grid_color
+        },
+        yaxis: {
+            type: "category",
+            autorange: "reversed",
+            categoryorder: "array",
+            categoryarray: dados.nomes,
+            showgrid: false,
+            tickfont: { color: tema.text_color, size: 18 }
+        },
+        legend: {
+            bgcolor: tema.legend_bg,
+            font: { color: tema.text_color }
+        }
+    };
+
+    return Plotly.react(div, traces, layout, { responsive: true })
+        .then(() => (webgl ? "webgl" : "svg"));
+}
@@ -0,0 +1,78 @@
+"""
+conftest.py
+-----------
+Fixtures comuns dos testes.
+
+O `app.py` cria o banco e prepara os feriados ao ser importado, então
+`database.DB_NAME` aponta para um arquivo temporário antes do import. Cada
+teste recebe depois um banco novo, vazio e já migrado.
+"""
+
+import os
+import tempfile
+
+import pytest
+
+import database
+
+database.DB_NAME = os.path.join(tempfile.mkdtemp(), "escala.db")
+
+from app import app as aplicacao  # noqa: E402
+
+
+@pytest.fixture
+def app(tmp_path):
+    """Aplicação apontando para um banco novo em `tmp_path`."""
+    database.DB_NAME = str(tmp_path / "escala.db")
+    database.create_database()
+    aplicacao.config["TESTING"] = True
+    return aplicacao
+
+
+@pytest.fixture
+def client(app):
+    """Cliente HTTP de teste."""
+    return app.test_client()
+
+
+@pytest.fixture
+def externo(app):
+    """
+    Conexão própria com o banco, fora da aplicação: faz o papel de outro
+    processo (outro worker, `flask importar`, SQL manual).
+    """
+    conn = database.get_connection()
+    yield conn
+    conn.close()
+
+
+def cadastrar_funcionarios(conn, quantidade):
+    """Cadastra os funcionários 1..quantidade (nomes F1, F2, ...)."""
+    conn.executemany(
+        "INSERT INTO funcionarios (id, nome) VALUES (?, ?);",
+        [(i, f"F{i}") for i in range(1, quantidade + 1)],
+    )
+    conn.commit()
+
+
+def planos_das_consultas(app, funcao, *args, **kwargs):
+    """
+    Roda `funcao` numa requisição de teste e devolve o EXPLAIN QUERY PLAN
+    de cada SELECT que ela executou: [(sql, "detalhe | detalhe ..."), ...].
+    """
+    with app.test_request_context():
+        conn = database.get_db()
+        consultas = []
+        conn.set_trace_callback(consultas.append)
+        try:
+            resultado = funcao(*args, **kwargs)
+            if hasattr(resultado, "__next__"):
+                list(resultado)
+        finally:
+            conn.set_trace_callback(None)
+
+        return [
+            (sql, " | ".join(linha[-1] for linha in conn.execute("EXPLAIN QUERY PLAN " + sql)))
+            for sql in consultas
+            if sql.lstrip().upper().startswith(("SELECT", "WITH"))
+        ]
@@ -0,0 +1,90 @@
+"""
+Contagem de ausentes por dia e por semana (`cobertura_service`).
+"""
+
+import random
+from datetime import date, timedelta
+
+from services.cobertura_service import ausencias_por_semana
+from tests.conftest import cadastrar_funcionarios
+
+
+def _ferias(conn, funcionario_id, inicio, fim):
+    conn.execute(
+        "INSERT INTO ferias (funcionario_id, periodo_dias, data_inicio, data_fim) VALUES (?, 1, ?, ?);",
+        (funcionario_id, inicio, fim),
+    )
+
+
+def _folga(conn, funcionario_id, data):
+    conn.execute(
+        "INSERT INTO folga_assiduidade (funcionario_id, ano, data_folga) VALUES (?, ?, ?);",
+        (funcionario_id, int(data[:4]), data),
+    )
+
+
+def test_semana_conta_pessoas_distintas(app, externo):
+    cadastrar_funcionarios(externo, 2)
+    # Semana de 04/03/2024: duas férias e uma folga do funcionário 1
+    _ferias(externo, 1, "2024-03-04", "2024-03-05")
+    _ferias(externo, 1, "2024-03-07", "2024-03-08")
+    _folga(externo, 1, "2024-03-10")
+    _ferias(externo, 2, "2024-03-08", "2024-03-12")
+    externo.commit()
+
+    with app.test_request_context():
+        segundas, contagem = ausencias_por_semana(date(2024, 3, 4), date(2024, 3, 17))
+
+    assert [str(s) for s in segundas] == ["2024-03-04", "2024-03-11"]
+    assert contagem.tolist() == [2, 1]
+
+
+def test_semanas_contra_forca_bruta(app, externo):
+    cadastrar_funcionarios(externo, 8)
+    aleatorio = random.Random(7)
+    ausencias = []
+
+    for _ in range(120):
+        funcionario_id = aleatorio.randint(1, 9)  # 9: sem cadastro
+        inicio = date(2024, 1, 1) + timedelta(aleatorio.randrange(120))
+        fim = inicio + timedelta(aleatorio.choice((0, 0, 3, 10, 20)))
+        if fim == inicio:
+            _folga(externo, funcionario_id, inicio.isoformat())
+        else:
+            _ferias(externo, funcionario_id, inicio.isoformat(), fim.isoformat())
+        ausencias.append((funcionario_id, inicio, fim))
+    externo.commit()
+
+    inicio, fim = date(2024, 1, 10), date(2024, 4, 20)
+    with app.test_request_context():
+        segundas, contagem = ausencias_por_semana(inicio, fim)
+
+    for segunda, total in zip(segundas.tolist(), contagem.tolist()):
+        de = max(segunda, inicio)
+        ate = min(segunda + timedelta(6), fim)
+        pessoas = {f for f, a, b in ausencias if f != 9 and a <= ate and b >= de}
+        assert total == len(pessoas), segunda
+
+
+def test_cobertura_concorda_com_conflitos(client, externo):
+    cadastrar_funcionarios(externo, 3)
+    # Folgas dentro das próprias férias e férias sobrepostas da mesma pessoa
+    _ferias(externo, 1, "2024-05-01", "2024-05-20")
+    _folga(externo, 1, "2024-05-10")
+    _ferias(externo, 2, "2024-05-05", "2024-05-15")
+    _ferias(externo, 2, "2024-05-12", "2024-05-25")
+    _folga(externo, 2, "2024-05-13")
+    _folga(externo, 3, "2024-05-14")
+    externo.commit()
+
+    consulta = "inicio=2024-05-01&fim=2024-05-31&limite=1"
+    cobertura = client.get(f"/api/cobertura?{consulta}").get_json()
+    conflitos = client.get(f"/api/conflitos?{consulta}").get_json()["conflitos"]
+
+    dias_em_conflito = {
+        (date.fromisoformat(c["inicio"]) + timedelta(d)).isoformat(): len(c["ausentes"])
+        for c in conflitos
+        for d in range((date.fromisoformat(c["fim"]) - date.fromisoformat(c["inicio"])).days + 1)
+    }
+    assert {d["data"]: d["ausentes"] for d in cobertura["dias_acima"]} == dias_em_conflito
+    assert max(cobertura["ausentes"]) == 3
@@ -0,0 +1,122 @@
+"""
+Índice de ausências do `conflito_service`: atualizado pelas escritas da
+aplicação sem reler o histórico, e relido quando o banco muda por fora.
+"""
+
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from database import transacao
+from services import conflito_service
+from services.conflito_service import listar_conflitos, verificar_conflito
+from services.ferias_service import adicionar_ferias, atualizar_ferias, deletar_ferias
+from services.folga_service import adicionar_folga, atualizar_folga, deletar_folga
+from tests.conftest import cadastrar_funcionarios
+
+FUNCIONARIOS = 6
+
+
+@pytest.fixture
+def cargas(app, monkeypatch):
+    """Conta as leituras completas do histórico."""
+    contador = []
+    carregar = conflito_service._carregar_ausencias
+
+    def contar():
+        contador.append(1)
+        return carregar()
+
+    monkeypatch.setattr(conflito_service, "_carregar_ausencias", contar)
+    monkeypatch.setattr(conflito_service, "_indice", None)
+    return contador
+
+
+def _releitura(app):
+    """Conflitos calculados com um índice relido do zero."""
+    conflito_service._indice = None
+    with app.test_request_context():
+        return listar_conflitos("2024-01-01", "2024-12-31", limite=1)
+
+
+def _data(aleatorio):
+    return (date(2024, 1, 1) + timedelta(aleatorio.randrange(60))).isoformat()
+
+
+def test_escritas_atualizam_o_indice_sem_reler(app, externo, cargas):
+    cadastrar_funcionarios(externo, FUNCIONARIOS)
+    aleatorio = random.Random(3)
+
+    with app.test_request_context():
+        listar_conflitos("2024-01-01", "2024-12-31")
+    cargas.clear()
+
+    for passo in range(60):
+        funcionario_id = aleatorio.randint(1, FUNCIONARIOS)
+        inicio = _data(aleatorio)
+        fim = (date.fromisoformat(inicio) + timedelta(aleatorio.randrange(8))).isoformat()
+        ferias = [i for i, in externo.execute("SELECT id FROM ferias;")]
+        folgas = [i for i, in externo.execute("SELECT id FROM folga_assiduidade;")]
+
+        with app.test_request_context():
+            operacao = aleatorio.randrange(6)
+            if operacao == 0 or not ferias:
+                adicionar_ferias(funcionario_id, "não", 1, "não", inicio, fim, "#fff")
+            elif operacao == 1:
+                atualizar_ferias(aleatorio.choice(ferias), "não", 1, "não", inicio, fim, "#fff")
+            elif operacao == 2:
+                deletar_ferias(aleatorio.choice(ferias))
+            elif operacao == 3 or not folgas:
+                with transacao():
+                    adicionar_folga(funcionario_id, 2024 + passo, inicio)
+                    adicionar_ferias(funcionario_id, "não", 1, "não", fim, fim, "#fff")
+            elif operacao == 4:
+                atualizar_folga(aleatorio.choice(folgas), inicio)
+            else:
+                deletar_folga(aleatorio.choice(folgas))
+
+            atual = listar_conflitos("2024-01-01", "2024-12-31", limite=1)
+
+        assert not cargas
+        assert atual == _releitura(app)
+        cargas.clear()
+
+
+def test_escrita_externa_relê_o_indice(app, externo, cargas):
+    cadastrar_funcionarios(externo, 3)
+    for funcionario_id in (1, 2):
+        externo.execute(
+            "INSERT INTO folga_assiduidade (funcionario_id, ano, data_folga) VALUES (?, 2024, '2024-03-01');",
+            (funcionario_id,),
+        )
+    externo.commit()
+
+    with app.test_request_context():
+        assert len(listar_conflitos("2024-03-01", "2024-03-01", limite=1)) == 1
+        assert verificar_conflito(3, "2024-03-01", "2024-03-01", limite=2)
+
+    externo.execute("DELETE FROM folga_assiduidade WHERE funcionario_id = 2;")
+    externo.commit()
+
+    with app.test_request_context():
+        assert listar_conflitos("2024-03-01", "2024-03-01", limite=1) == []
+        assert not verificar_conflito(3, "2024-03-01", "2024-03-01", limite=2)
+
+    assert len(cargas) == 2
+
+
+def test_funcionario_removido_nao_conta(app, externo):
+    cadastrar_funcionarios(externo, 2)
+    for funcionario_id in (1, 2):
+        externo.execute(
+            "INSERT INTO ferias (funcionario_id, periodo_dias, data_inicio, data_fim) VALUES (?, 5, '2024-03-01', '2024-03-05');",
+            (funcionario_id,),
+        )
+    externo.execute("DELETE FROM funcionarios WHERE id = 2;")
+    externo.commit()
+
+    with app.test_request_context():
+        assert listar_conflitos("2024-03-01", "2024-03-31", limite=0) == [
+            {"inicio": "2024-03-01", "fim": "2024-03-05", "ausentes": [{"id": 1, "nome": "F1"}]}
+        ]
@@ -0,0 +1,50 @@
+"""
+API de dias úteis: limites do calendário.
+"""
+
+import datetime as dt
+
+import pytest
+
+from services import dias_uteis_service
+from services.dias_uteis_service import ANOS_CALENDARIO
+
+ULTIMO = dt.date.today().year + ANOS_CALENDARIO
+PRIMEIRO = dt.date.today().year - ANOS_CALENDARIO
+
+
+@pytest.mark.parametrize("url", [
+    "/api/dias-uteis/projecao?inicio=9999-06-01&dias=10",
+    f"/api/dias-uteis/projecao?inicio={ULTIMO}-12-20&dias=30",
+    "/api/dias-uteis/projecao?inicio=0001-01-01&dias=5",
+    "/api/dias-uteis?inicio=0001-01-01&fim=0001-02-01",
+    f"/api/dias-uteis?inicio={ULTIMO}-12-01&fim={ULTIMO + 1}-01-10",
+])
+def test_fora_do_calendario_retorna_400(client, url):
+    resposta = client.get(url)
+
+    assert resposta.status_code == 400
+    assert "erro" in resposta.get_json()
+
+
+def test_lote_com_projecao_fora_do_calendario(client):
+    resposta = client.post("/api/dias-uteis/lote", json={
+        "periodos": [{"inicio": f"{ULTIMO}-12-28", "dias": 20}]
+    })
+
+    assert resposta.status_code == 400
+
+
+def test_calendario_nao_cresce_fora_da_janela(client):
+    client.get("/api/dias-uteis?inicio=0001-01-01&fim=0001-02-01")
+
+    anos = {ano for ano, _ in dias_uteis_service._mapas}
+    assert not anos or min(anos) >= PRIMEIRO
+
+
+def test_limites_da_janela(client):
+    assert client.get(f"/api/dias-uteis?inicio={PRIMEIRO}-01-01&fim={PRIMEIRO}-01-31").status_code == 200
+    resposta = client.get(f"/api/dias-uteis/projecao?inicio={ULTIMO}-12-01&dias=5")
+
+    assert resposta.status_code == 200
+    assert resposta.get_json()["fim"] == f"{ULTIMO}-12-07"
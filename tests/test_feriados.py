@@ -0,0 +1,49 @@
+"""
+Persistência dos feriados calculados sob demanda.
+"""
+
+from database import ao_confirmar, get_db, versao_dados
+from services import dias_uteis_service, feriado_service
+from services.feriado_service import LOCALIDADE_PADRAO, feriados_do_ano
+
+
+def _gravados(conn, ano):
+    return conn.execute(
+        "SELECT COUNT(*) FROM feriados WHERE data BETWEEN ? AND ?;",
+        (f"{ano}-01-01", f"{ano}-12-31"),
+    ).fetchone()[0]
+
+
+def _esquecer(ano):
+    """Tira o ano das memórias, para que seja calculado de novo."""
+    feriado_service._cache.pop((ano, LOCALIDADE_PADRAO), None)
+    dias_uteis_service._mapas.pop((ano, LOCALIDADE_PADRAO), None)
+    dias_uteis_service._calendarios.clear()
+
+
+def test_consulta_grava_feriados_sem_mudar_a_versao(app, client, externo):
+    _esquecer(2047)
+    with app.test_request_context():
+        antes = versao_dados()
+
+    assert client.get("/api/dias-uteis?inicio=2047-01-01&fim=2047-12-31").status_code == 200
+
+    assert _gravados(externo, 2047) > 0
+    with app.test_request_context():
+        assert versao_dados() == antes
+
+
+def test_gravacao_nao_confirma_a_escrita_em_andamento(app, externo):
+    _esquecer(2048)
+    chamadas = []
+
+    with app.test_request_context():
+        ao_confirmar(lambda antes, depois: chamadas.append(depois))
+        feriados_do_ano(2048)
+
+        # A escrita reservada continua aberta e nada rodou antes do commit
+        assert get_db().in_transaction
+        assert chamadas == []
+
+    # Com o banco reservado pela requisição, a gravação fica para depois
+    assert _gravados(externo, 2048) == 0
@@ -0,0 +1,54 @@
+"""
+Formulários de férias: datas fora do formato ISO canônico.
+"""
+
+import pytest
+
+from tests.conftest import cadastrar_funcionarios
+
+ERRO_DATAS = "Erro: datas inválidas (use o formato AAAA-MM-DD)."
+
+
+def _formulario(inicio, fim, **extra):
+    return {
+        "funcionario_id": "1", "agendado_sap": "não", "abono_peculiario": "não",
+        "inicio": inicio, "fim": fim, **extra,
+    }
+
+
+@pytest.fixture
+def com_ferias(externo):
+    cadastrar_funcionarios(externo, 1)
+    externo.execute("""
+        INSERT INTO ferias (funcionario_id, periodo_dias, data_inicio, data_fim)
+        VALUES (1, 10, '2024-03-05', '2024-03-14');
+    """)
+    externo.commit()
+    return externo
+
+
+@pytest.mark.parametrize("inicio, fim", [("2024-3-5", "2024-03-14"), ("2024-04-01", "2024-4-9"), ("", "2024-04-09")])
+@pytest.mark.parametrize("extra", [{}, {"ignorar_conflito": "1"}])
+def test_datas_fora_do_formato_sao_recusadas(client, com_ferias, inicio, fim, extra):
+    for rota in ("/adicionar-ferias", "/atualizar-ferias/1"):
+        resposta = client.post(rota, data=_formulario(inicio, fim, **extra))
+
+        assert resposta.status_code == 200
+        assert resposta.get_data(as_text=True) == ERRO_DATAS
+
+    assert com_ferias.execute("SELECT data_inicio, data_fim FROM ferias;").fetchall() == [("2024-03-05", "2024-03-14")]
+
+
+def test_datas_validas_seguem_em_iso(client, com_ferias):
+    assert "sobrepõe" in client.post("/adicionar-ferias", data=_formulario("2024-03-10", "2024-03-12")) \
+        .get_data(as_text=True)
+
+    resposta = client.post("/atualizar-ferias/1", data=_formulario(" 2024-03-06", "2024-03-15 "))
+
+    assert resposta.status_code == 302
+    assert com_ferias.execute("SELECT data_inicio, data_fim FROM ferias;").fetchall() == [("2024-03-06", "2024-03-15")]
+
+
+def test_saldo_com_data_fora_do_formato(client, com_ferias):
+    assert client.get("/saldo/1?data=2024-3-5").status_code == 400
+    assert client.get("/saldo/1?data=2024-03-05").get_json()["saldo"] == 20
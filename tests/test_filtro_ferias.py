@@ -0,0 +1,96 @@
+"""
+Filtro de férias por ano/mês em janelas de datas (`filtrar_ferias_service`).
+"""
+
+import itertools
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from database import get_db
+from services.ferias_service import filtrar_ferias_service
+from tests.conftest import cadastrar_funcionarios, planos_das_consultas
+
+FUNCIONARIOS = 6
+
+
+def filtro_strftime(funcionario_id, ano, mes, abono, sap):
+    """O filtro antigo, sobre o mês/ano de `data_inicio`."""
+    query = "SELECT f.id FROM ferias f JOIN funcionarios func ON func.id = f.funcionario_id WHERE 1=1"
+    params = []
+    for condicao, valor in (
+        ("f.funcionario_id = ?", funcionario_id),
+        ("strftime('%Y', f.data_inicio) = ?", ano and str(ano)),
+        ("strftime('%m', f.data_inicio) = ?", mes and f"{int(mes):02d}"),
+        ("f.abono_peculiario = ?", abono),
+        ("f.agendado_sap = ?", sap),
+    ):
+        if valor:
+            query += " AND " + condicao
+            params.append(valor)
+    return sorted(id_ for id_, in get_db().execute(query, params))
+
+
+def _inserir(conn, linhas):
+    conn.executemany("""
+        INSERT INTO ferias (funcionario_id, agendado_sap, periodo_dias, abono_peculiario, data_inicio, data_fim)
+        VALUES (?, ?, 1, ?, ?, ?);
+    """, linhas)
+    conn.commit()
+
+
+@pytest.fixture
+def ferias_de_um_mes(app, externo):
+    """Períodos que começam e terminam no mesmo mês (2022 a 2024)."""
+    cadastrar_funcionarios(externo, FUNCIONARIOS)
+    sorteio = random.Random(6)
+    linhas = []
+    for _ in range(400):
+        inicio = date(2022, 1, 1) + timedelta(days=sorteio.randrange(3 * 365))
+        fim = min(inicio + timedelta(days=sorteio.randrange(10)), date(inicio.year, inicio.month, 28))
+        fim = max(fim, inicio)
+        linhas.append((
+            sorteio.randint(1, FUNCIONARIOS), sorteio.choice(["sim", "não"]),
+            sorteio.choice(["sim", "não"]), inicio.isoformat(), fim.isoformat(),
+        ))
+    _inserir(externo, linhas)
+    return app
+
+
+def test_igual_ao_filtro_antigo_em_periodos_de_um_mes(ferias_de_um_mes):
+    combinacoes = itertools.product((None, 2), (None, 2023), (None, 3), (None, "sim"), (None, "não"))
+
+    with ferias_de_um_mes.test_request_context():
+        for filtros in combinacoes:
+            obtidos = sorted(f["id"] for f in filtrar_ferias_service(*filtros))
+            assert obtidos == filtro_strftime(*filtros), filtros
+
+
+def test_periodo_na_virada_do_ano_aparece_nos_dois_meses(app, externo):
+    cadastrar_funcionarios(externo, 1)
+    _inserir(externo, [(1, "não", "não", "2023-12-28", "2024-01-06")])
+
+    with app.test_request_context():
+        for ano, mes in ((2023, 12), (2024, 1), (None, 12), (None, 1), (2023, None), (2024, None)):
+            assert len(list(filtrar_ferias_service(None, ano, mes, None, None))) == 1, (ano, mes)
+        assert not list(filtrar_ferias_service(None, 2024, 2, None, None))
+
+
+@pytest.mark.parametrize("funcionario_id, ano, mes, esperado", [
+    (None, 2023, None, "SEARCH f USING INDEX idx_ferias_periodo"),
+    (None, 2023, 3, "SEARCH f USING INDEX idx_ferias_periodo"),
+    (2, 2023, 3, "SEARCH f USING INDEX idx_ferias_funcionario_periodo"),
+    # Uma janela por ano: percorre o índice de períodos, lendo da tabela só
+    # as linhas que caem em alguma janela
+    (None, None, 3, "SCAN f USING INDEX idx_ferias_periodo"),
+])
+def test_janelas_usam_indice(ferias_de_um_mes, externo, funcionario_id, ano, mes, esperado):
+    externo.execute("ANALYZE;")
+    externo.commit()
+
+    *_, (sql, plano) = planos_das_consultas(
+        ferias_de_um_mes, filtrar_ferias_service, funcionario_id, ano, mes, None, None
+    )
+
+    assert esperado in plano, plano
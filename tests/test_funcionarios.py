@@ -0,0 +1,84 @@
+"""
+Cadastro de funcionários.
+"""
+
+import pytest
+
+from tests.conftest import cadastrar_funcionarios
+
+
+def test_deletar_funcionario_mantem_o_historico(client, externo):
+    cadastrar_funcionarios(externo, 2)
+    externo.execute("""
+        INSERT INTO ferias (funcionario_id, periodo_dias, data_inicio, data_fim)
+        VALUES (1, 10, '2024-03-05', '2024-03-14');
+    """)
+    externo.execute("INSERT INTO folga_assiduidade (funcionario_id, ano, data_folga) VALUES (1, 2024, '2024-04-01');")
+    externo.commit()
+
+    client.get("/deletar-funcionario/1")
+
+    assert externo.execute("SELECT id FROM funcionarios;").fetchall() == [(2,)]
+    assert externo.execute("SELECT COUNT(*) FROM ferias;").fetchone()[0] == 1
+    assert externo.execute("SELECT COUNT(*) FROM folga_assiduidade;").fetchone()[0] == 1
+
+
+def _admissao(conn, func_id):
+    return conn.execute("SELECT data_admissao FROM funcionarios WHERE id = ?;", (func_id,)).fetchone()[0]
+
+
+def test_atualizar_data_de_admissao(client, externo):
+    cadastrar_funcionarios(externo, 1)
+    externo.execute("""
+        INSERT INTO ferias (funcionario_id, periodo_dias, data_inicio, data_fim)
+        VALUES (1, 10, '2024-03-05', '2024-03-14');
+    """)
+    externo.commit()
+
+    def saldo():
+        return externo.execute("SELECT periodo_aquisitivo FROM saldo_ferias WHERE funcionario_id = 1;").fetchall()
+
+    client.post("/atualizar-funcionario/1", data={"nome": "F1", "data_admissao": "2015-06-10"})
+    assert _admissao(externo, 1) == "2015-06-10"
+    assert saldo() == [(2023,)]
+
+    # Sem o campo: mantém a data
+    client.post("/atualizar-funcionario/1", data={"nome": "Novo"})
+    assert _admissao(externo, 1) == "2015-06-10"
+
+    # Campo em branco: apaga a data (volta ao ano civil)
+    client.post("/atualizar-funcionario/1", data={"nome": "Novo", "data_admissao": ""})
+    assert _admissao(externo, 1) is None
+    assert saldo() == [(2024,)]
+
+    assert client.post("/atualizar-funcionario/1", data={"nome": "Novo", "data_admissao": "10/06/2015"}) \
+        .get_data(as_text=True) == "Erro: data de admissão inválida."
+
+
+def test_adicionar_com_data_em_branco(client, externo):
+    client.post("/adicionar-funcionario", data={"nome": "Ana", "data_admissao": ""})
+
+    assert externo.execute("SELECT nome, data_admissao FROM funcionarios;").fetchall() == [("Ana", None)]
+
+
+@pytest.mark.parametrize("rota", ["/adicionar-funcionario", "/atualizar-funcionario/1"])
+def test_data_de_admissao_fora_do_formato_iso(client, externo, rota):
+    cadastrar_funcionarios(externo, 1)
+
+    resposta = client.post(rota, data={"nome": "F1", "data_admissao": "2020-1-15"})
+
+    assert resposta.get_data(as_text=True) == "Erro: data de admissão inválida."
+    assert externo.execute("SELECT data_admissao FROM funcionarios;").fetchall() == [(None,)]
+
+    # O funcionário continua utilizável
+    assert client.get("/saldo/1").status_code == 200
+    assert client.post("/adicionar-ferias", data={
+        "funcionario_id": "1", "agendado_sap": "não", "abono_peculiario": "não",
+        "inicio": "2024-03-05", "fim": "2024-03-14", "ignorar_conflito": "1",
+    }).status_code == 302
+
+
+def test_data_de_admissao_gravada_em_iso(client, externo):
+    client.post("/adicionar-funcionario", data={"nome": "Ana", "data_admissao": " 2020-01-15 "})
+
+    assert externo.execute("SELECT data_admissao FROM funcionarios;").fetchall() == [("2020-01-15",)]
@@ -0,0 +1,122 @@
+"""
+Gráfico de Gantt: ETag e validação dos filtros da API (`/api/gantt`) e
+formas de fundo (fins de semana e feriados) do gráfico.
+"""
+
+import datetime as dt
+import json
+import re
+
+import pytest
+
+from routes.gantt_routes import ANOS_FILTRO, cache_grafico, faixas_fim_de_semana, montar_gantt
+from tests.conftest import cadastrar_funcionarios
+
+
+def _ferias(conn, funcionario_id, inicio, fim):
+    conn.execute(
+        "INSERT INTO ferias (funcionario_id, periodo_dias, data_inicio, data_fim) VALUES (?, 1, ?, ?);",
+        (funcionario_id, inicio, fim),
+    )
+    conn.commit()
+
+
+def test_etag_depende_do_conteudo(client, externo):
+    cadastrar_funcionarios(externo, 1)
+    _ferias(externo, 1, "2026-03-02", "2026-03-06")
+
+    primeira = client.get("/api/gantt?ano=2026")
+    etag = primeira.headers["ETag"]
+
+    assert client.get("/api/gantt?ano=2026", headers={"If-None-Match": etag}).status_code == 304
+
+    # Escrita que não muda o gráfico: versão nova, mesmo conteúdo e ETag
+    externo.execute("UPDATE ferias SET cor = '#000';")
+    externo.commit()
+    assert client.get("/api/gantt?ano=2026", headers={"If-None-Match": etag}).status_code == 304
+
+    _ferias(externo, 1, "2026-05-04", "2026-05-08")
+    segunda = client.get("/api/gantt?ano=2026", headers={"If-None-Match": etag})
+
+    assert segunda.status_code == 200
+    assert segunda.headers["ETag"] != etag
+
+
+@pytest.mark.parametrize("consulta", ["mes=13&ano=2026", "mes=0", "mes=x", "ano=-1", "ano=abc", "ano=1", "ano=9999"])
+def test_filtro_invalido_retorna_400(client, consulta):
+    resposta = client.get(f"/api/gantt?{consulta}")
+
+    assert resposta.status_code == 400
+    assert "erro" in resposta.get_json()
+    assert client.get(f"/gantt?{consulta}").status_code == 400
+
+
+def test_ano_nos_limites(client):
+    atual = dt.date.today().year
+    for ano in (atual - ANOS_FILTRO, atual + ANOS_FILTRO):
+        assert client.get(f"/api/gantt?mes=12&ano={ano}").status_code == 200
+
+
+# ============================================================================
+# FORMAS DE FUNDO
+# ============================================================================
+@pytest.mark.parametrize("inicio, fim", [
+    (dt.date(2025, 1, 1), dt.date(2026, 12, 31)),
+    (dt.date(2025, 3, 9), dt.date(2025, 3, 15)),   # começa num domingo, termina num sábado
+    (dt.date(2025, 3, 10), dt.date(2025, 3, 14)),  # sem fim de semana
+])
+def test_faixas_cobrem_exatamente_os_fins_de_semana(inicio, fim):
+    cobertos = {
+        a + dt.timedelta(days=i)
+        for a, b in faixas_fim_de_semana(inicio, fim)
+        for i in range((b - a).days)
+    }
+    dias = (inicio + dt.timedelta(days=i) for i in range((fim - inicio).days + 1))
+
+    assert cobertos == {dia for dia in dias if dia.weekday() >= 5}
+
+
+def test_fundo_tem_duas_formas_qualquer_que_seja_o_tamanho(app, externo):
+    cadastrar_funcionarios(externo, 40)
+    for funcionario_id in range(1, 41):
+        externo.execute(
+            "INSERT INTO ferias (funcionario_id, periodo_dias, data_inicio, data_fim) VALUES (?, 5, ?, ?);",
+            (funcionario_id, "2025-03-03", "2025-03-07"),
+        )
+        externo.execute(
+            "INSERT INTO folga_assiduidade (funcionario_id, ano, data_folga) VALUES (?, 2025, '2025-06-02');",
+            (funcionario_id,),
+        )
+    externo.commit()
+
+    with app.test_request_context():
+        contexto = montar_gantt("light", "", "", "2025")
+
+    figura = json.loads(re.search(
+        r"Plotly\.newPlot\(\s*\"grafico-gantt\",\s*(\[.*?\]),\s*(\{.*\}),\s*\{",
+        contexto["grafico_html"], re.S,
+    ).group(2))
+    formas = figura["shapes"]
+
+    # Um caminho para os feriados e outro para os fins de semana
+    assert [forma["type"] for forma in formas] == ["path", "path"]
+    assert all(forma["yref"] == "paper" for forma in formas)
+    assert formas[1]["path"].count("Z") == len(faixas_fim_de_semana(dt.date(2025, 1, 1), dt.date(2025, 12, 31)))
+
+
+# ============================================================================
+# CACHE DOS GRÁFICOS RENDERIZADOS
+# ============================================================================
+@pytest.mark.parametrize("pagina", ["/gantt?ano=2026", "/gantt/heatmap"])
+def test_cookie_de_tema_arbitrario_nao_ocupa_o_cache(client, externo, pagina):
+    cadastrar_funcionarios(externo, 1)
+    _ferias(externo, 1, "2026-03-02", "2026-03-06")
+    cache_grafico.limpar()
+
+    for valor in ("light", "azul", "x" * 50, "DARK"):
+        client.set_cookie("theme", valor)
+        assert client.get(pagina).status_code == 200
+    client.set_cookie("theme", "dark")
+    client.get(pagina)
+
+    assert len(cache_grafico._itens) == 2
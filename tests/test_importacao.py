@@ -0,0 +1,65 @@
+"""
+Importação de planilhas: erros de leitura e de codificação.
+"""
+
+import io
+
+from tests.conftest import cadastrar_funcionarios
+
+
+def _csv_com_byte_invalido(antes, depois):
+    """CSV de funcionários com um byte inválido em UTF-8 após `antes` linhas."""
+    inicio = "".join(f"Pessoa {i};2020-01-01\n" for i in range(antes))
+    fim = "".join(f"Outra {i};2020-01-01\n" for i in range(depois))
+    return b"nome;admissao\n" + inicio.encode() + b"Inv\xe1lida;\n" + fim.encode()
+
+
+def _enviar(client, tipo, conteudo, **formulario):
+    return client.post(
+        f"/api/importar/{tipo}",
+        data={"arquivo": (io.BytesIO(conteudo), "planilha.csv"), **formulario},
+        content_type="multipart/form-data",
+    )
+
+
+def test_erro_de_leitura_no_meio_devolve_o_que_foi_gravado(client, externo):
+    conteudo = _csv_com_byte_invalido(5000, 10)
+
+    resposta = _enviar(client, "funcionarios", conteudo)
+    corpo = resposta.get_json()
+
+    gravados = externo.execute("SELECT COUNT(*) FROM funcionarios;").fetchone()[0]
+    assert resposta.status_code == 400
+    assert "Leitura interrompida" in corpo["erro"]
+    assert 0 < corpo["gravadas"] == gravados <= 5000
+
+
+def test_encoding_desconhecido_e_recusado(client, externo):
+    for encoding in ("nao-existe", "base64"):
+        resposta = _enviar(client, "funcionarios", b"nome\nAna\n", encoding=encoding)
+
+        assert resposta.status_code == 400
+        assert "Codificação desconhecida" in resposta.get_json()["erro"]
+
+    assert externo.execute("SELECT COUNT(*) FROM funcionarios;").fetchone()[0] == 0
+
+
+def test_importacao_de_folgas(client, externo):
+    cadastrar_funcionarios(externo, 2)
+    conteudo = "nome;data_folga\nF1;10/02/2024\nF2;2024-03-01\nF9;2024-03-01\n".encode()
+
+    corpo = _enviar(client, "folgas", conteudo).get_json()
+
+    assert (corpo["gravadas"], corpo["rejeitadas"]) == (2, 1)
+
+
+def test_cli_encoding_desconhecido(app, tmp_path):
+    planilha = tmp_path / "planilha.csv"
+    planilha.write_bytes(b"nome\nAna\n")
+
+    resultado = app.test_cli_runner().invoke(
+        args=["importar", "funcionarios", str(planilha), "--encoding", "nao-existe"]
+    )
+
+    assert resultado.exit_code == 1
+    assert "Codificação desconhecida" in resultado.output
@@ -0,0 +1,208 @@
+"""
+Índice de férias em memória (`existe_sobreposicao`) comparado com a
+consulta SQL de sobreposição, inclusive com gravações feitas por fora da
+aplicação.
+"""
+
+import os
+import tempfile
+from datetime import date, timedelta
+
+import pytest
+
+import database
+from database import get_db, transacao
+from services.ferias_service import (
+    adicionar_ferias,
+    atualizar_ferias,
+    deletar_ferias,
+    existe_sobreposicao,
+)
+from tests.conftest import aplicacao, cadastrar_funcionarios
+
+FUNCIONARIOS = 4
+
+
+def sobreposicao_sql(funcionario_id, inicio, fim, ignorar_ferias_id=None):
+    """A consulta que o índice substitui."""
+    sql = """
+        SELECT COUNT(*) FROM ferias
+        WHERE funcionario_id = ? AND data_inicio <= ? AND data_fim >= ?
+    """
+    params = [funcionario_id, fim, inicio]
+    if ignorar_ferias_id is not None:
+        sql += " AND id != ?"
+        params.append(ignorar_ferias_id)
+    return get_db().execute(sql, params).fetchone()[0] > 0
+
+
+def periodo(deslocamento, duracao):
+    inicio = date(2024, 1, 1) + timedelta(days=deslocamento)
+    return inicio.isoformat(), (inicio + timedelta(days=duracao)).isoformat()
+
+
+# ============================================================================
+# GRAVAÇÃO POR FORA DA APLICAÇÃO
+# ============================================================================
+def test_gravacao_externa_invalida_o_indice(app, externo):
+    cadastrar_funcionarios(externo, 1)
+
+    with app.test_request_context():
+        assert not existe_sobreposicao(1, "2024-03-01", "2024-03-10")
+
+    externo.execute("""
+        INSERT INTO ferias (funcionario_id, periodo_dias, data_inicio, data_fim)
+        VALUES (1, 10, '2024-03-05', '2024-03-14');
+    """)
+    externo.commit()
+
+    with app.test_request_context():
+        assert existe_sobreposicao(1, "2024-03-01", "2024-03-10")
+
+    externo.execute("DELETE FROM ferias;")
+    externo.commit()
+
+    with app.test_request_context():
+        assert not existe_sobreposicao(1, "2024-03-01", "2024-03-10")
+
+
+def test_rota_recusa_sobreposicao_gravada_por_fora(app, client, externo):
+    cadastrar_funcionarios(externo, 1)
+    formulario = {
+        "funcionario_id": "1", "agendado_sap": "não", "abono_peculiario": "não",
+        "inicio": "2024-03-01", "fim": "2024-03-10",
+    }
+
+    # Carrega o índice do funcionário (ainda vazio)
+    with app.test_request_context():
+        assert not existe_sobreposicao(1, "2024-03-01", "2024-03-10")
+
+    externo.execute("""
+        INSERT INTO ferias (funcionario_id, periodo_dias, data_inicio, data_fim)
+        VALUES (1, 10, '2024-03-05', '2024-03-14');
+    """)
+    externo.commit()
+
+    resposta = client.post("/adicionar-ferias", data=formulario)
+
+    assert "sobrepõe" in resposta.get_data(as_text=True)
+    assert externo.execute("SELECT COUNT(*) FROM ferias;").fetchone()[0] == 1
+
+
+# ============================================================================
+# PROPRIEDADE: ÍNDICE == SQL
+# ============================================================================
+hypothesis = pytest.importorskip("hypothesis")
+
+from hypothesis import settings, strategies as st  # noqa: E402
+from hypothesis.stateful import (  # noqa: E402
+    RuleBasedStateMachine,
+    initialize,
+    invariant,
+    rule,
+)
+
+funcionarios = st.integers(1, FUNCIONARIOS)
+deslocamentos = st.integers(0, 120)
+duracoes = st.integers(0, 20)
+escolhas = st.integers(0, 10 ** 6)
+
+
+class Desfazer(Exception):
+    pass
+
+
+class IndiceContraSQL(RuleBasedStateMachine):
+    """
+    Alterna escritas pela aplicação (avulsas, em transação confirmada ou
+    desfeita) e por uma conexão externa; depois de cada passo o índice deve
+    responder exatamente o que a consulta SQL responde.
+    """
+
+    @initialize()
+    def banco_novo(self):
+        self.pasta = tempfile.TemporaryDirectory()
+        database.DB_NAME = os.path.join(self.pasta.name, "escala.db")
+        database.create_database()
+        self.externo = database.get_connection()
+        cadastrar_funcionarios(self.externo, FUNCIONARIOS)
+
+    def teardown(self):
+        if hasattr(self, "externo"):
+            self.externo.close()
+            self.pasta.cleanup()
+
+    def _ferias(self, escolha):
+        ids = [id_ for id_, in self.externo.execute("SELECT id FROM ferias ORDER BY id;")]
+        return ids[escolha % len(ids)] if ids else None
+
+    @rule(funcionario=funcionarios, deslocamento=deslocamentos, duracao=duracoes)
+    def adicionar(self, funcionario, deslocamento, duracao):
+        with aplicacao.test_request_context():
+            adicionar_ferias(funcionario, "não", duracao + 1, "não", *periodo(deslocamento, duracao), "#fff")
+
+    @rule(escolha=escolhas, deslocamento=deslocamentos, duracao=duracoes)
+    def atualizar(self, escolha, deslocamento, duracao):
+        ferias_id = self._ferias(escolha)
+        with aplicacao.test_request_context():
+            atualizar_ferias(ferias_id, "não", duracao + 1, "não", *periodo(deslocamento, duracao), "#fff")
+
+    @rule(escolha=escolhas)
+    def deletar(self, escolha):
+        with aplicacao.test_request_context():
+            deletar_ferias(self._ferias(escolha))
+
+    @rule(funcionario=funcionarios, deslocamento=deslocamentos, duracao=duracoes,
+          escolha=escolhas, desfazer=st.booleans())
+    def em_transacao(self, funcionario, deslocamento, duracao, escolha, desfazer):
+        ferias_id = self._ferias(escolha)
+        with aplicacao.test_request_context():
+            try:
+                with transacao():
+                    adicionar_ferias(funcionario, "não", duracao + 1, "não", *periodo(deslocamento, duracao), "#fff")
+                    assert existe_sobreposicao(funcionario, *periodo(deslocamento, duracao))
+                    if ferias_id is not None:
+                        deletar_ferias(ferias_id)
+                    if desfazer:
+                        raise Desfazer
+            except Desfazer:
+                pass
+
+    @rule(funcionario=funcionarios, deslocamento=deslocamentos, duracao=duracoes)
+    def adicionar_por_fora(self, funcionario, deslocamento, duracao):
+        self.externo.execute("""
+            INSERT INTO ferias (funcionario_id, periodo_dias, data_inicio, data_fim)
+            VALUES (?, ?, ?, ?);
+        """, (funcionario, duracao + 1, *periodo(deslocamento, duracao)))
+        self.externo.commit()
+
+    @rule(escolha=escolhas, deslocamento=deslocamentos, duracao=duracoes)
+    def atualizar_por_fora(self, escolha, deslocamento, duracao):
+        self.externo.execute(
+            "UPDATE ferias SET data_inicio = ?, data_fim = ? WHERE id = ?;",
+            (*periodo(deslocamento, duracao), self._ferias(escolha)),
+        )
+        self.externo.commit()
+
+    @rule(escolha=escolhas)
+    def deletar_por_fora(self, escolha):
+        self.externo.execute("DELETE FROM ferias WHERE id = ?;", (self._ferias(escolha),))
+        self.externo.commit()
+
+    @invariant()
+    def indice_igual_ao_sql(self):
+        ids = [None] + [id_ for id_, in self.externo.execute("SELECT id FROM ferias;")]
+
+        with aplicacao.test_request_context():
+            for funcionario in range(1, FUNCIONARIOS + 1):
+                for deslocamento in range(0, 140, 9):
+                    inicio, fim = periodo(deslocamento, 6)
+                    ignorar = ids[(funcionario + deslocamento) % len(ids)]
+                    assert existe_sobreposicao(funcionario, inicio, fim, ignorar) == \
+                        sobreposicao_sql(funcionario, inicio, fim, ignorar)
+
+
+IndiceContraSQL.TestCase.settings = settings(
+    max_examples=40, stateful_step_count=25, deadline=None
+)
+TestIndiceContraSQL = IndiceContraSQL.TestCase
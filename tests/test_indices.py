@@ -0,0 +1,55 @@
+"""
+Planos de consulta (EXPLAIN QUERY PLAN): as consultas frequentes usam os
+índices criados pelas migrações, sem varrer as tabelas nem ordenar em
+memória.
+"""
+
+import pytest
+
+from services import ferias_service
+from services.ferias_service import existe_sobreposicao, listar_periodos_para_gantt, total_dias_ferias
+from services.folga_service import listar_folgas, listar_folgas_para_gantt, obter_folga
+from tests.conftest import cadastrar_funcionarios, planos_das_consultas
+
+
+@pytest.fixture
+def banco(app, externo):
+    """Alguns funcionários com férias e folgas, e estatísticas (ANALYZE)."""
+    cadastrar_funcionarios(externo, 30)
+    externo.executemany(
+        "INSERT INTO ferias (funcionario_id, periodo_dias, data_inicio, data_fim) VALUES (?, 10, ?, ?);",
+        [(f, f"{ano}-0{mes}-01", f"{ano}-0{mes}-10")
+         for f in range(1, 31) for ano in range(2020, 2025) for mes in (2, 7)],
+    )
+    externo.executemany(
+        "INSERT INTO folga_assiduidade (funcionario_id, ano, data_folga) VALUES (?, ?, ?);",
+        [(f, ano, f"{ano}-05-0{f % 9 + 1}") for f in range(1, 31) for ano in range(2020, 2025)],
+    )
+    externo.execute("ANALYZE;")
+    externo.commit()
+    return app
+
+
+@pytest.mark.parametrize("funcao, args, indice", [
+    (existe_sobreposicao, (3, "2024-01-01", "2024-01-05"), "idx_ferias_funcionario_periodo"),
+    (total_dias_ferias, (3, 2024), "PRIMARY KEY"),
+    (obter_folga, (3, 2024), "idx_folga_funcionario_ano"),
+])
+def test_consultas_por_funcionario_usam_indice(banco, funcao, args, indice):
+    ferias_service._indices_ferias.clear()
+
+    planos = planos_das_consultas(banco, funcao, *args)
+
+    assert planos
+    for sql, plano in planos:
+        assert "SCAN" not in plano, sql
+        assert indice in plano, sql
+
+
+@pytest.mark.parametrize("funcao", [listar_folgas, listar_periodos_para_gantt, listar_folgas_para_gantt])
+def test_listagens_por_nome_sem_ordenacao_em_memoria(banco, funcao):
+    (sql, plano), = planos_das_consultas(banco, funcao)
+
+    assert "idx_funcionarios_nome" in plano
+    assert "TEMP B-TREE" not in plano
+    assert "SCAN f " not in plano + " "
@@ -0,0 +1,47 @@
+"""
+Paginação por cursor da listagem de férias (`/ferias-pagina`).
+"""
+
+from tests.conftest import cadastrar_funcionarios
+
+
+def _ferias(conn, funcionario_id, quantidade):
+    conn.executemany(
+        "INSERT INTO ferias (funcionario_id, periodo_dias, data_inicio, data_fim) VALUES (?, 1, ?, ?);",
+        [(funcionario_id, f"2024-01-{d % 28 + 1:02d}", f"2024-01-{d % 28 + 1:02d}") for d in range(quantidade)],
+    )
+
+
+def _paginas(client, limite):
+    url = f"/ferias-pagina?limite={limite}"
+    while url:
+        corpo = client.get(url).get_json()
+        yield corpo["itens"]
+        url = corpo["proximo"] and f"/ferias-pagina?limite={limite}&cursor={corpo['proximo']}"
+
+
+def test_ferias_sem_funcionario_nao_ocupam_a_pagina(client, externo):
+    # Histórico de um funcionário removido (linhas órfãs)
+    cadastrar_funcionarios(externo, 2)
+    _ferias(externo, 1, 150)
+    _ferias(externo, 2, 50)
+    externo.execute("DELETE FROM funcionarios WHERE id = 1;")
+    externo.commit()
+
+    corpo = client.get("/ferias-pagina?limite=100").get_json()
+
+    assert len(corpo["itens"]) == 50
+    assert corpo["proximo"] is None
+
+
+def test_paginas_cobrem_todas_as_ferias(client, externo):
+    cadastrar_funcionarios(externo, 3)
+    for funcionario_id, quantidade in ((1, 7), (2, 0), (3, 12)):
+        _ferias(externo, funcionario_id, quantidade)
+    externo.commit()
+
+    paginas = list(_paginas(client, 5))
+    ids = [item["id"] for pagina in paginas for item in pagina]
+
+    assert [len(p) for p in paginas] == [5, 5, 5, 4]
+    assert sorted(ids) == list(range(1, 20))